@@ -0,0 +1,3 @@
+"""
+Benchmarks for the scanner and the build info parser (not part of the application).
+"""
@@ -0,0 +1,210 @@
+"""
+Scanner benchmarks.
+Times collect_roots, analyze_group and an end-to-end scanner.main run over a synthetic
+library (see synthetic_library.py) and writes the results as JSON so runs can be compared.
+
+Each phase runs in a fresh process (cwd = a temporary program folder, so no real settings
+or metadata are touched) and reports wall time, files/sec, bytes read and peak RSS (the larger
+of the phase's process and its largest worker process; both are reported too). The main
+phase runs with --profile to get its counters, so its wall time includes the profile bookkeeping.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_scanner --games 200 -o bench.json
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from benchmarks.synthetic_library import generate_library  # noqa: E402
+
+PHASES = ["collect_roots", "analyze_group", "main"]
+
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """
+    Peak resident set size of this process, None where it cannot be measured.
+    With children, that of the largest finished child process instead (the scan's worker
+    processes, once the scan has shut its pool down); only measurable where resource exists.
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    if children:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss)
+
+
+def _run_phase(phase: str, lib: str, program_dir: str, jobs: int, per_device: int) -> Dict[str, Any]:
+    """Run one phase in the current (fresh) process."""
+    os.chdir(program_dir)
+    import scanner
+
+    files = 0
+    bytes_read = 0
+    if phase == "collect_roots":
+        start = time.perf_counter()
+        groups = scanner.collect_roots(lib, ["_metadata", program_dir])
+        wall = time.perf_counter() - start
+        files = sum(len(fs) for roots in groups.values() for _, fs in roots)
+    elif phase == "analyze_group":
+        groups = scanner.collect_roots(lib, ["_metadata", program_dir])
+        content, filename, extension, exts, matchers = scanner.compile_mappings({})
+        limits = scanner.resolve_read_limits()
+        targets = scanner.compile_probe_targets({})
+        opened = 0
+        start = time.perf_counter()
+        for roots in groups.values():
+            report: Dict[str, Any] = {}
+            scanner.analyze_group(roots, content, filename, extension, exts, matchers, limits, targets, report)
+            bytes_read += report.get("bytes_read", 0)
+            opened += report.get("files_opened", 0)
+        wall = time.perf_counter() - start
+        files = sum(len(fs) for roots in groups.values() for _, fs in roots)
+    elif phase == "main":
+        out = os.path.join(program_dir, "_metadata")
+        # main only prints a summary; its scan profile has the counters
+        profile_path = os.path.join(program_dir, "profile.json")
+        argv = ["-d", lib, "-o", out, "--force", "--jobs", str(jobs), "--per-device", str(per_device),
+                "--max-depth", "0", "--profile", profile_path]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner.main(argv)
+        wall = time.perf_counter() - start
+        with open(profile_path, "r", encoding="utf-8") as fh:
+            totals = json.load(fh)["totals"]
+        files = totals["files"]
+        bytes_read = totals["bytes_read"]
+        opened = totals["files_opened"]
+    else:
+        raise ValueError(f"unknown phase: {phase}")
+
+    result = {
+        "phase": phase,
+        "wall_s": round(wall, 6),
+        "files": files,
+        "files_per_s": round(files / wall, 1) if wall > 0 else None,
+        "bytes_read": bytes_read,
+    }
+    # with --jobs > 1 the analysis runs (and uses its memory) in worker processes
+    self_rss, children_rss = peak_rss_bytes(), peak_rss_bytes(children=True)
+    result["peak_rss_bytes"] = max((r for r in (self_rss, children_rss) if r is not None), default=None)
+    result["peak_rss_self_bytes"] = self_rss
+    result["peak_rss_children_bytes"] = children_rss
+    if phase in ("analyze_group", "main"):
+        result["files_opened"] = opened
+    return result
+
+
+def _check_output(program_dir: str, expected: Dict[str, Dict[str, Any]]) -> int:
+    """Count games whose scanned metadata misses an expected value."""
+    path = os.path.join(program_dir, "_metadata", "metadata.json")
+    with open(path, "r", encoding="utf-8") as fh:
+        meta = json.load(fh)
+    bad = 0
+    for game, values in expected.items():
+        got = meta.get(game, {})
+        if any(got.get(k) != v for k, v in values.items()):
+            bad += 1
+    return bad
+
+
+def run_benchmarks(lib: str, manifest: Dict[str, Any], phases: List[str], repeat: int = 1,
+                   jobs: int = 1, per_device: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Run every phase repeat times, each run in a new process.
+
+    Returns:
+        One result per phase with the best run's numbers and all wall times ("runs_s")
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for phase in phases:
+        runs = []
+        for _ in range(repeat):
+            program_dir = tempfile.mkdtemp(prefix="bench_prog_")
+            try:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    run = pool.submit(_run_phase, phase, lib, program_dir, jobs, per_device or jobs).result()
+                if phase == "main":
+                    run["mismatches"] = _check_output(program_dir, manifest["expected"])
+            finally:
+                shutil.rmtree(program_dir, ignore_errors=True)
+            runs.append(run)
+        best = dict(min(runs, key=lambda r: r["wall_s"]))
+        best["runs_s"] = [r["wall_s"] for r in runs]
+        results.append(best)
+    return results
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark the scanner on a synthetic library.")
+    p.add_argument("--games", type=int, default=100)
+    p.add_argument("--depth", type=int, default=3)
+    p.add_argument("--fanout", type=int, default=3)
+    p.add_argument("--files-per-dir", type=int, default=4)
+    p.add_argument("--log-every", type=int, default=10, help="Every n-th game gets a large log (0 = none)")
+    p.add_argument("--log-mb", type=float, default=8, help="Size of each large log in MiB")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3, help="Runs per phase (best is reported)")
+    p.add_argument("--jobs", type=int, default=1, help="--jobs passed to scanner.main")
+    p.add_argument("--per-device", type=int, default=None,
+                   help="--per-device passed to scanner.main (default: --jobs; the library is on one disk "
+                        "and the scanner keeps no more workers busy than the disk allows)")
+    p.add_argument("--phase", action="append", choices=PHASES, help="Phase to run (default: all)")
+    p.add_argument("--lib", help="Generate/keep the library here instead of a temp dir")
+    p.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = p.parse_args(argv)
+
+    lib = args.lib or tempfile.mkdtemp(prefix="bench_lib_")
+    try:
+        manifest = generate_library(lib, args.games, args.depth, args.fanout, args.files_per_dir,
+                                    args.log_every, int(args.log_mb * 1024 * 1024), args.seed)
+        results = run_benchmarks(lib, manifest, args.phase or PHASES, max(args.repeat, 1), args.jobs,
+                               args.per_device)
+    finally:
+        if not args.lib:
+            shutil.rmtree(lib, ignore_errors=True)
+
+    report = {
+        "created": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "library": {"params": manifest["params"], "totals": manifest["totals"]},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
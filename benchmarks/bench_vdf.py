@@ -0,0 +1,170 @@
+"""
+Build info parser benchmarks.
+Times web.parse_app_block (KeyValues parser, core/vdf.py) against the regex extraction it
+replaced, over synthetic app_info_print output or a captured one, and writes the results as
+JSON so runs can be compared. Both parsers get the same pre-split app blocks; "mismatches"
+counts apps whose public build or date differ between them.
+
+Cases (synthetic):
+    typical:    --apps apps with a few depots and branches each
+    no_public:  the same apps without a public branch (the regex scans to the end of each block)
+    huge_block: one app with --huge-depots depots
+
+Usage (from the repository root):
+    python -m benchmarks.bench_vdf --apps 2000 -o bench_vdf.json
+    python -m benchmarks.bench_vdf --capture app_info.txt
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+from typing import Dict, Any, List, Tuple, Callable
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from web import parse_app_block, parse_app_info  # noqa: E402
+
+CASES = ["typical", "no_public", "huge_block"]
+
+_HEADER_RE = re.compile(r'^AppID\s*:\s*(\d+)', re.MULTILINE)
+
+
+def regex_parse_app_block(appid: str, text: str) -> Dict[str, Any]:
+    """The regex extraction parse_app_block used before core/vdf.py (public branch only)."""
+    public_branch = re.search(r'"branches"\s*\{.*?"public"\s*\{(.*?)\n\s*\}', text, re.DOTALL)
+    if not public_branch:
+        return {"appid": appid, "build": None, "date": None}
+    section = public_branch.group(1)
+    build_match = re.search(r'"buildid"\s+"(\d+)"', section)
+    time_match = re.search(r'"timeupdated"\s+"(\d+)"', section)
+    return {
+        "appid": appid,
+        "build": build_match.group(1) if build_match else None,
+        "date": int(time_match.group(1)) if time_match else None,
+    }
+
+
+def _app_block(appid: int, rng: random.Random, depots: int, branches: int, public: bool) -> str:
+    """app_info_print output of one app, laid out like SteamCMD prints it."""
+    lines = [f'AppID : {appid}, change number : {rng.randint(1, 10 ** 8)}/0, last change : Mon Jan  1 00:00:00 2024',
+             f'"{appid}"', '{', '\t"common"', '\t{',
+             f'\t\t"name"\t\t"Game {appid} {{Deluxe}} \\"Edition\\""', '\t\t"type"\t\t"Game"', '\t}',
+             '\t"depots"', '\t{']
+    for d in range(depots):
+        lines += [f'\t\t"{appid + d + 1}"', '\t\t{', '\t\t\t"manifests"', '\t\t\t{',
+                  '\t\t\t\t"public"', '\t\t\t\t{',
+                  f'\t\t\t\t\t"gid"\t\t"{rng.randint(1, 10 ** 18)}"',
+                  f'\t\t\t\t\t"size"\t\t"{rng.randint(1, 10 ** 10)}"', '\t\t\t\t}', '\t\t\t}', '\t\t}']
+    names = (["public"] if public else []) + [f"beta{i}" for i in range(branches)]
+    rng.shuffle(names)
+    lines += ['\t\t"branches"', '\t\t{']
+    for name in names:
+        lines += [f'\t\t\t"{name}"', '\t\t\t{', f'\t\t\t\t"buildid"\t\t"{rng.randint(1, 10 ** 7)}"',
+                  f'\t\t\t\t"timeupdated"\t\t"{rng.randint(10 ** 9, 2 * 10 ** 9)}"', '\t\t\t}']
+    lines += ['\t\t}', '\t}', '}']
+    return "\n".join(lines) + "\n"
+
+
+def generate_output(case: str, apps: int, huge_depots: int, seed: int) -> str:
+    """Synthetic app_info_print output of one case; the same arguments give the same text."""
+    rng = random.Random(seed)
+    parts = ["Logging in user 'anonymous' to Steam Public...OK\n"]
+    if case == "huge_block":
+        parts.append(_app_block(1000, rng, huge_depots, 3, public=True))
+    else:
+        for i in range(apps):
+            parts.append(_app_block(1000 + i * 10, rng, rng.randint(1, 6), rng.randint(0, 4),
+                                    public=case == "typical"))
+    return "".join(parts)
+
+
+def split_blocks(output: str) -> List[Tuple[str, str]]:
+    """(appid, text after the "AppID : <appid>" header) per app."""
+    headers = list(_HEADER_RE.finditer(output))
+    ends = [h.start() for h in headers[1:]] + [len(output)]
+    return [(h.group(1), output[h.end():end]) for h, end in zip(headers, ends)]
+
+
+def _time(parse: Callable[[str, str], Dict[str, Any]], blocks: List[Tuple[str, str]],
+          repeat: int) -> Tuple[List[float], Dict[str, Dict[str, Any]]]:
+    runs = []
+    results: Dict[str, Dict[str, Any]] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = {appid: parse(appid, text) for appid, text in blocks}
+        runs.append(time.perf_counter() - start)
+    return runs, results
+
+
+def bench_case(name: str, output: str, repeat: int) -> Dict[str, Any]:
+    """Best-of-repeat timings of both parsers (and of parse_app_info end to end) on output."""
+    blocks = split_blocks(output)
+    size = len(output.encode("utf-8"))
+    result: Dict[str, Any] = {"case": name, "bytes": size, "apps": len(blocks)}
+
+    new_runs, new = _time(parse_app_block, blocks, repeat)
+    old_runs, old = _time(regex_parse_app_block, blocks, repeat)
+    stream_runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_app_info(output)
+        stream_runs.append(time.perf_counter() - start)
+
+    for key, runs in (("vdf", new_runs), ("regex", old_runs), ("parse_app_info", stream_runs)):
+        best = min(runs)
+        result[key] = {
+            "wall_s": round(best, 6),
+            "mb_per_s": round(size / best / 1e6, 2) if best > 0 else None,
+            "runs_s": [round(r, 6) for r in runs],
+        }
+    result["mismatches"] = sum(1 for appid in new
+                               if (new[appid]["build"], new[appid]["date"]) != (old[appid]["build"], old[appid]["date"]))
+    result["branches_found"] = sum(len(info["branches"]) for info in new.values())
+    return result
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark the app_info parser against the old regex.")
+    p.add_argument("--apps", type=int, default=2000, help="Apps per synthetic case")
+    p.add_argument("--huge-depots", type=int, default=20000, help="Depots of the huge_block app")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3, help="Runs per parser (best is reported)")
+    p.add_argument("--case", action="append", choices=CASES, help="Synthetic case to run (default: all)")
+    p.add_argument("--capture", action="append", default=[],
+                   help="Captured app_info_print output to benchmark instead of the synthetic cases")
+    p.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = p.parse_args(argv)
+    repeat = max(args.repeat, 1)
+
+    results = []
+    if args.capture:
+        for path in args.capture:
+            with open(path, "r", encoding="utf-8", errors="replace") as fh:
+                results.append(bench_case(os.path.basename(path), fh.read(), repeat))
+    else:
+        for case in args.case or CASES:
+            results.append(bench_case(case, generate_output(case, args.apps, args.huge_depots, args.seed), repeat))
+
+    report = {
+        "created": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"apps": args.apps, "huge_depots": args.huge_depots, "seed": args.seed},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
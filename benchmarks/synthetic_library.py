@@ -0,0 +1,161 @@
+"""
+Deterministic synthetic game library for scanner benchmarks.
+Builds N game folders with Goldberg / RUNE / REXA layouts matching the scanner's default
+mappings, plain games without an emulator, filler directory trees and optional large logs.
+The same parameters and seed always produce the same tree.
+"""
+import os
+import json
+import random
+import argparse
+from typing import Dict, Any, Optional
+
+LAYOUTS = ["goldberg", "rune", "rexa", "plain"]
+
+MANIFEST_NAME = "library_manifest.json"
+
+_LOG_LINE = "[{:08d}] render thread: frame submitted, queue depth {}, no errors\n"
+_FILLER_EXTS = [".dat", ".pak", ".bin", ".dll", ".txt"]
+
+
+def _write(path: str, content: str):
+    with open(path, "w", encoding="utf-8", newline="\n") as fh:
+        fh.write(content)
+
+
+def _write_log(path: str, size: int, tail: str, rng: random.Random):
+    """Write about size bytes of log noise followed by tail (so a search has to read it all)."""
+    with open(path, "w", encoding="utf-8", newline="\n") as fh:
+        written = 0
+        block = "".join(_LOG_LINE.format(i, rng.randint(0, 9)) for i in range(2000))
+        while written < size:
+            chunk = block[: size - written]
+            fh.write(chunk)
+            written += len(chunk)
+        fh.write(tail)
+
+
+def _layout_files(top: str, layout: str, appid: int, build: int) -> Dict[str, Any]:
+    """Create the emulator files of one game and return the metadata a scan should find."""
+    if layout == "goldberg":
+        settings = os.path.join(top, "steam_settings")
+        os.makedirs(settings, exist_ok=True)
+        _write(os.path.join(top, "steam_appid.txt"), f"{appid}\n")
+        _write(os.path.join(settings, "configs.main.ini"),
+               "[main::general]\n# gse / goldberg emulator settings\nnew_app_ticket=1\n")
+        _write(os.path.join(settings, "build.txt"), f"build {build}\n")
+        return {"appid": str(appid), "emulator": "Goldberg", "build": str(build)}
+    if layout == "rune":
+        _write(os.path.join(top, "steam_emu.ini"),
+               f"[Settings]\n; RUNE emulator\nAppId={appid}\nLanguage=english\n")
+        _write(os.path.join(top, "rune.rne"), "RNE\n")
+        return {"appid": str(appid), "emulator": "RUNE"}
+    if layout == "rexa":
+        _write(os.path.join(top, "REXA.ini"), f"[REXA]\nappid = {appid}\n")
+        _write(os.path.join(top, "steam.rexa"), "rexa\n")
+        return {"appid": str(appid), "emulator": "REXA"}
+    _write(os.path.join(top, "readme.txt"), "Thanks for playing.\n")
+    return {}
+
+
+def _filler_tree(top: str, depth: int, fanout: int, files_per_dir: int, rng: random.Random) -> int:
+    """Nested directories with small files; returns the number of files created."""
+    created = 0
+    level = [top]
+    for d in range(depth):
+        next_level = []
+        for parent in level:
+            for f in range(fanout):
+                path = os.path.join(parent, f"dir{d}_{f}")
+                os.makedirs(path, exist_ok=True)
+                next_level.append(path)
+                for n in range(files_per_dir):
+                    ext = _FILLER_EXTS[rng.randrange(len(_FILLER_EXTS))]
+                    _write(os.path.join(path, f"file{n}{ext}"), "x" * rng.randint(1, 256))
+                    created += 1
+        level = next_level
+    return created
+
+
+def generate_library(base: str, games: int = 100, depth: int = 3, fanout: int = 3,
+                     files_per_dir: int = 4, log_every: int = 10, log_bytes: int = 8 * 1024 * 1024,
+                     seed: int = 0) -> Dict[str, Any]:
+    """
+    Generate a synthetic library below base and write its manifest.
+
+    Args:
+        base: Library directory (created if missing; existing games are overwritten)
+        games: Number of game folders
+        depth: Depth of each game's filler tree
+        fanout: Subdirectories per filler directory
+        files_per_dir: Small files per filler directory
+        log_every: Every n-th game gets a large log (0 = none)
+        log_bytes: Size of each large log
+        seed: Random seed
+
+    Returns:
+        Manifest with the parameters, totals ("games", "dirs", "files", "bytes") and the
+        "expected" metadata per game
+    """
+    rng = random.Random(seed)
+    os.makedirs(base, exist_ok=True)
+    expected: Dict[str, Dict[str, Any]] = {}
+    for g in range(games):
+        name = f"Game {g:04d}"
+        top = os.path.join(base, name)
+        os.makedirs(top, exist_ok=True)
+        layout = LAYOUTS[g % len(LAYOUTS)]
+        appid = 100000 + g * 37
+        expected[name] = _layout_files(top, layout, appid, 10000000 + g)
+        _filler_tree(os.path.join(top, "data"), depth, fanout, files_per_dir, rng)
+        if log_every and g % log_every == log_every - 1:
+            logs = os.path.join(top, "logs", "crash")
+            os.makedirs(logs, exist_ok=True)
+            _write_log(os.path.join(logs, "session.log.txt"), log_bytes, "session ended\n", rng)
+
+    totals = {"games": games, "dirs": 0, "files": 0, "bytes": 0}
+    for root, dirs, files in os.walk(base):
+        totals["dirs"] += len(dirs)
+        for fn in files:
+            if fn == MANIFEST_NAME:
+                continue
+            totals["files"] += 1
+            totals["bytes"] += os.path.getsize(os.path.join(root, fn))
+
+    manifest = {
+        "params": {"games": games, "depth": depth, "fanout": fanout, "files_per_dir": files_per_dir,
+                   "log_every": log_every, "log_bytes": log_bytes, "seed": seed},
+        "totals": totals,
+        "expected": expected,
+    }
+    with open(os.path.join(base, MANIFEST_NAME), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    return manifest
+
+
+def load_manifest(base: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(base, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Generate a deterministic synthetic game library.")
+    p.add_argument("dir", help="Library directory to create")
+    p.add_argument("--games", type=int, default=100)
+    p.add_argument("--depth", type=int, default=3)
+    p.add_argument("--fanout", type=int, default=3)
+    p.add_argument("--files-per-dir", type=int, default=4)
+    p.add_argument("--log-every", type=int, default=10, help="Every n-th game gets a large log (0 = none)")
+    p.add_argument("--log-mb", type=float, default=8, help="Size of each large log in MiB")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+    manifest = generate_library(args.dir, args.games, args.depth, args.fanout, args.files_per_dir,
+                                args.log_every, int(args.log_mb * 1024 * 1024), args.seed)
+    print(json.dumps(manifest["totals"]))
+
+
+if __name__ == "__main__":
+    main()
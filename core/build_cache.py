@@ -0,0 +1,56 @@
+"""
+Build info cache of the SteamCMD fetcher (web.py).
+Remembers the build info of every appid together with the time it was fetched, in
+_metadata/build_cache.json. Update only asks SteamCMD for appids that are missing or older
+than the TTL ("build_info_ttl" setting); everything else is served from the cache.
+"""
+import os
+import json
+import time
+from typing import Dict, Any, Optional
+
+from core.scan_journal import write_json_atomic
+
+BUILD_CACHE_NAME = "build_cache.json"
+BUILD_CACHE_VERSION = 1
+
+
+def load_build_cache(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns:
+        Mapping appid -> {"appid", "build", "date", "fetched"}; empty if missing, unreadable
+        or from another version
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != BUILD_CACHE_VERSION:
+        return {}
+    apps = data.get("apps")
+    return apps if isinstance(apps, dict) else {}
+
+
+def save_build_cache(path: str, apps: Dict[str, Dict[str, Any]]):
+    write_json_atomic(path, {"version": BUILD_CACHE_VERSION, "apps": apps}, indent=2, ensure_ascii=False)
+
+
+def is_fresh(entry: Optional[Dict[str, Any]], ttl: float, now: Optional[float] = None) -> bool:
+    """True if entry was fetched less than ttl seconds ago."""
+    if not isinstance(entry, dict) or not isinstance(entry.get("fetched"), (int, float)):
+        return False
+    now = time.time() if now is None else now
+    return now - entry["fetched"] < ttl
+
+
+def cache_entry(info: Dict[str, Any], fetched: Optional[float] = None) -> Dict[str, Any]:
+    """Cache entry of one fetched build info."""
+    return {**info, "fetched": int(time.time() if fetched is None else fetched)}
+
+
+def build_info(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """The build info of a cache entry, as stored in recents.json."""
+    return {k: v for k, v in entry.items() if k != "fetched"}
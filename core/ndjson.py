@@ -0,0 +1,45 @@
+"""
+Newline-delimited JSON output for the command line tools (scanner.py / web.py --ndjson).
+One record per line, flushed as soon as it is written, so consumers can start right away.
+"""
+import sys
+import json
+from typing import Dict, Any, Optional, TextIO
+
+
+class NdjsonWriter:
+    """
+    Writes one JSON object per line to a file or stdout.
+
+    Example:
+        with NdjsonWriter("-") as out:
+            out.write({"game": "Some Game", "data": {...}})
+    """
+
+    def __init__(self, target: str):
+        """
+        Args:
+            target: Output file path, "-" for stdout
+        """
+        self.target = target
+        self.to_stdout = target == "-"
+        self._fh: Optional[TextIO] = sys.stdout if self.to_stdout else open(target, "w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]):
+        if self._fh is None:
+            raise ValueError("NdjsonWriter is closed")
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        self.count += 1
+
+    def close(self):
+        if self._fh is not None and not self.to_stdout:
+            self._fh.close()
+        self._fh = None
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,342 @@
+"""
+Minimal PE (Windows executable) header reader.
+Only small windows of a file are mapped (mmap with an offset): the DOS/COFF/optional headers,
+the section table and, for versions, the resource directory and the VS_VERSIONINFO block;
+never the whole multi-GB binary. Used by the scanner to rank a game's executables (ui.json
+exesrc prefill) and to read the version of the best one.
+"""
+import os
+import re
+import math
+import mmap
+import struct
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple
+
+EXE_EXTS = [".exe"]
+
+# bytes mapped for the headers; e_lfanew beyond this gets a second small mapping
+HEADER_BYTES = 4096
+MAX_LFANEW = 1 << 20
+
+SUBSYSTEM_GUI = 2
+SUBSYSTEM_CONSOLE = 3
+_IMAGE_FILE_DLL = 0x2000
+_PE32_PLUS = 0x20B
+
+# helper programs shipped next to the game: distinctive names, matched anywhere in the
+# (lower-case, alphanumeric) file name ...
+HELPER_NAMES = [
+    "unins", "redist", "dxsetup", "dxwebsetup", "directx", "dotnet", "ndp4", "prereq",
+    "crash", "bugsplat", "cefprocess", "cefsharp", "webhelper", "easyanticheat", "battleye",
+    "oalinst", "physx", "touchup",
+]
+# ... and generic words, only matched as whole words of the name ("DedicatedServer",
+# "game_config"), and not if the game folder's name has the same word
+HELPER_WORDS = [
+    "setup", "install", "installer", "uninstall", "report", "helper", "updater", "cleanup",
+    "config", "settings", "editor", "server",
+]
+
+
+class PeInfo(NamedTuple):
+    machine: int
+    bits: int           # 32 or 64
+    subsystem: int      # SUBSYSTEM_GUI, SUBSYSTEM_CONSOLE, ...
+    is_dll: bool
+
+
+class _MappedFile:
+    """Reads byte ranges of an open file through short-lived mmap windows."""
+
+    def __init__(self, fh, size: int):
+        self.fh = fh
+        self.size = size
+
+    def read(self, offset: int, length: int) -> bytes:
+        if offset < 0 or length <= 0 or offset + length > self.size:
+            raise ValueError("range outside of file")
+        start = offset - offset % mmap.ALLOCATIONGRANULARITY
+        window = mmap.mmap(self.fh.fileno(), offset + length - start, access=mmap.ACCESS_READ, offset=start)
+        try:
+            return window[offset - start:offset - start + length]
+        finally:
+            window.close()
+
+
+class _Headers(NamedTuple):
+    info: PeInfo
+    sections: List[Tuple[int, int, int, int]]   # (virtual address, virtual size, raw size, raw pointer)
+    resources: Tuple[int, int]                  # (rva, size) of the resource directory, (0, 0) if none
+
+
+def _read_headers(pe: _MappedFile, sections: bool = False) -> Optional[_Headers]:
+    """Parse the headers (and with sections, the section table and resource data directory)."""
+    if pe.size < 0x40:
+        return None
+    head = pe.read(0, min(pe.size, HEADER_BYTES))
+    if head[:2] != b"MZ":
+        return None
+    lfanew = struct.unpack_from("<I", head, 0x3C)[0]
+    # PE signature + COFF header + optional header up to the subsystem field
+    need = lfanew + 4 + 20 + 70
+    if lfanew > MAX_LFANEW or need > pe.size:
+        return None
+    if need > len(head):
+        head = pe.read(0, need)
+    if head[lfanew:lfanew + 4] != b"PE\0\0":
+        return None
+    machine, n_sections, _, _, _, opt_size, characteristics = struct.unpack_from("<HHIIIHH", head, lfanew + 4)
+    if opt_size < 70:
+        return None
+    opt = lfanew + 24
+    magic = struct.unpack_from("<H", head, opt)[0]
+    subsystem = struct.unpack_from("<H", head, opt + 68)[0]
+    info = PeInfo(machine, 64 if magic == _PE32_PLUS else 32, subsystem, bool(characteristics & _IMAGE_FILE_DLL))
+    if not sections:
+        return _Headers(info, [], (0, 0))
+
+    table = opt + opt_size
+    need = table + 40 * n_sections
+    if need > len(head):
+        head = pe.read(0, need)
+    # data directories follow the fixed part of the optional header; index 2 is the resource table
+    dirs = opt + (112 if magic == _PE32_PLUS else 96)
+    n_dirs = struct.unpack_from("<I", head, dirs - 4)[0]
+    resources = (0, 0)
+    if n_dirs > 2 and dirs + 24 <= table:
+        resources = struct.unpack_from("<II", head, dirs + 16)
+    section_list = []
+    for i in range(n_sections):
+        va_size, va, raw_size, raw_ptr = struct.unpack_from("<IIII", head, table + 40 * i + 8)
+        section_list.append((va, va_size, raw_size, raw_ptr))
+    return _Headers(info, section_list, resources)
+
+
+def read_pe_info(path: str, size: Optional[int] = None) -> Optional[PeInfo]:
+    """
+    Parse the PE headers of path.
+
+    Args:
+        path: File to inspect
+        size: File size if already known (saves a stat)
+
+    Returns:
+        PeInfo, or None if the file is not a PE image or cannot be read
+    """
+    try:
+        with open(path, "rb") as fh:
+            if size is None:
+                size = os.fstat(fh.fileno()).st_size
+            headers = _read_headers(_MappedFile(fh, size))
+    except (OSError, ValueError, struct.error):
+        return None
+    return headers.info if headers is not None else None
+
+
+# resource type of VS_VERSIONINFO and the bounds of what is read for it
+_RT_VERSION = 16
+_MAX_RESOURCE_ENTRIES = 4096
+_MAX_VERSION_BYTES = 64 * 1024
+_FIXED_SIGNATURE = 0xFEEF04BD
+
+
+def _rva_to_offset(sections: List[Tuple[int, int, int, int]], rva: int) -> Optional[int]:
+    for va, va_size, raw_size, raw_ptr in sections:
+        if va <= rva < va + max(va_size, raw_size):
+            return raw_ptr + (rva - va)
+    return None
+
+
+def _resource_entries(pe: _MappedFile, offset: int) -> List[Tuple[int, int]]:
+    """(name_or_id, offset_to_data) of the resource directory at file offset."""
+    named, ids = struct.unpack_from("<HH", pe.read(offset + 12, 4))
+    count = min(named + ids, _MAX_RESOURCE_ENTRIES)
+    if not count:
+        return []
+    raw = pe.read(offset + 16, 8 * count)
+    return [struct.unpack_from("<II", raw, 8 * i) for i in range(count)]
+
+
+def _version_block(pe: _MappedFile, headers: _Headers) -> Optional[bytes]:
+    """Raw VS_VERSIONINFO resource (type 16 -> first name -> first language)."""
+    rva, size = headers.resources
+    base = _rva_to_offset(headers.sections, rva) if rva and size else None
+    if base is None:
+        return None
+    offset = base
+    wanted: Optional[int] = _RT_VERSION
+    for _ in range(3):
+        entries = _resource_entries(pe, offset)
+        if wanted is not None:
+            entries = [e for e in entries if not e[0] & 0x80000000 and e[0] == wanted]
+        if not entries:
+            return None
+        target = entries[0][1]
+        if not target & 0x80000000:
+            offset = base + target
+            break
+        offset = base + (target & 0x7FFFFFFF)
+        wanted = None
+    else:
+        return None
+    data_rva, data_size = struct.unpack_from("<II", pe.read(offset, 8))
+    data_offset = _rva_to_offset(headers.sections, data_rva)
+    if data_offset is None or not 0 < data_size <= _MAX_VERSION_BYTES:
+        return None
+    return pe.read(data_offset, min(data_size, pe.size - data_offset))
+
+
+def _align4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def _parse_version_node(data: bytes, offset: int, end: int, out: Dict[str, Any], depth: int = 0) -> int:
+    """Parse one VS_VERSIONINFO / StringFileInfo / String node; returns the offset after it."""
+    length, value_length, value_type = struct.unpack_from("<HHH", data, offset)
+    node_end = min(offset + length, end) if length else end
+    key_start = offset + 6
+    key_end = key_start
+    while key_end + 1 < node_end and data[key_end:key_end + 2] != b"\0\0":
+        key_end += 2
+    key = data[key_start:key_end].decode("utf-16-le", "replace")
+    pos = _align4(key_end + 2)
+    if depth == 0 and value_length >= 52 and pos + 52 <= node_end:
+        fixed = struct.unpack_from("<13I", data, pos)
+        if fixed[0] == _FIXED_SIGNATURE:
+            out["file_version"] = f"{fixed[2] >> 16}.{fixed[2] & 0xFFFF}.{fixed[3] >> 16}.{fixed[3] & 0xFFFF}"
+            out["product_version"] = f"{fixed[4] >> 16}.{fixed[4] & 0xFFFF}.{fixed[5] >> 16}.{fixed[5] & 0xFFFF}"
+        pos = _align4(pos + value_length)
+    elif value_type == 1 and value_length and depth >= 3:
+        # String: value_length counts UTF-16 characters
+        text = data[pos:min(pos + 2 * value_length, node_end)].decode("utf-16-le", "replace")
+        out["strings"][key] = text.rstrip("\0").strip()
+        return _align4(node_end)
+    else:
+        pos = _align4(pos + (2 * value_length if value_type == 1 else value_length))
+    while pos + 6 <= node_end and depth < 3:
+        nxt = _parse_version_node(data, pos, node_end, out, depth + 1)
+        if nxt <= pos:
+            break
+        pos = nxt
+    return _align4(node_end)
+
+
+def read_pe_version(path: str, size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Version resource of a PE file.
+
+    Args:
+        path: Executable to inspect
+        size: File size if already known (saves a stat)
+
+    Returns:
+        {"file_version", "product_version" (from VS_FIXEDFILEINFO, "a.b.c.d"), "strings"
+        (StringFileInfo, e.g. "ProductVersion", "FileVersion")}, or None without a version resource
+    """
+    try:
+        with open(path, "rb") as fh:
+            if size is None:
+                size = os.fstat(fh.fileno()).st_size
+            pe = _MappedFile(fh, size)
+            headers = _read_headers(pe, sections=True)
+            data = _version_block(pe, headers) if headers is not None else None
+        if not data or len(data) < 6:
+            return None
+        out: Dict[str, Any] = {"strings": {}}
+        _parse_version_node(data, 0, len(data), out)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        return None
+    if "file_version" not in out and not out["strings"]:
+        return None
+    return out
+
+
+def pick_version(version_info: Dict[str, Any]) -> Optional[str]:
+    """
+    Human readable version: the ProductVersion / FileVersion string if it has a digit,
+    else the fixed product / file version without trailing ".0" parts.
+    """
+    strings = version_info.get("strings") or {}
+    for key in ("ProductVersion", "FileVersion"):
+        text = strings.get(key)
+        if text and any(c.isdigit() for c in text):
+            return text
+    for key in ("product_version", "file_version"):
+        fixed = version_info.get(key)
+        if fixed and fixed != "0.0.0.0":
+            parts = fixed.split(".")
+            while len(parts) > 2 and parts[-1] == "0":
+                parts.pop()
+            return ".".join(parts)
+    return None
+
+
+def version_mentions_build(version_info: Dict[str, Any], build: Any) -> bool:
+    """True if any version string or fixed version component equals the build number."""
+    build = str(build).strip()
+    if not build.isdigit():
+        return False
+    texts = list((version_info.get("strings") or {}).values())
+    texts += [version_info.get("file_version") or "", version_info.get("product_version") or ""]
+    return any(build in re.findall(r"\d+", text) for text in texts)
+
+
+def _simplify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _words(name: str) -> List[str]:
+    """Lower-case words of a name, split at separators, case changes and digits."""
+    return [w.lower() for w in re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", name)]
+
+
+def score_executable(path: str, size: int, info: PeInfo, game: str, depth: int) -> float:
+    """
+    Likelihood that path is the game's main executable (higher is better).
+
+    GUI programs beat console ones, 64-bit beats 32-bit, big beats small, names like the
+    game folder win and shallow paths are preferred; known helpers are pushed to the bottom
+    (unless the name is like the game folder's).
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    stem = _simplify(name)
+    score = 0.0
+    if info.subsystem == SUBSYSTEM_GUI:
+        score += 30
+    elif info.subsystem == SUBSYSTEM_CONSOLE:
+        score += 5
+    if info.bits == 64:
+        score += 10
+    score += min(20.0, 4 * math.log2(max(size, 1) / (1 << 20) + 1))
+    folder = _simplify(game)
+    if len(stem) >= 3 and folder and (stem in folder or folder in stem):
+        score += 20
+    elif any(h in stem for h in HELPER_NAMES) or (set(_words(name)) & set(HELPER_WORDS)) - set(_words(game)):
+        score -= 60
+    score -= 3 * depth
+    return score
+
+
+def rank_executables(candidates: List[Tuple[str, int]], top: str, limit: int = 5) -> List[str]:
+    """
+    Best executables of one game folder.
+
+    Args:
+        candidates: (path, size) of the .exe files the walk found
+        top: Top folder of the game (its name is compared with the file names)
+        limit: Length of the returned list
+
+    Returns:
+        Paths of PE programs (no DLLs), best first
+    """
+    game = os.path.basename(os.path.normpath(top))
+    scored: List[Tuple[float, str]] = []
+    for path, size in candidates:
+        info = read_pe_info(path, size if size >= 0 else None)
+        if info is None or info.is_dll:
+            continue
+        rel = os.path.relpath(os.path.dirname(path), top)
+        depth = 0 if rel == os.curdir else rel.count(os.sep) + 1
+        scored.append((score_executable(path, size, info, game, depth), path))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [path for _, path in scored[:limit]]
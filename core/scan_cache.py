@@ -0,0 +1,91 @@
+"""
+Persistent per-file extraction cache.
+Remembers, for every searchable file, which value each mapping extracted from it, keyed by
+(path, size, mtime_ns). A changed folder is then re-analyzed without opening the files that
+did not change; editing a file, a mapping or the read limits invalidates the affected entries.
+"""
+import os
+import json
+import hashlib
+from typing import Dict, Any, Iterable, Optional
+
+from core.scan_journal import write_json_atomic
+
+EXTRACT_CACHE_NAME = "extract_cache.json"
+EXTRACT_CACHE_VERSION = 1
+
+# outcome key of the executable's version resource (core.pe_reader.read_pe_version)
+PE_VERSION_KEY = "pe:version"
+
+
+def mapping_digest(kind: str, mapping: Dict[str, Any]) -> str:
+    """
+    Short hash of a content or filename mapping (compiled "_" keys are ignored).
+    Outcomes are stored under it, so editing one mapping only invalidates that mapping.
+    """
+    public = {k: v for k, v in mapping.items() if not k.startswith("_")}
+    text = json.dumps([kind, public], sort_keys=True, ensure_ascii=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_config_key(limits: Dict[str, int]) -> str:
+    """Hash of everything besides the mappings that changes what is read (the read limits)."""
+    text = json.dumps([EXTRACT_CACHE_VERSION, limits], sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def load_extract_cache(meta_dir: str, config_key: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the cache from meta_dir.
+
+    Returns:
+        Mapping path -> entry; empty if missing, unreadable, from another version or written
+        with other read limits
+    """
+    path = os.path.join(meta_dir, EXTRACT_CACHE_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    if (not isinstance(data, dict) or data.get("version") != EXTRACT_CACHE_VERSION
+            or data.get("config") != config_key):
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_extract_cache(meta_dir: str, config_key: str, files: Dict[str, Dict[str, Any]],
+                       digests: Optional[Iterable[str]] = None):
+    """
+    Write the cache to meta_dir.
+
+    Args:
+        meta_dir: Metadata folder
+        config_key: cache_config_key of the current read limits
+        files: Mapping path -> entry
+        digests: Digests of the current mappings; outcomes of other (removed or edited)
+            mappings are dropped
+    """
+    if digests is not None:
+        keep = set(digests)
+        for entry in files.values():
+            entry["out"] = {d: v for d, v in entry.get("out", {}).items() if d in keep}
+    path = os.path.join(meta_dir, EXTRACT_CACHE_NAME)
+    write_json_atomic(path, {"version": EXTRACT_CACHE_VERSION, "config": config_key, "files": files},
+                      ensure_ascii=True, separators=(",", ":"))
+
+
+def file_entry(cache: Dict[str, Dict[str, Any]], path: str, size: int, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Cache entry of path for the given size and mtime; a stale entry is replaced by an empty one.
+
+    Entries hold "size", "mtime_ns", "truncated" (file exceeded the read budget) and "out",
+    mapping digest -> extracted value (None if the mapping found nothing in the file).
+    """
+    entry = cache.get(path)
+    if entry is None or entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+        entry = cache[path] = {"size": size, "mtime_ns": mtime_ns, "truncated": False, "out": {}}
+    return entry
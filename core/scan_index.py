@@ -0,0 +1,143 @@
+"""
+Persistent scan index for incremental scanning.
+Stores a fingerprint per top folder so a normal Scan only re-analyzes folders that changed.
+"""
+import os
+import json
+import hashlib
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.scan_journal import write_json_atomic
+
+SCAN_INDEX_NAME = "scan_index.json"
+SCAN_INDEX_VERSION = 1
+
+
+def load_scan_index(meta_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the per-folder index from meta_dir.
+
+    Returns:
+        Mapping top_key -> index entry; empty if missing, unreadable or from another version
+    """
+    path = os.path.join(meta_dir, SCAN_INDEX_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SCAN_INDEX_VERSION:
+        return {}
+    folders = data.get("folders")
+    return folders if isinstance(folders, dict) else {}
+
+
+def save_scan_index(meta_dir: str, index: Dict[str, Dict[str, Any]]):
+    """Write the per-folder index to meta_dir."""
+    os.makedirs(meta_dir, exist_ok=True)
+    path = os.path.join(meta_dir, SCAN_INDEX_NAME)
+    write_json_atomic(path, {"version": SCAN_INDEX_VERSION, "folders": index}, indent=2, ensure_ascii=True)
+
+
+def fingerprint_group(top: str, roots: List[Tuple[str, List[str]]], searchable_exts: List[str],
+                      stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build an index entry describing the current state of one top folder.
+
+    The digest covers every directory's mtime and file count plus size/mtime of the
+    searchable files, using paths relative to top. Adding, removing or editing any file
+    the scanner could read changes it.
+
+    The signature covers the relative paths of all files plus the size of the searchable
+    ones and nothing that changes when the folder is renamed or moved (no mtimes, no top
+    folder name); together with the inode it identifies a folder that moved (core.scan_moves).
+
+    Args:
+        top: Absolute path of the top folder
+        roots: (root_path, files) pairs of that folder as returned by collect_roots
+        searchable_exts: Lower-case extensions whose content is analyzed
+        stats: Walk stats from core.scan_walker; saves stat calls for everything it covers
+
+    Returns:
+        Index entry with "fingerprint", "signature", "inode" ([st_dev, st_ino] of top),
+        "dirs", "files" and "indexed" keys
+    """
+    dir_stats = stats["dirs"] if stats else {}
+    file_stats = stats["files"] if stats else {}
+    digest = hashlib.sha1()
+    signature = hashlib.sha1()
+    n_files = 0
+    for root, files in sorted(roots):
+        rel = os.path.relpath(root, top)
+        signature.update(f"D|{rel}\n".encode("utf-8", "surrogateescape"))
+        dir_mtime = dir_stats.get(root)
+        if dir_mtime is None:
+            try:
+                dir_mtime = os.stat(root).st_mtime_ns
+            except OSError:
+                dir_mtime = 0
+        digest.update(f"D|{rel}|{dir_mtime}|{len(files)}\n".encode("utf-8", "surrogateescape"))
+        n_files += len(files)
+        for fn in sorted(files):
+            if os.path.splitext(fn)[1].lower() not in searchable_exts:
+                signature.update(f"f|{fn}\n".encode("utf-8", "surrogateescape"))
+                continue
+            path = os.path.join(root, fn)
+            if path in file_stats:
+                size, mtime = file_stats[path]
+            else:
+                try:
+                    st = os.stat(path)
+                    size, mtime = st.st_size, st.st_mtime_ns
+                except OSError:
+                    size, mtime = -1, 0
+            digest.update(f"F|{fn}|{size}|{mtime}\n".encode("utf-8", "surrogateescape"))
+            signature.update(f"F|{fn}|{size}\n".encode("utf-8", "surrogateescape"))
+    try:
+        st = os.stat(top)
+        inode = [st.st_dev, st.st_ino]
+    except OSError:
+        inode = None
+    return {
+        "fingerprint": digest.hexdigest(),
+        "signature": signature.hexdigest() if n_files else None,
+        "inode": inode,
+        "dirs": len(roots),
+        "files": n_files,
+        "indexed": int(time.time()),
+    }
+
+
+def exe_fingerprint(top: str, exe: str, file_stats: Optional[Dict[str, Tuple[int, int]]] = None) -> Dict[str, Any]:
+    """
+    Index entry keys for the executable the version was read from.
+    Executables are not searchable, so the fingerprint does not cover them; without these
+    a patched executable would leave its folder unchanged and its version stale.
+
+    Args:
+        top: Absolute path of the top folder
+        exe: Path of the executable (absolute or relative to top)
+        file_stats: Walk stats (path -> (size, mtime_ns)); saves the stat call
+
+    Returns:
+        {"exe": path relative to top, "exe_stat": [size, mtime_ns] ([-1, 0] if it is gone)}
+    """
+    path = os.path.join(top, exe)
+    st = (file_stats or {}).get(path)
+    if st is None:
+        try:
+            info = os.stat(path)
+            st = (info.st_size, info.st_mtime_ns)
+        except OSError:
+            st = (-1, 0)
+    return {"exe": os.path.relpath(path, top), "exe_stat": list(st)}
+
+
+def is_unchanged(index: Dict[str, Dict[str, Any]], top_key: str, entry: Dict[str, Any]) -> bool:
+    """True if top_key was indexed before with the same fingerprint (and executable state)."""
+    old = index.get(top_key)
+    return (bool(old) and old.get("fingerprint") == entry["fingerprint"]
+            and old.get("exe_stat") == entry.get("exe_stat"))
@@ -0,0 +1,106 @@
+"""
+Checkpoint journal for resumable scans.
+Every analyzed folder is appended to _metadata/scan_journal.ndjson (one JSON object per line)
+as soon as it is finished. The metadata files are only written at the end of a scan, so a
+scan that is killed or crashes leaves its work in the journal; the next scan replays it and
+compacts everything into the metadata files atomically before removing the journal.
+"""
+import os
+import json
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+JOURNAL_NAME = "scan_journal.ndjson"
+JOURNAL_VERSION = 1
+
+
+def write_json_atomic(path: str, data: Any, **dump_kwargs):
+    """Write JSON to a temporary file next to path and move it into place (never half-written)."""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, **dump_kwargs)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_journal(meta_dir: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Read the journal left by unfinished scans.
+
+    Returns:
+        (scans, records): scans are the header lines ("started", "force", "folders"), records
+        the finished folders in order ("folder", "meta", "index", "executables", "scan" = position
+        in scans).
+        A torn last line (killed while writing) is ignored.
+    """
+    path = os.path.join(meta_dir, JOURNAL_NAME)
+    scans: List[Dict[str, Any]] = []
+    records: List[Dict[str, Any]] = []
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = fh.readlines()
+    except (IOError, OSError):
+        return scans, records
+    for line in lines:
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(item, dict) or item.get("version", JOURNAL_VERSION) != JOURNAL_VERSION:
+            continue
+        if "scan" in item and "folder" not in item:
+            scans.append(item["scan"])
+        elif isinstance(item.get("folder"), str) and isinstance(item.get("meta"), dict):
+            item["scan"] = len(scans) - 1
+            records.append(item)
+    return scans, records
+
+
+class ScanJournal:
+    """
+    Append-only journal of one scan. The file is created with the first record, so scans that
+    analyze nothing leave no journal behind.
+    """
+
+    def __init__(self, meta_dir: str, force: bool = False, folders: Optional[List[str]] = None):
+        self.path = os.path.join(meta_dir, JOURNAL_NAME)
+        self.header = {"started": int(time.time()), "force": force, "folders": folders}
+        self._fh = None
+
+    def _write(self, item: Dict[str, Any]):
+        if self._fh is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(json.dumps({"version": JOURNAL_VERSION, "scan": self.header}, ensure_ascii=True) + "\n")
+        self._fh.write(json.dumps(item, ensure_ascii=True) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def record(self, folder: str, meta: Dict[str, Any], index_entry: Optional[Dict[str, Any]] = None,
+               executables: Optional[List[str]] = None):
+        """Checkpoint one analyzed folder (its metadata record, scan index entry and ranked executables)."""
+        self._write({"version": JOURNAL_VERSION, "folder": folder, "meta": meta, "index": index_entry,
+                     "executables": executables})
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def discard(self):
+        """Remove the journal (also the records replayed from earlier scans) once compacted."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,168 @@
+"""
+Rename and move detection for the scanner.
+A top folder that is new to the scan index is matched against indexed folders that no longer
+exist by its signature (core.scan_index.fingerprint_group) and inode; a match carries the
+existing records (metadata, ui.json incl. exesrc, artwork) over to the new name instead of
+treating the folder as a new game. Indexed folders that vanished without a match are pruned.
+"""
+import os
+import json
+from typing import Dict, Any, List, Optional, Set, Tuple, Iterable
+
+
+def _norm(p: str) -> str:
+    return os.path.normcase(os.path.normpath(p))
+
+
+class MoveTracker:
+    """
+    Vanished folders of one scan and the moves matched to them.
+
+    A folder counts as vanished if its index entry's root is one of the scanned roots, that
+    root still exists and the folder below it does not (an unplugged drive prunes nothing).
+    Records without an index entry (metadata from before the index, entries added in the
+    editor) never vanish: nothing tells which root they belong to. Scanning their folder
+    indexes them.
+    """
+
+    def __init__(self, index: Dict[str, Dict[str, Any]], keys: Iterable[str], roots: List[str],
+                 listed: Optional[Set[Tuple[str, str]]] = None):
+        """
+        Args:
+            index: Scan index (top_key -> entry with "root", "signature", "inode")
+            keys: Every known top key (metadata and index)
+            roots: Library roots of this scan
+            listed: (root, top_key) pairs the scan listed; saves a stat for each
+        """
+        self.index = index
+        self.keys = list(dict.fromkeys(keys))
+        self._known = set(self.keys)
+        self.roots = [r for r in roots if os.path.isdir(r)]
+        self._roots = {_norm(r): r for r in self.roots}
+        self.listed = {(_norm(r), k) for r, k in (listed or ())}
+        self._vanished: Optional[Dict[str, str]] = None
+        self.moves: List[Tuple[str, str, str, str]] = []
+
+    def _exists(self, root: str, key: str) -> bool:
+        return (_norm(root), key) in self.listed or os.path.isdir(os.path.join(root, key))
+
+    def vanished(self) -> Dict[str, str]:
+        """Unmatched vanished folders: top_key -> last known path (computed on first use)."""
+        if self._vanished is None:
+            self._vanished = {}
+            for key in self.keys:
+                root = (self.index.get(key) or {}).get("root")
+                if root is not None and _norm(root) in self._roots and not self._exists(root, key):
+                    self._vanished[key] = os.path.join(root, key)
+        return self._vanished
+
+    def match(self, key: str, path: str, entry: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Find the vanished folder that top folder key (at path, fingerprint entry) was moved from.
+
+        A folder of the same name in another root is a move as such; otherwise the signature
+        must match exactly one vanished folder. Signatures shared by several indexed folders
+        (e.g. near-empty folders) are not distinctive; then inode and fingerprint have to match
+        too (a plain rename keeps both, a deleted folder's inode may be reused by a new one).
+
+        Returns:
+            (old_key, old_path) or None; matches are remembered in moves
+        """
+        if key in self.index:
+            old = self.vanished().get(key)
+            if old is None or _norm(old) == _norm(path):
+                return None
+            return self._claim(key, key, path)
+        if key in self._known:
+            return None
+        signature = entry.get("signature")
+        if not signature:
+            return None
+        candidates = [k for k in self.vanished() if (self.index.get(k) or {}).get("signature") == signature]
+        shared = sum(1 for e in self.index.values() if e.get("signature") == signature)
+        if len(candidates) > 1 or shared > 1:
+            candidates = [k for k in candidates if entry.get("inode") and self.index[k].get("inode") == entry["inode"]
+                          and self.index[k].get("fingerprint") == entry.get("fingerprint")]
+        if len(candidates) != 1:
+            return None
+        return self._claim(candidates[0], key, path)
+
+    def _claim(self, old_key: str, key: str, path: str) -> Tuple[str, str]:
+        old_path = self.vanished().pop(old_key)
+        self.moves.append((old_key, old_path, key, path))
+        if old_key != key:
+            self.index[key] = self.index.pop(old_key)
+        return old_key, old_path
+
+
+def _relative_inside(path: str, folder: str) -> Optional[str]:
+    """path relative to folder if it lies inside it, else None."""
+    try:
+        rel = os.path.relpath(os.path.normpath(path), os.path.normpath(folder))
+    except ValueError:
+        # different drives
+        return None
+    if rel in (os.curdir, os.pardir) or rel.startswith(os.pardir + os.sep):
+        return None
+    return rel
+
+
+def rekey_records(records: Dict[str, Any], old_key: str, new_key: str):
+    """Move records[old_key] to records[new_key] (keeps an existing new_key if old_key is missing)."""
+    if old_key != new_key and old_key in records:
+        records[new_key] = records.pop(old_key)
+
+
+def rekey_ui(ui: Dict[str, Any], old_key: str, old_path: str, new_key: str, new_path: str) -> bool:
+    """
+    Move a ui.json entry and point an exesrc inside the old folder to the new folder.
+
+    Returns:
+        True if ui changed
+    """
+    changed = old_key != new_key and old_key in ui
+    rekey_records(ui, old_key, new_key)
+    entry = ui.get(new_key)
+    exe = entry.get("exesrc") if isinstance(entry, dict) else None
+    if isinstance(exe, str) and os.path.isabs(exe):
+        rel = _relative_inside(exe, old_path)
+        if rel is not None:
+            moved = os.path.join(new_path, rel)
+            # file dialogs hand out "/" paths on Windows too; keep the stored style
+            entry["exesrc"] = moved if "\\" in exe else moved.replace("\\", "/")
+            changed = True
+    return changed
+
+
+def move_artwork(imgs_dir: str, old_key: str, new_key: str) -> bool:
+    """Rename imgs_dir/{old_key}.png to {new_key}.png unless the new name already has artwork."""
+    if old_key == new_key:
+        return False
+    old = os.path.join(imgs_dir, f"{old_key}.png")
+    new = os.path.join(imgs_dir, f"{new_key}.png")
+    if not os.path.exists(old) or os.path.exists(new):
+        return False
+    try:
+        os.replace(old, new)
+    except OSError:
+        return False
+    return True
+
+
+def load_ui(path: str) -> Dict[str, Any]:
+    """ui.json contents; empty if missing or unreadable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_ui(path: str, ui: Dict[str, Any]):
+    """Write ui.json the way core.data_manager.save_data does."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(ui, fh, indent=2, ensure_ascii=True)
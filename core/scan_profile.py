@@ -0,0 +1,143 @@
+"""
+Scan profiling.
+Collects per-game timings and per-mapping statistics from analyze_group reports and writes
+them as one JSON document (scanner.py --profile out.json).
+"""
+import os
+import json
+import time
+from typing import Dict, Any, List, Optional
+
+PROFILE_VERSION = 1
+
+# phases timed inside analyze_group (seconds)
+PHASES = ["open_s", "lower_s", "keyword_search_s", "extract_s", "extension_s"]
+
+
+def rule_label(kind: str, index: int, mapping: Dict[str, Any]) -> str:
+    """Stable, readable name of a mapping, e.g. 'content[1] appid: appid|app id'."""
+    if kind == "extension":
+        return f"extension[{index}] {mapping.get('key')}: {'|'.join(mapping.get('extensions', []))}"
+    return f"{kind}[{index}] {mapping.get('key')}: {'|'.join(mapping.get('keywords', []))}"
+
+
+def new_group_profile() -> Dict[str, Any]:
+    """Empty per-game profile as filled by analyze_group (plain dicts, so it pickles)."""
+    return {
+        "files": 0,
+        "searchable": 0,
+        "phases": {phase: 0.0 for phase in PHASES},
+        "rules": {},
+    }
+
+
+def rule_stats(profile: Dict[str, Any], label: str) -> Dict[str, Any]:
+    """Counters of one mapping: attempts (files it was tried on), hits (values set), time_s."""
+    stats = profile["rules"].get(label)
+    if stats is None:
+        stats = profile["rules"][label] = {"attempts": 0, "hits": 0, "time_s": 0.0}
+    return stats
+
+
+class ScanProfile:
+    """Aggregates the profile of one scan."""
+
+    def __init__(self, base: str):
+        self.base = base
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.games: Dict[str, Dict[str, Any]] = {}
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        self.phases: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.wall_s: Optional[float] = None
+
+    def add_walk(self, game: str, walk_s: float, fingerprint_s: float, files: int, dirs: int):
+        """Record the walk of one top folder (analyzed or not)."""
+        self.games[game] = {
+            "analyzed": False,
+            "walk_s": walk_s,
+            "fingerprint_s": fingerprint_s,
+            "analyze_s": 0.0,
+            "dirs": dirs,
+            "files": files,
+            "searchable": 0,
+            "files_opened": 0,
+            "cache_hits": 0,
+            "bytes_read": 0,
+        }
+
+    def add_analysis(self, game: str, report: Dict[str, Any]):
+        """Merge the analyze_group report (with "profile") of one top folder."""
+        entry = self.games.setdefault(game, {"walk_s": 0.0, "fingerprint_s": 0.0, "dirs": 0, "files": 0})
+        group = report.get("profile") or new_group_profile()
+        entry.update({
+            "analyzed": True,
+            "analyze_s": report.get("analyze_s", 0.0),
+            "searchable": group["searchable"],
+            "files_opened": report.get("files_opened", 0),
+            "cache_hits": report.get("cache_hits", 0),
+            "bytes_read": report.get("bytes_read", 0),
+            # executable the version came from and whether it mentions the build (apply_exe_version)
+            "exe_version": report.get("exe_version"),
+            "phases": group["phases"],
+            "rules": group["rules"],
+        })
+        for phase, value in group["phases"].items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + value
+        for label, stats in group["rules"].items():
+            total = self.rules.setdefault(label, {"attempts": 0, "hits": 0, "time_s": 0.0})
+            total["attempts"] += stats["attempts"]
+            total["hits"] += stats["hits"]
+            total["time_s"] += stats["time_s"]
+
+    def finish(self):
+        self.wall_s = time.perf_counter() - self._start
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Profile document.
+
+        Args:
+            top: Length of the slowest_folders / slowest_rules lists
+        """
+        wall_s = self.wall_s if self.wall_s is not None else time.perf_counter() - self._start
+        games = self.games.values()
+        totals = {
+            "games": len(self.games),
+            "analyzed": sum(1 for g in games if g["analyzed"]),
+            "files": sum(g["files"] for g in games),
+            "files_opened": sum(g["files_opened"] for g in games),
+            "cache_hits": sum(g.get("cache_hits", 0) for g in games),
+            "bytes_read": sum(g["bytes_read"] for g in games),
+            "build_mismatches": sum(1 for g in games if (g.get("exe_version") or {}).get("build_matches") is False),
+            "walk_s": sum(g["walk_s"] for g in games),
+            "fingerprint_s": sum(g["fingerprint_s"] for g in games),
+            "analyze_s": sum(g["analyze_s"] for g in games),
+        }
+        slowest_folders = sorted(
+            ({"game": name, "total_s": g["walk_s"] + g["fingerprint_s"] + g["analyze_s"],
+              "walk_s": g["walk_s"], "analyze_s": g["analyze_s"], "bytes_read": g["bytes_read"]}
+             for name, g in self.games.items()),
+            key=lambda g: g["total_s"], reverse=True)[:top]
+        slowest_rules = sorted(
+            ({"rule": label, **stats} for label, stats in self.rules.items()),
+            key=lambda r: r["time_s"], reverse=True)[:top]
+        return {
+            "version": PROFILE_VERSION,
+            "base": self.base,
+            "started": int(self.started),
+            "wall_s": wall_s,
+            "totals": totals,
+            "phases": self.phases,
+            "rules": self.rules,
+            "slowest_folders": slowest_folders,
+            "slowest_rules": slowest_rules,
+            "games": self.games,
+        }
+
+    def save(self, path: str, top: int = 10):
+        """Write the profile document to path."""
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(top), fh, indent=2, ensure_ascii=False)
@@ -0,0 +1,149 @@
+"""
+Bounded reading of searchable files for the scanner.
+Small files are read and decoded as before; large ones are memory-mapped and searched as
+bytes, limited to a head and a tail window once they exceed the per-file budget.
+"""
+import os
+import mmap
+import time
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+MiB = 1024 * 1024
+
+DEFAULT_READ_LIMITS = {
+    "mmap_threshold": 4 * MiB,  # files up to this size take the plain read + decode path
+    "max_bytes": 64 * MiB,      # files larger than this are only searched in the windows below
+    "head_bytes": 48 * MiB,
+    "tail_bytes": 16 * MiB,
+}
+
+
+def resolve_read_limits(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Merge user overrides (config "read_limits", CLI) into DEFAULT_READ_LIMITS.
+    Invalid or negative values are ignored.
+    """
+    limits = dict(DEFAULT_READ_LIMITS)
+    for key, value in (overrides or {}).items():
+        if key not in limits or value is None:
+            continue
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            continue
+        if value >= 0:
+            limits[key] = value
+    if limits["head_bytes"] + limits["tail_bytes"] > limits["max_bytes"]:
+        # keep the windows inside the budget, head first
+        limits["head_bytes"] = min(limits["head_bytes"], limits["max_bytes"])
+        limits["tail_bytes"] = limits["max_bytes"] - limits["head_bytes"]
+    return limits
+
+
+class SearchableFile:
+    """
+    Content of one searchable file.
+
+    For small files text is the decoded str and text_lower its lower-cased copy.
+    For large files text is a bytes-like object (mmap or bytes) that must be searched with
+    case-insensitive byte patterns, and text_lower is None.
+    spans are the (start, end) regions that may be searched, in file order; for str content
+    they cover text_lower, which can be longer than text.
+    lower_s is the time spent lower-casing (0 for bytes content).
+    """
+
+    def __init__(self, path: str, text: Union[str, bytes, mmap.mmap], spans: Optional[List[Tuple[int, int]]],
+                 size: int, truncated: bool = False, handle: Optional[mmap.mmap] = None):
+        self.path = path
+        self.text = text
+        start = time.perf_counter()
+        self.text_lower = text.lower() if isinstance(text, str) else None
+        self.lower_s = time.perf_counter() - start
+        if spans is None:
+            spans = [(0, len(self.text_lower if self.text_lower is not None else text))]
+        self.spans = spans
+        self.size = size
+        self.truncated = truncated
+        self._handle = handle
+
+    @property
+    def is_bytes(self) -> bool:
+        return self.text_lower is None
+
+    @property
+    def bytes_read(self) -> int:
+        """Bytes of the file that are exposed to searching."""
+        if not self.is_bytes:
+            return self.size
+        return sum(end - start for start, end in self.spans)
+
+    def close(self):
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except (BufferError, ValueError):
+                pass
+            self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _window_spans(size: int, limits: Dict[str, int]) -> Tuple[List[Tuple[int, int]], bool]:
+    if size <= limits["max_bytes"]:
+        return [(0, size)], False
+    head = min(limits["head_bytes"], size)
+    tail_start = max(head, size - limits["tail_bytes"])
+    spans = [(0, head)]
+    if tail_start < size:
+        spans.append((tail_start, size))
+    return spans, True
+
+
+def open_searchable(path: str, limits: Optional[Dict[str, int]] = None,
+                    size: Optional[int] = None) -> Optional[SearchableFile]:
+    """
+    Open path for searching within the given read limits.
+
+    Args:
+        path: File to open
+        limits: Result of resolve_read_limits (defaults if omitted)
+        size: Known file size, saves a stat call
+
+    Returns:
+        SearchableFile (close it when done) or None if the file cannot be read
+    """
+    if limits is None:
+        limits = DEFAULT_READ_LIMITS
+    try:
+        if size is None:
+            size = os.path.getsize(path)
+        if size <= limits["mmap_threshold"]:
+            with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+                content = fh.read()
+            return SearchableFile(path, content, None, size)
+
+        spans, truncated = _window_spans(size, limits)
+        with open(path, "rb") as fh:
+            try:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError, OverflowError):
+                mm = None
+            if mm is not None:
+                return SearchableFile(path, mm, spans, size, truncated, handle=mm)
+            # mapping failed (e.g. address space): read just the windows
+            chunks = []
+            out_spans = []
+            offset = 0
+            for start, end in spans:
+                fh.seek(start)
+                chunk = fh.read(end - start)
+                chunks.append(chunk)
+                out_spans.append((offset, offset + len(chunk)))
+                offset += len(chunk)
+            return SearchableFile(path, b"".join(chunks), out_spans, size, truncated)
+    except Exception:
+        return None
@@ -58,11 +58,11 @@ def execute_scan(web_module, state_data: Dict[str, Any], save_data_func):
     Execute a scan and update the last scan date.
     
     Args:
-        web_module: Module with main() function to execute scan
+        web_module: Module with get_fetcher() returning a BuildFetcher
         state_data: State dictionary to update
         save_data_func: Function to save state data
     """
-    web_module.main()
+    web_module.get_fetcher().update()
     today_str = str(date.today())
     save_data_func(state_data, {"last_scan_date": today_str}, "state")
     print(f"Automatic scan executed on {today_str}")
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Install size of every game, collected by the scanner's walk (core.scan_walker.walk_group).
+Byte counts are cached per directory, keyed by the directory's mtime: a later walk only lists
+and stats directories whose entries changed. There is one cache file per top folder in
+_metadata/dir_sizes/, read and written by the walk of that folder only, so a scan holds the
+cache of the folders being walked, not of the whole library. The per-game totals go to
+_metadata/sizes.json (game -> bytes), which the Data tab shows.
+
+A file rewritten in place (same name, new size) does not touch its directory's mtime; such
+changes are picked up by a forced scan (Rescan), which recounts everything.
+"""
+import os
+import json
+import hashlib
+from typing import Dict, Any, List, Iterable
+
+from core.scan_journal import write_json_atomic
+
+DIR_SIZES_DIR = "dir_sizes"
+DIR_SIZES_VERSION = 2
+# single cache file of the whole library written by older versions
+LEGACY_DIR_SIZES_NAME = "dir_sizes.json"
+SIZES_NAME = "sizes.json"
+
+
+def _dir_sizes_file(top: str) -> str:
+    key = os.path.normcase(os.path.normpath(top)).encode("utf-8", "surrogateescape")
+    return hashlib.sha1(key).hexdigest()[:20] + ".json"
+
+
+def load_dir_sizes(meta_dir: str, top: str) -> Dict[str, List[Any]]:
+    """
+    Load the directory cache of one top folder.
+
+    Returns:
+        Mapping directory path (absolute) -> [mtime_ns, bytes of its files, names of its
+        subdirectories]; empty if missing, unreadable, from another version or another folder
+    """
+    path = os.path.join(meta_dir, DIR_SIZES_DIR, _dir_sizes_file(top))
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != DIR_SIZES_VERSION or data.get("top") != top:
+        return {}
+    dirs = data.get("dirs")
+    if not isinstance(dirs, dict):
+        return {}
+    return {top if rel == os.curdir else os.path.join(top, rel): entry for rel, entry in dirs.items()}
+
+
+def save_dir_sizes(meta_dir: str, top: str, dirs: Dict[str, List[Any]]):
+    """Write the directory cache of one top folder (dirs as walk_group returns them)."""
+    folder = os.path.join(meta_dir, DIR_SIZES_DIR)
+    os.makedirs(folder, exist_ok=True)
+    # paths relative to the top folder keep the file small
+    rel = {os.path.relpath(p, top): entry for p, entry in dirs.items()}
+    write_json_atomic(os.path.join(folder, _dir_sizes_file(top)),
+                      {"version": DIR_SIZES_VERSION, "top": top, "dirs": rel},
+                      ensure_ascii=True, separators=(",", ":"))
+
+
+def prune_dir_sizes(meta_dir: str, tops: Iterable[str]):
+    """Delete the directory caches of all top folders but tops (and the legacy single file)."""
+    keep = {_dir_sizes_file(top) for top in tops}
+    folder = os.path.join(meta_dir, DIR_SIZES_DIR)
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        names = []
+    for name in names:
+        if name.endswith(".json") and name not in keep:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+    try:
+        os.remove(os.path.join(meta_dir, LEGACY_DIR_SIZES_NAME))
+    except OSError:
+        pass
+
+
+def load_game_sizes(path: str) -> Dict[str, int]:
+    """sizes.json contents (game -> bytes); empty if missing or unreadable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(v, int)}
+
+
+def save_game_sizes(path: str, sizes: Dict[str, int]):
+    write_json_atomic(path, sizes, indent=2, ensure_ascii=True)
@@ -0,0 +1,324 @@
+"""
+Lazy directory walker for the scanner.
+Yields one top folder (game) at a time, built on os.scandir so DirEntry data is reused
+instead of stat-ing paths again, and prunes directories with compiled skip rules.
+"""
+import os
+import re
+import stat
+import fnmatch
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Iterable, Set, NamedTuple
+
+# Vendor payloads that never hold emulator configs or version files.
+DEFAULT_SKIP_RULES = [
+    "_CommonRedist",
+    "CommonRedist",
+    "__Installer",
+    "Redist",
+    "DirectX",
+    "DotNetFX",
+    "vcredist*",
+    "Engine/Content",
+    "*/Content/Paks",
+]
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def _norm(p: str) -> str:
+    return os.path.normcase(p)
+
+
+class SkipRules:
+    """
+    Compiled directory skip rules.
+
+    A rule is one of:
+        - an absolute path: skips exactly that directory
+        - a path glob containing "/" (e.g. "Engine/Content"): matched against the
+          directory's path relative to its top folder
+        - a name ending in a single "*" (e.g. "vcredist*"): name prefix
+        - any other name or name glob: matched against the directory name at any depth
+    Matching is case-insensitive where the file system is (os.path.normcase).
+    """
+
+    def __init__(self, rules: Iterable[str]):
+        self.rules: List[str] = []
+        names: Set[str] = set()
+        prefixes: List[str] = []
+        name_globs: List[str] = []
+        path_globs: List[str] = []
+        self.paths: Set[str] = set()
+        for rule in rules:
+            if not isinstance(rule, str) or not rule:
+                continue
+            self.rules.append(rule)
+            if os.path.isabs(rule):
+                self.paths.add(_norm(os.path.normpath(rule)))
+                continue
+            rule = rule.replace("\\", "/").strip("/")
+            if "/" in rule:
+                path_globs.append(_norm(rule))
+            elif not _WILDCARDS.search(rule):
+                names.add(_norm(rule))
+            elif rule.endswith("*") and not _WILDCARDS.search(rule[:-1]):
+                prefixes.append(_norm(rule[:-1]))
+            else:
+                name_globs.append(_norm(rule))
+        self.names = frozenset(names)
+        self.prefixes = tuple(prefixes)
+        self._name_re = re.compile("|".join(fnmatch.translate(g) for g in name_globs)) if name_globs else None
+        self._path_re = re.compile("|".join(fnmatch.translate(g) for g in path_globs)) if path_globs else None
+
+    def matches(self, name: str, rel_path: Optional[str] = None, abs_path: Optional[str] = None) -> bool:
+        """
+        Args:
+            name: Directory name
+            rel_path: Path relative to the top folder, "/"-separated (None for top folders)
+            abs_path: Absolute path of the directory
+        """
+        name = _norm(name)
+        if name in self.names:
+            return True
+        if self.prefixes and name.startswith(self.prefixes):
+            return True
+        if self._name_re is not None and self._name_re.match(name):
+            return True
+        if rel_path is not None and self._path_re is not None and self._path_re.match(_norm(rel_path)):
+            return True
+        if abs_path is not None and self.paths and _norm(os.path.normpath(abs_path)) in self.paths:
+            return True
+        return False
+
+
+def _is_walkable_dir(entry: os.DirEntry) -> bool:
+    """Like os.walk(followlinks=False): descend into real directories only."""
+    try:
+        return entry.is_dir() and not entry.is_symlink()
+    except OSError:
+        return False
+
+
+def _listdir(path: str) -> Optional[List[os.DirEntry]]:
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return None
+
+
+def _mtime_ns(entry: os.DirEntry) -> int:
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _file_bytes(entry: os.DirEntry) -> int:
+    """Apparent size of a non-directory entry (a symlink counts as the link itself)."""
+    try:
+        return entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _cached_dir(sizes: Dict[str, List[Any]], path: str, mtime_ns: int) -> Optional[List[Any]]:
+    """Cached [mtime_ns, bytes, subdir names] of path if the directory did not change since."""
+    cached = sizes.get(path)
+    if (mtime_ns and isinstance(cached, list) and len(cached) == 3
+            and cached[0] == mtime_ns and isinstance(cached[2], list)):
+        return cached
+    return None
+
+
+def _tree_bytes(path: str, mtime_ns: int, sizes: Dict[str, List[Any]],
+                dir_sizes: Dict[str, List[Any]]) -> int:
+    """
+    Bytes below a directory the walk does not descend into (skipped or below max_depth).
+    Unchanged directories are taken from sizes and cost one stat per subdirectory;
+    every directory's entry is written to dir_sizes.
+    """
+    total = 0
+    stack: List[Tuple[str, int]] = [(path, mtime_ns)]
+    while stack:
+        path, mtime = stack.pop()
+        subdirs: List[Tuple[str, int]] = []
+        cached = _cached_dir(sizes, path, mtime)
+        if cached is not None:
+            own, names = cached[1], cached[2]
+            for name in names:
+                try:
+                    st = os.lstat(os.path.join(path, name))
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    subdirs.append((os.path.join(path, name), st.st_mtime_ns))
+        else:
+            entries = _listdir(path)
+            if entries is None:
+                continue
+            own, names = 0, []
+            for entry in entries:
+                if _is_walkable_dir(entry):
+                    names.append(entry.name)
+                    subdirs.append((entry.path, _mtime_ns(entry)))
+                elif not _is_dir(entry):
+                    own += _file_bytes(entry)
+        dir_sizes[path] = [mtime, own, names]
+        total += own
+        stack.extend(subdirs)
+    return total
+
+
+def walk_group(top: str, skip: Optional[SkipRules] = None, max_depth: Optional[int] = None,
+               stat_exts: Optional[Iterable[str]] = None,
+               top_mtime_ns: Optional[int] = None,
+               sizes: Optional[Dict[str, List[Any]]] = None) -> Tuple[List[Tuple[str, List[str]]], Dict[str, Any]]:
+    """
+    Walk one top folder in os.walk's top-down order.
+
+    Args:
+        top: Absolute path of the top folder
+        skip: Compiled skip rules for subdirectories
+        max_depth: Deepest directory level to list (top = 0); None for unlimited
+        stat_exts: Lower-case extensions whose files get size/mtime recorded
+        top_mtime_ns: mtime of top if already known
+        sizes: Directory size cache of the last walk (core.scan_sizes); if given, the install
+            size is counted too, skipped and too deep directories included
+
+    Returns:
+        (roots, stats): roots is the list of (root_path, files_in_root) the analyzer expects;
+        stats holds "dirs" {root: mtime_ns} and "files" {path: (size, mtime_ns)}; with sizes
+        also "bytes" (size of the whole folder) and "dir_sizes" (the cache entries of its directories)
+    """
+    exts = set(stat_exts or ())
+    roots: List[Tuple[str, List[str]]] = []
+    stats: Dict[str, Any] = {"dirs": {}, "files": {}}
+    dir_sizes: Dict[str, List[Any]] = {}
+    total = 0
+    if top_mtime_ns is None:
+        try:
+            top_mtime_ns = os.stat(top).st_mtime_ns
+        except OSError:
+            top_mtime_ns = 0
+    # stack of (path, rel_path, depth, mtime_ns); children pushed reversed to keep pre-order
+    stack: List[Tuple[str, str, int, int]] = [(top, "", 0, top_mtime_ns)]
+    while stack:
+        path, rel, depth, mtime = stack.pop()
+        entries = _listdir(path)
+        if entries is None:
+            continue
+        files: List[str] = []
+        subdirs: List[Tuple[str, str, int, int]] = []
+        # unchanged directory: its files' sizes are known without stat-ing them
+        cached = _cached_dir(sizes, path, mtime) if sizes is not None else None
+        own = cached[1] if cached is not None else 0
+        names: List[str] = []
+        pruned: List[Tuple[str, int]] = []
+        for entry in entries:
+            if _is_walkable_dir(entry):
+                if sizes is not None:
+                    names.append(entry.name)
+                sub_rel = f"{rel}/{entry.name}" if rel else entry.name
+                if ((max_depth is not None and depth >= max_depth)
+                        or (skip is not None and skip.matches(entry.name, sub_rel, entry.path))):
+                    if sizes is not None:
+                        pruned.append((entry.path, _mtime_ns(entry)))
+                    continue
+                subdirs.append((entry.path, sub_rel, depth + 1, _mtime_ns(entry)))
+            else:
+                try:
+                    if entry.is_dir():
+                        # symlinked directory: listed like os.walk does, never descended
+                        continue
+                except OSError:
+                    pass
+                files.append(entry.name)
+                if exts and os.path.splitext(entry.name)[1].lower() in exts:
+                    try:
+                        st = entry.stat()
+                        stats["files"][entry.path] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        stats["files"][entry.path] = (-1, 0)
+                if sizes is not None and cached is None:
+                    own += _file_bytes(entry)
+        roots.append((path, files))
+        stats["dirs"][path] = mtime
+        if sizes is not None:
+            dir_sizes[path] = [mtime, own, names]
+            total += own
+            for sub_path, sub_mtime in pruned:
+                total += _tree_bytes(sub_path, sub_mtime, sizes, dir_sizes)
+        stack.extend(reversed(subdirs))
+    if sizes is not None:
+        stats["bytes"] = total
+        stats["dir_sizes"] = dir_sizes
+    return roots, stats
+
+
+class TopFolder(NamedTuple):
+    name: str
+    path: str
+    mtime_ns: int
+
+
+def _stat_top_folder(base: str, name: str) -> Optional[TopFolder]:
+    """TopFolder for base/name if it is a real directory (no symlink), else None."""
+    path = os.path.join(base, name)
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    return TopFolder(name, path, st.st_mtime_ns)
+
+
+def list_top_folders(base: str, skip: Optional[SkipRules] = None,
+                     only: Optional[Iterable[str]] = None) -> List[TopFolder]:
+    """
+    Immediate child folders of base that a scan would walk, in directory order.
+    With only, just those names are stat-ed (in the given order) and base is not listed.
+    """
+    if only is not None:
+        candidates = [_stat_top_folder(base, name) for name in dict.fromkeys(only)]
+        tops = [top for top in candidates if top is not None]
+    else:
+        entries = _listdir(base)
+        if entries is None:
+            return []
+        tops = [TopFolder(entry.name, entry.path, _mtime_ns(entry))
+                for entry in entries if _is_walkable_dir(entry)]
+    if skip is None:
+        return tops
+    return [top for top in tops if not skip.matches(top.name, None, top.path)]
+
+
+def iter_groups(base: str, skip: Optional[SkipRules] = None, max_depth: Optional[int] = None,
+                stat_exts: Optional[Iterable[str]] = None,
+                only: Optional[Iterable[str]] = None,
+                tops: Optional[List[TopFolder]] = None) -> Iterator[Tuple[str, List[Tuple[str, List[str]]], Dict[str, Any]]]:
+    """
+    Yield (top_key, roots, stats) for every immediate child folder of base, one at a time,
+    so only the folder being analyzed is held in memory. Files directly in base are ignored.
+
+    Args:
+        base: Library directory
+        skip: Compiled skip rules (applied to top folders by name and absolute path too)
+        max_depth: Deepest level listed inside each top folder (top folder = 0)
+        stat_exts: See walk_group
+        only: If given, only these top folder names are walked
+        tops: Result of list_top_folders if already listed
+    """
+    if tops is None:
+        tops = list_top_folders(base, skip, only)
+    for top in tops:
+        roots, stats = walk_group(top.path, skip, max_depth, stat_exts, top.mtime_ns)
+        yield top.name, roots, stats
@@ -0,0 +1,207 @@
+"""
+Long-lived SteamCMD process for the build info fetcher (web.py).
+Starting SteamCMD costs a login and often a self-update check before anything is printed; a
+session pays that once and then sends commands over stdin. The "Steam>" prompt SteamCMD
+prints after every command splits the output per command. A session whose process died or
+stopped answering is restarted by the next command; otherwise it stays logged in until closed,
+and refresh_app_info keeps its app info cache current.
+"""
+import os
+import re
+import queue
+import codecs
+import shutil
+import tempfile
+import threading
+import subprocess
+from typing import Optional, List, IO, Callable
+
+# a prompt at the start of a line, possibly behind color codes
+PROMPT_RE = re.compile(r"(?:^|\n)(?:\x1b\[[0-9;]*m)*Steam>")
+_PROMPT_TAIL = 32
+DEFAULT_TIMEOUT = 300.0
+
+
+class SteamCmdError(subprocess.SubprocessError):
+    """SteamCMD exited or did not answer in time."""
+
+
+def resolve_steamcmd_path(configured: Optional[str], default: str) -> str:
+    """
+    SteamCMD executable to run: the configured path if set, else default if it exists,
+    else steamcmd from PATH, else default (so the error names the expected location).
+    """
+    if isinstance(configured, str) and configured.strip():
+        return configured.strip()
+    if os.path.exists(default):
+        return default
+    return shutil.which("steamcmd") or default
+
+
+def _read_segments(stream: IO[bytes], segments: "queue.Queue[Optional[str]]"):
+    """Reader thread: put the output between two prompts into segments, None at EOF."""
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    buf = ""
+    while True:
+        try:
+            data = stream.read(65536)
+        except (OSError, ValueError):
+            data = b""
+        if not data:
+            break
+        # only the new text (and the end of the old, a prompt may span reads) is searched
+        start = max(0, len(buf) - _PROMPT_TAIL)
+        buf += decoder.decode(data)
+        while True:
+            m = PROMPT_RE.search(buf, start)
+            if m is None:
+                break
+            segments.put(buf[:m.start()])
+            buf = buf[m.end():]
+            start = 0
+    segments.put(None)
+
+
+class SteamCmdSession:
+    """
+    One SteamCMD process, logged in anonymously, answering commands over stdin.
+
+    Example:
+        session = SteamCmdSession("steamcmd")
+        text = session.command("app_info_print 480")
+        session.close()
+    """
+
+    def __init__(self, steamcmd_path: str, isolated: bool = False, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            steamcmd_path: Path to steamcmd executable
+            isolated: Give the process its own +force_install_dir (for several sessions at once)
+            timeout: Seconds to wait for the login and for each command's prompt
+        """
+        self.steamcmd_path = steamcmd_path
+        self.timeout = timeout
+        self.install_dir = tempfile.mkdtemp(prefix="steamcmd_") if isolated else None
+        self.starts = 0
+        self._proc: Optional[subprocess.Popen] = None
+        self._segments: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self):
+        cmd = [self.steamcmd_path]
+        if self.install_dir is not None:
+            # has to come before +login
+            cmd += ["+force_install_dir", self.install_dir]
+        cmd += ["+login", "anonymous"]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT, bufsize=0)
+        self._segments = queue.Queue()
+        threading.Thread(target=_read_segments, args=(self._proc.stdout, self._segments),
+                         name="steamcmd-reader", daemon=True).start()
+        self.starts += 1
+        # the first prompt follows the login (and a self-update, if any)
+        self._read_segment(self.timeout)
+
+    def _read_segment(self, timeout: Optional[float]) -> str:
+        try:
+            segment = self._segments.get(timeout=timeout)
+        except queue.Empty:
+            raise SteamCmdError(f"SteamCMD did not answer within {timeout:.0f}s") from None
+        if segment is None:
+            raise SteamCmdError("SteamCMD exited")
+        return segment
+
+    def _quit(self):
+        """Ask SteamCMD to quit, kill it if it does not."""
+        if self.alive():
+            try:
+                self._proc.stdin.write(b"quit\n")  # pyright: ignore[reportOptionalMemberAccess]
+                self._proc.stdin.flush()  # pyright: ignore[reportOptionalMemberAccess]
+                self._proc.wait(timeout=10)  # pyright: ignore[reportOptionalMemberAccess]
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self._kill()
+
+    def _kill(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            for stream in (self._proc.stdin, self._proc.stdout):
+                try:
+                    stream.close()  # pyright: ignore[reportOptionalMemberAccess]
+                except (OSError, AttributeError):
+                    pass
+            self._proc = None
+
+    def command(self, line: str, timeout: Optional[float] = None) -> str:
+        """
+        Run one command and return its output (everything up to the next prompt).
+        A dead or stuck process is restarted and the command sent once more.
+
+        Raises:
+            OSError if SteamCMD cannot be started, SteamCmdError if it fails twice
+        """
+        return self.commands([line], timeout)[0]
+
+    def commands(self, lines: List[str], timeout: Optional[float] = None,
+                 on_output: Optional[Callable[[int, str], None]] = None) -> List[str]:
+        """
+        Run several commands and return the output of each. They are written in one go
+        (like the +command arguments of a one-shot SteamCMD), so SteamCMD does not wait for
+        a round trip per command; the prompts still split the output per command.
+        A dead or stuck process is restarted and all commands sent once more.
+
+        Args:
+            lines: Commands in order
+            timeout: Seconds to wait for each command's prompt
+            on_output: Called with (index, output) of every command as soon as it answered
+                (again for a command sent once more after a restart)
+
+        Raises:
+            OSError if SteamCMD cannot be started, SteamCmdError if it fails twice
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            try:
+                return self._send(lines, timeout, on_output)
+            except (OSError, SteamCmdError):
+                # died or stuck: start over once
+                self._kill()
+            try:
+                return self._send(lines, timeout, on_output)
+            except (OSError, SteamCmdError):
+                self._kill()
+                raise
+
+    def _send(self, lines: List[str], timeout: Optional[float],
+              on_output: Optional[Callable[[int, str], None]]) -> List[str]:
+        if not self.alive():
+            self._start()
+        self._proc.stdin.write("".join(line + "\n" for line in lines).encode("utf-8"))  # pyright: ignore[reportOptionalMemberAccess]
+        self._proc.stdin.flush()  # pyright: ignore[reportOptionalMemberAccess]
+        outputs = []
+        for i in range(len(lines)):
+            outputs.append(self._read_segment(timeout))
+            if on_output is not None:
+                on_output(i, outputs[-1])
+        return outputs
+
+    def refresh_app_info(self, timeout: Optional[float] = None) -> str:
+        """
+        Fetch the app info changes since SteamCMD last asked (app_info_update 1), so
+        app_info_print does not answer from a stale cache in a long-running session.
+        """
+        return self.command("app_info_update 1", timeout)
+
+    def close(self):
+        """Quit SteamCMD (killed if it does not exit) and remove the session's install dir."""
+        with self._lock:
+            self._quit()
+            if self.install_dir is not None:
+                shutil.rmtree(self.install_dir, ignore_errors=True)
@@ -0,0 +1,148 @@
+"""
+Valve KeyValues (VDF) text parser, used for SteamCMD's app_info_print output (web.py).
+One pass over the text: a single tokenizer regex without backtracking yields quoted strings,
+bare words and braces, and a stack turns them into nested dicts. Formatting (tabs, spaces,
+line breaks, CRLF) does not matter, and braces inside quoted strings are plain text.
+
+VdfParser takes the text in pieces (e.g. lines as SteamCMD prints them) and tells when the
+top-level block has closed, so a stream is tokenized once, while it arrives.
+
+Malformed input does not raise: a stray "}" is ignored, a key without a value is dropped and
+blocks left open at the end of the text are closed.
+"""
+import re
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# leading whitespace, then a quoted string (unrolled, so it cannot backtrack; an unterminated
+# one runs to the end) or anything else: a // comment, a [$PLATFORM] condition, a brace or a
+# bare word. Two groups keep findall's tuples small; the rare "other" tokens are told apart
+# by their first character.
+_TOKEN_RE = re.compile(r'''
+    [ \t\r\n]*
+    (?:
+        "([^"\\]*(?:\\.[^"\\]*)*)"?
+      | (//[^\n]*|\[[^\]\n"]*\]|[{}]|[^\s{}"]+)
+    )
+''', re.VERBOSE | re.DOTALL)
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+# longest prefix whose quoted strings are all closed (unrolled like the token regex)
+_CLOSED_QUOTES_RE = re.compile(r'[^"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"]*)*', re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+OPEN, CLOSE, STRING = "{", "}", "s"
+
+
+def _unescape(text: str) -> str:
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), text)
+
+
+def _skipped(other: str) -> bool:
+    """True for a comment or condition token."""
+    return other.startswith("//") or (other[0] == "[" and other[-1] == "]")
+
+
+def tokenize_vdf(text: str) -> Iterator[Tuple[str, str]]:
+    """
+    Tokens of text as (kind, value): (OPEN, "{"), (CLOSE, "}") or (STRING, text) for quoted
+    strings (unescaped) and bare words. Comments and conditions are skipped.
+    """
+    for quoted, other in _TOKEN_RE.findall(text):
+        if not other:
+            yield STRING, _unescape(quoted) if "\\" in quoted else quoted
+        elif other == OPEN or other == CLOSE:
+            yield other, other
+        elif not _skipped(other):
+            yield STRING, other
+
+
+def unclosed_quote(text: str) -> int:
+    """Index of the quoted string left open at the end of text; -1 if there is none."""
+    if "\\" not in text:
+        # without escapes the quotes simply alternate
+        return -1 if text.count('"') % 2 == 0 else text.rfind('"')
+    end = _CLOSED_QUOTES_RE.match(text).end()  # pyright: ignore[reportOptionalMemberAccess]
+    return -1 if end == len(text) else end
+
+
+class VdfParser:
+    """
+    Incremental KeyValues parser. Every piece fed has to end outside of a quoted string
+    (see unclosed_quote); line ends of SteamCMD's output do. With one_block, parsing stops
+    where the first top-level block closes and later text is ignored.
+
+    Example:
+        parser = VdfParser()
+        parser.feed('"480"\\n{\\n\\t"common"\\n')
+        parser.feed('\\t{\\n\\t}\\n}\\n')
+        parser.closed  ->  True
+        parser.root  ->  {"480": {"common": {}}}
+    """
+
+    def __init__(self, one_block: bool = False):
+        self.root: Dict[str, Any] = {}
+        self.one_block = one_block
+        self.opened = False
+        self._stack: List[Dict[str, Any]] = [self.root]
+        self._key: Optional[str] = None
+
+    @property
+    def depth(self) -> int:
+        """Blocks open at the end of the text fed so far."""
+        return len(self._stack) - 1
+
+    @property
+    def closed(self) -> bool:
+        """True once a top-level block was opened and closed again."""
+        return self.opened and len(self._stack) == 1
+
+    def feed(self, text: str):
+        """Parse the next piece of text into root."""
+        if self.one_block and self.closed:
+            return
+        stack = self._stack
+        current = stack[-1]
+        key = self._key
+        # tokenize_vdf inlined: this runs once per token of every app block
+        for quoted, other in _TOKEN_RE.findall(text):
+            if not other:
+                value = _unescape(quoted) if "\\" in quoted else quoted
+            elif other == OPEN:
+                child: Dict[str, Any] = {}
+                current["" if key is None else key] = child
+                stack.append(child)
+                current = child
+                self.opened = True
+                key = None
+                continue
+            elif other == CLOSE:
+                if len(stack) > 1:
+                    stack.pop()
+                    current = stack[-1]
+                    if len(stack) == 1 and self.one_block:
+                        break
+                key = None
+                continue
+            elif _skipped(other):
+                continue
+            else:
+                value = other
+            if key is None:
+                key = value
+            else:
+                current[key] = value
+                key = None
+        self._key = key
+
+
+def parse_vdf(text: str) -> Dict[str, Any]:
+    """
+    Parse KeyValues text into nested dicts (values are str or dict; a repeated key keeps
+    its last value).
+
+    Example:
+        parse_vdf('"480" { "common" { "name" "Spacewar" } }')
+          ->  {"480": {"common": {"name": "Spacewar"}}}
+    """
+    parser = VdfParser()
+    parser.feed(text)
+    return parser.root
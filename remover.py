@@ -1,7 +1,7 @@
 """
 Marker Remover
-Removes placed markers from game folders by main.py
-Used in Rescanning
+Removes legacy markers placed in game folders by older scanner versions
+Rescan removes them itself while walking (scanner.py --rescan); this is the standalone tool
 """
 import os
 import argparse
@@ -10,18 +10,22 @@ import json
 from typing import Optional, Dict, Any
 from utils.constants import SETTINGS_FILE_DEFAULT, META_DEFAULT
 from scanner import load_config
+from core.scan_walker import SkipRules, iter_groups
 
 
-def find_markers(base: str, marker_name: str, skippers):
-    found: List[str]
-    found = []
-    for root, _, files in os.walk(base):
-        for fn in files:
-            if fn == marker_name:
-                found.append(os.path.join(root, fn))
-    for skipper in skippers:
-        if skipper in found:
-            found.remove(skipper)
+def find_markers(base: str, marker_name: str, skippers) -> List[str]:
+    """
+    Marker files below base. Directories matching skippers (paths, names or globs, see
+    core.scan_walker.SkipRules) are pruned during the walk instead of filtered afterwards.
+    """
+    skip = SkipRules(s for s in skippers if isinstance(s, str))
+    found: List[str] = []
+    if os.path.isfile(os.path.join(base, marker_name)):
+        found.append(os.path.join(base, marker_name))
+    for _, roots, _ in iter_groups(base, skip):
+        for root, files in roots:
+            if marker_name in files:
+                found.append(os.path.join(root, marker_name))
     return found
 
 
@@ -37,16 +41,38 @@ def remove_files(paths: List[str]) -> int:
     return removed
 
 
-def main():
+def list_markers(base: Optional[str] = None, marker_name: str = ".processed_marker.txt",
+                 settings_path: str = SETTINGS_FILE_DEFAULT) -> List[str]:
+    """
+    Find legacy marker files below base.
+
+    Args:
+        base: Base directory (default: parent of the program dir)
+        marker_name: Marker filename to look for
+        settings_path: settings.json providing skipped_dirs
+
+    Returns:
+        Marker paths found
+    """
+    base = os.path.abspath(base if base else os.path.dirname(os.getcwd()))
+    skippers = [os.getcwd(), META_DEFAULT]
+    skippers.extend(load_config(settings_path).get("skipped_dirs") or [])
+    return find_markers(base, marker_name, skippers)
+
+
+def remove_markers(base: Optional[str] = None, marker_name: str = ".processed_marker.txt",
+                   settings_path: str = SETTINGS_FILE_DEFAULT) -> int:
+    """Remove the legacy markers list_markers finds; returns the number removed."""
+    return remove_files(list_markers(base, marker_name, settings_path))
+
+
+def main(argv: Optional[List[str]] = None):
     p = argparse.ArgumentParser(description="Remove marker files (default: .processed_marker.txt) recursively.")
     p.add_argument("-d", "--dir", help="Base directory (default: current working directory)", default=os.path.dirname(os.getcwd()))
     p.add_argument("-m", "--marker", help="Marker filename to remove", default=".processed_marker.txt")
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
-    base = os.path.abspath(args.dir)
-    skippers = [os.getcwd(), META_DEFAULT]
-    skippers.append(load_config(SETTINGS_FILE_DEFAULT).get("skipped_dirs")) # type: ignore
-    markers = find_markers(base, args.marker, skippers)
+    markers = list_markers(args.dir, args.marker)
     if not markers:
         print("No marker files found.")
         return
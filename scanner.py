@@ -4,14 +4,28 @@ Scans the game dir and produces jsons metadata and metadata_fix
 The Scan Button
 """
 import os
+import sys
 import json
 import argparse
 import re
-from typing import Dict, List, Any, Optional, Set, Tuple, DefaultDict
-from collections import defaultdict
+import fnmatch
+from typing import Dict, List, Any, Optional, Set, Tuple, DefaultDict, FrozenSet, Pattern, Iterator, Iterable, Union, Deque
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
 import time 
 
 from utils.constants import SETTINGS_FILE_DEFAULT, META_DEFAULT
+from core.scan_reader import SearchableFile, open_searchable, resolve_read_limits
+from core.scan_walker import DEFAULT_SKIP_RULES, SkipRules, TopFolder, iter_groups, list_top_folders, walk_group
+from core.scan_profile import ScanProfile, new_group_profile, rule_label, rule_stats
+from core.scan_index import load_scan_index, save_scan_index, fingerprint_group, exe_fingerprint, is_unchanged
+from core.pe_reader import EXE_EXTS, rank_executables, read_pe_version, pick_version, version_mentions_build
+from core.scan_moves import MoveTracker, rekey_records, rekey_ui, move_artwork, load_ui, save_ui
+from core.scan_sizes import SIZES_NAME, load_dir_sizes, save_dir_sizes, prune_dir_sizes, load_game_sizes, save_game_sizes
+from core.ndjson import NdjsonWriter
+from core.scan_journal import ScanJournal, read_journal, write_json_atomic
+from core.scan_cache import (mapping_digest, cache_config_key, load_extract_cache, save_extract_cache, file_entry,
+                             PE_VERSION_KEY)
 
 # Simple, explicit mappings (defaults).
 DEFAULT_SEARCHABLE_EXTS = [".txt", ".ini"]
@@ -40,6 +54,23 @@ DEFAULT_EXTENSION_MAPPINGS = [
     {"extensions": [".rexa"], "key": "emulator", "value": "REXA"},
 ]
 
+# Well-known locations probed before any other file of a game, in priority order.
+# A string is a glob matched against the file's path relative to the game folder (a glob
+# with "/" may match at any depth, e.g. ".../steam_settings/x.txt"); a dict can add "max_depth",
+# the deepest directory level (game folder = 0) at which the glob applies.
+DEFAULT_PROBE_TARGETS = [
+    "steam_appid.txt",
+    "steam_settings/*.txt",
+    "steam_settings/*.ini",
+    {"glob": "*.ini", "max_depth": 2},
+]
+
+# Number of worker processes used for analysis (1 = serial, in-process).
+DEFAULT_SCAN_JOBS = 1
+
+# Top folders walked at the same time per storage device (st_dev); 1 suits spinning disks.
+DEFAULT_DEVICE_CONCURRENCY = 1
+
 
 def normalize_path(p: str) -> str:
     return os.path.normpath(os.path.abspath(p))
@@ -72,26 +103,265 @@ def _match_value_from_regex(m: Optional[re.Match]) -> Optional[str]:
         return None
 
 
+def _match_text(m: Optional[re.Match]) -> Optional[str]:
+    """_match_value_from_regex for str and bytes matches; byte values are decoded as UTF-8."""
+    val = _match_value_from_regex(m)
+    if isinstance(val, bytes):
+        return val.decode("utf-8", errors="ignore")
+    return val
+
+
+# Regex constructs whose result depends on the text *before* the search start. For patterns
+# without them, pattern.search(content, pos) is equivalent to searching content[pos:].
+_POSITION_SENSITIVE_RE = re.compile(r"\^|\\[bBA]|\(\?<[=!]")
+
+
+class KeywordMatcher:
+    """
+    Finds the earliest keyword of every mapping in one pass over a lower-cased text,
+    or over a bytes-like text (large memory-mapped files) lower-cased chunk by chunk.
+
+    All keywords are combined into one alternation ordered longest first, so a hit at a
+    position is the longest keyword starting there and the other keywords starting there
+    are exactly its prefixes. Once a mapping is resolved its keywords are dropped from
+    the alternation, so the text is never rescanned per mapping or per keyword.
+    """
+
+    # bytes lower-cased at once when searching memory-mapped content
+    CHUNK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, mappings: List[Dict[str, Any]]):
+        self.keywords: List[List[str]] = [list(m.get("keywords", [])) for m in mappings]
+        # keyword -> [(mapping index, position of keyword in that mapping's list)]
+        self._owners: Dict[str, List[Tuple[int, int]]] = {}
+        for mi, kws in enumerate(self.keywords):
+            for rank, kw in enumerate(kws):
+                if kw:
+                    self._owners.setdefault(kw, []).append((mi, rank))
+        words = list(self._owners)
+        self._prefixes: Dict[str, List[str]] = {w: [p for p in words if w.startswith(p)] for w in words}
+        # utf-8 form of a keyword -> keyword
+        self._byte_words: Dict[bytes, str] = {w.encode("utf-8"): w for w in words}
+        self._patterns: Dict[Tuple[FrozenSet[str], bool], Pattern] = {}
+
+    def _pattern(self, words: FrozenSet[str], binary: bool) -> Pattern:
+        pattern = self._patterns.get((words, binary))
+        if pattern is None:
+            ordered = sorted(words, key=lambda w: (-len(w), w))
+            if binary:
+                pattern = re.compile(b"|".join(re.escape(w.encode("utf-8")) for w in ordered))
+            else:
+                pattern = re.compile("|".join(re.escape(w) for w in ordered))
+            self._patterns[(words, binary)] = pattern
+        return pattern
+
+    def _search(self, words: FrozenSet[str], text, pos: int, end: int) -> Optional[Tuple[int, str]]:
+        """Leftmost (index, longest keyword) of words in text[pos:end], or None."""
+        if isinstance(text, str):
+            m = self._pattern(words, False).search(text, pos, end)
+            return (m.start(), m.group()) if m else None
+        pattern = self._pattern(words, True)
+        overlap = max(len(w.encode("utf-8")) for w in words) - 1
+        while pos < end:
+            # a chunk is searched for matches *starting* before limit; the overlap lets
+            # every keyword starting there be seen in full
+            limit = min(end, pos + self.CHUNK_BYTES)
+            chunk = bytes(text[pos:min(end, limit + overlap)]).lower()
+            m = pattern.search(chunk)
+            if m and pos + m.start() < limit:
+                return pos + m.start(), self._byte_words[m.group()]
+            pos = limit
+        return None
+
+    @staticmethod
+    def _starts_with(text, kw: str) -> bool:
+        if isinstance(text, str):
+            return text.startswith(kw)
+        raw = kw.encode("utf-8")
+        return bytes(text[:len(raw)]).lower() == raw
+
+    def earliest(self, text, active: List[int],
+                 spans: Optional[List[Tuple[int, int]]] = None) -> Dict[int, Tuple[str, int]]:
+        """
+        Return mapping index -> (keyword, index) of the earliest keyword occurrence for every
+        mapping in active that occurs in text. Ties at the same index go to the keyword
+        listed first in the mapping, like a per-keyword str.find loop would.
+
+        Args:
+            text: Lower-cased str, or bytes-like content (searched ASCII case-insensitively)
+            active: Indexes of the mappings to look for
+            spans: (start, end) regions of text to search, in order (default: all of it)
+        """
+        found: Dict[int, Tuple[str, int]] = {}
+        pending: Set[int] = set()
+        for mi in active:
+            kws = self.keywords[mi]
+            if "" in kws:
+                # "" is found at index 0, so only keywords listed before it can still win
+                cut = kws.index("")
+                hits = [kw for kw in kws[:cut] if self._starts_with(text, kw)]
+                found[mi] = (hits[0] if hits else "", 0)
+            elif kws:
+                pending.add(mi)
+
+        for start, end in spans if spans is not None else [(0, len(text))]:
+            pos = start
+            while pending:
+                words = frozenset(kw for mi in pending for kw in self.keywords[mi])
+                result = self._search(words, text, pos, end)
+                if result is None:
+                    break
+                at, hit = result
+                ranks: Dict[int, int] = {}
+                for kw in self._prefixes[hit]:
+                    for mi, rank in self._owners[kw]:
+                        if mi in pending and (mi not in ranks or rank < ranks[mi]):
+                            ranks[mi] = rank
+                for mi, rank in ranks.items():
+                    found[mi] = (self.keywords[mi][rank], at)
+                pending.difference_update(ranks)
+                pos = at + 1
+            if not pending:
+                break
+        return found
+
+    def earliest_in(self, doc: SearchableFile, active: List[int]) -> Dict[int, Tuple[str, int]]:
+        """earliest() over the searchable part of an opened file."""
+        return self.earliest(doc.text if doc.is_bytes else doc.text_lower, active, doc.spans)
+
+
+class ProbeTargets:
+    """Compiled probe targets; rank() gives a file's probe priority (lower is probed first)."""
+
+    def __init__(self, targets: List[Any]):
+        self.rules: List[Tuple[Pattern, Optional[int]]] = []
+        for target in targets:
+            if isinstance(target, dict):
+                glob, max_depth = target.get("glob"), target.get("max_depth")
+            else:
+                glob, max_depth = target, None
+            if not isinstance(glob, str) or not glob:
+                continue
+            glob = glob.replace("\\", "/").strip("/").lower()
+            regex = fnmatch.translate(glob)
+            if "/" in glob:
+                # path globs may sit anywhere below the game folder
+                regex = f"(?:{regex})|(?:{fnmatch.translate('*/' + glob)})"
+            else:
+                # name globs apply to the file name only
+                regex = f"(?:.*/)?(?:{regex})"
+            self.rules.append((re.compile(regex), int(max_depth) if max_depth is not None else None))
+
+    def rank(self, rel_path: str) -> int:
+        """rel_path: "/"-separated path of a file relative to its game folder."""
+        rel = rel_path.lower()
+        depth = rel.count("/")
+        for i, (regex, max_depth) in enumerate(self.rules):
+            if max_depth is not None and depth > max_depth:
+                continue
+            if regex.match(rel):
+                return i
+        return len(self.rules)
+
+
+def compile_probe_targets(cfg: Dict[str, Any]) -> ProbeTargets:
+    targets = cfg.get("probe_targets")
+    return ProbeTargets(DEFAULT_PROBE_TARGETS if targets is None else targets)
+
+
+def _probe_order(roots: List[Tuple[str, List[str]]], targets: Optional[ProbeTargets]) -> List[Tuple[str, str]]:
+    """All (root, file) pairs of a game, well-known locations first, otherwise in walk order."""
+    pairs = [(root, fn) for root, files in roots for fn in files]
+    if not targets or not targets.rules or not roots:
+        return pairs
+    top = roots[0][0]
+    cut = len(top) + 1
+
+    def rel(root: str, fn: str) -> str:
+        sub = root[cut:].replace(os.sep, "/") if len(root) > len(top) else ""
+        return f"{sub}/{fn}" if sub else fn
+
+    # sorted() is stable, so files of equal rank keep their walk order
+    return sorted(pairs, key=lambda p: targets.rank(rel(*p)))
+
+
+def build_matchers(content_maps: List[Dict[str, Any]], filename_maps: List[Dict[str, Any]]) -> Dict[str, KeywordMatcher]:
+    return {"content": KeywordMatcher(content_maps), "filename": KeywordMatcher(filename_maps)}
+
+
+def _extract_after_keyword(mapping: Dict[str, Any], doc: SearchableFile, kw: str, idx: int) -> Optional[str]:
+    """
+    Apply the mapping's extract regex to the text following the keyword occurrences,
+    in file order, and return the first value found.
+    """
+    if doc.is_bytes:
+        regex = mapping.get("_extract_bre")
+        if regex is None:
+            return None
+        pos = idx + len(kw.encode("utf-8"))
+        for start, end in doc.spans:
+            if end <= pos:
+                continue
+            val = _match_text(regex.search(doc.text, max(pos, start), end))
+            if val is not None:
+                return val
+        return None
+
+    content, content_l = doc.text, doc.text_lower
+    regex = mapping["_extract_re"]
+    if mapping.get("_extract_from_pos"):
+        # the first occurrence's tail contains every later tail, so if it has no match none has
+        return _match_value_from_regex(regex.search(content, idx + len(kw)))
+    # anchors and lookbehinds see a slice start differently from a search position
+    for m_kw in re.finditer(re.escape(kw), content_l):
+        val = _match_value_from_regex(regex.search(content[m_kw.end():]))
+        if val is not None:
+            return val
+    return None
+
+
+def _search_anywhere(mapping: Dict[str, Any], doc: SearchableFile) -> Optional[str]:
+    """Apply the mapping's extract regex to the whole searchable content."""
+    if not doc.is_bytes:
+        return _match_text(mapping["_extract_re"].search(doc.text))
+    regex = mapping.get("_extract_bre")
+    if regex is None:
+        return None
+    for start, end in doc.spans:
+        val = _match_text(regex.search(doc.text, start, end))
+        if val is not None:
+            return val
+    return None
+
+
 def compile_mappings(cfg: Dict[str, Any]):
     content = cfg.get("content_mappings") or cfg.get("DEFAULT_CONTENT_MAPPINGS") or DEFAULT_CONTENT_MAPPINGS
     filename = cfg.get("filename_mappings") or cfg.get("DEFAULT_FILENAME_MAPPINGS") or DEFAULT_FILENAME_MAPPINGS
     extension = cfg.get("extension_mappings") or cfg.get("DEFAULT_EXTENSION_MAPPINGS") or DEFAULT_EXTENSION_MAPPINGS
     searchable_exts = cfg.get("searchable_exts") or DEFAULT_SEARCHABLE_EXTS
 
-    for lst in (content, filename):
+    for kind, lst in (("content", content), ("filename", filename)):
         for entry in lst:
             entry["keywords"] = [k.lower() for k in entry.get("keywords", [])]
             entry["key"] = str(entry["key"])
+            # extraction cache key of this mapping (see core.scan_cache)
+            entry["_digest"] = mapping_digest(kind, entry)
             if "extract_regex" in entry and entry["extract_regex"]:
                 # ensure capture groups exist in filename mappings where expected
                 entry["_extract_re"] = re.compile(entry["extract_regex"], flags=re.IGNORECASE)
+                entry["_extract_from_pos"] = not _POSITION_SENSITIVE_RE.search(entry["extract_regex"])
+                # byte-level twin used on memory-mapped large files
+                try:
+                    entry["_extract_bre"] = re.compile(entry["extract_regex"].encode("utf-8"), flags=re.IGNORECASE)
+                except re.error:
+                    entry["_extract_bre"] = None
 
     for entry in extension:
         entry["extensions"] = [e.lower() for e in entry.get("extensions", [])] #_ensure_dot()
         entry["key"] = str(entry["key"])
 
     searchable_exts = [e.lower() for e in searchable_exts] #_ensure_dot()
-    return content, filename, extension, searchable_exts
+    return content, filename, extension, searchable_exts, build_matchers(content, filename)
 
 
 def load_existing_metadatas(meta_dir: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
@@ -133,34 +403,49 @@ def merge_value(existing, new):
 
 
 def save_metadata_outputs(meta_dir: str, meta1: Dict[str, Any], meta2: Dict[str, Any]):
+    """Write both metadata files, each replaced atomically (see core.scan_journal)."""
     os.makedirs(meta_dir, exist_ok=True)
     path1 = os.path.join(meta_dir, "metadata.json")
     path2 = os.path.join(meta_dir, "metadata_fix.json")
-    with open(path1, "w", encoding="utf-8") as fh:
-        json.dump(meta1, fh, indent=2, ensure_ascii=True)
-    with open(path2, "w", encoding="utf-8") as fh:
-        json.dump(meta2, fh, indent=2, ensure_ascii=True)
+    write_json_atomic(path1, meta1, indent=2, ensure_ascii=True)
+    write_json_atomic(path2, meta2, indent=2, ensure_ascii=True)
 
 
-def collect_roots(base: str, skip_dirs: Optional[List[str]] = None) -> DefaultDict[str, List[Tuple[str, List[str]]]]:
+def build_skip_rules(meta_dir: str, program_dir: str, cfg: Dict[str, Any], settings: Dict[str, Any]) -> SkipRules:
+    """
+    Compile the directory skip rules for a scan: the metadata and program folders, the vendor
+    defaults (or the config's "skip_rules") and the user's "skipped_dirs" setting.
+    """
+    rules = [os.path.basename(meta_dir), program_dir]
+    rules.extend(cfg.get("skip_rules") or DEFAULT_SKIP_RULES)
+    rules.extend(settings.get("skipped_dirs") or [])
+    return SkipRules(rules)
+
+
+def resolve_max_depth(cli_depth: Optional[int], settings: Dict[str, Any]) -> Optional[int]:
+    """CLI value wins over the "max_scan_depth" setting; 0 or invalid means unlimited."""
+    value = cli_depth if cli_depth is not None else settings.get("max_scan_depth", 0)
+    try:
+        depth = int(value)
+    except (TypeError, ValueError):
+        return None
+    return depth if depth > 0 else None
+
+
+def collect_roots(base: str, skip_dirs: Optional[List[str]] = None,
+                  max_depth: Optional[int] = None) -> DefaultDict[str, List[Tuple[str, List[str]]]]:
     """
     Walk base and group roots/files per immediate child folder (top_key).
     Returns mapping: top_key -> list of (root_path, files_in_root)
-    Skips any directory names in skip_dirs.
+    Skips any directories matching skip_dirs (see core.scan_walker.SkipRules).
     NOTE: do not create a special "_root" key for files directly in base (we skip rel==".")
+    Holds the whole tree in memory; scans use iter_groups to get one folder at a time.
     """
     if skip_dirs is None:
         skip_dirs = ["_metadata", os.getcwd()]
     groups: DefaultDict[str, List[Tuple[str, List[str]]]] = defaultdict(list)
-    for root, dirs, files in os.walk(base):
-        # prevent descending into metadata output folder
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        rel = os.path.relpath(root, base)
-        # skip the base root itself (avoid creating a "_root" top key)
-        if rel == ".":
-            continue
-        top_key = rel.split(os.sep)[0]
-        groups[top_key].append((root, files))
+    for top_key, roots, _ in iter_groups(base, SkipRules(skip_dirs), max_depth):
+        groups[top_key].extend(roots)
     return groups
 
 
@@ -168,11 +453,71 @@ def analyze_group(roots: List[Tuple[str, List[str]]],
                   content_maps: List[Dict[str, Any]],
                   filename_maps: List[Dict[str, Any]],
                   extension_maps: List[Dict[str, Any]],
-                  searchable_exts: List[str]) -> Dict[str, Any]:
+                  searchable_exts: List[str],
+                  matchers: Optional[Dict[str, KeywordMatcher]] = None,
+                  limits: Optional[Dict[str, int]] = None,
+                  targets: Optional[ProbeTargets] = None,
+                  report: Optional[Dict[str, Any]] = None,
+                  profile: bool = False,
+                  file_stats: Optional[Dict[str, Tuple[int, int]]] = None,
+                  cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Analyze all roots belonging to a single top folder and return metadata dict for that top folder.
+    matchers are the keyword matchers from compile_mappings; built on the fly if omitted.
+    limits are the read limits from resolve_read_limits (defaults if omitted).
+    targets decide which files are probed first (walk order if omitted).
+    If report is given it receives "truncated" (files only searched partially), "files_opened",
+    "bytes_read" and "cache_hits"; with profile also "profile" (phase timings and per-mapping
+    attempts, hits and time, see core.scan_profile).
+    cache is the extraction cache (path -> entry, see core.scan_cache) of this folder's files:
+    files whose size and mtime match are not opened again, and new outcomes are written into
+    it (report["cache"] holds it afterwards, so a worker process can hand it back).
+    file_stats are the walk's {path: (size, mtime_ns)} of searchable files; others are stat-ed.
     """
     folder_meta: Dict[str, Any] = {}
+    if matchers is None:
+        matchers = build_matchers(content_maps, filename_maps)
+    truncated: List[str] = []
+    counters = {"files_opened": 0, "bytes_read": 0, "cache_hits": 0}
+    ordered = _probe_order(roots, targets)
+    prof = new_group_profile() if profile else None
+    clock = time.perf_counter
+    if prof is not None:
+        prof["files"] = len(ordered)
+        phases = prof["phases"]
+        content_labels = [rule_label("content", i, cm) for i, cm in enumerate(content_maps)]
+        filename_labels = [rule_label("filename", i, fm) for i, fm in enumerate(filename_maps)]
+
+    # files the filename pass may read are kept open after the content pass reads them
+    fn_keywords = [kw for fm in filename_maps if "_extract_re" in fm for kw in fm["keywords"]]
+    opened: Dict[str, Optional[SearchableFile]] = {}
+
+    def wanted_later(fn: str) -> bool:
+        stem = os.path.splitext(fn)[0].lower()
+        return any(kw in stem for kw in fn_keywords)
+
+    def open_doc(path: str) -> Optional[SearchableFile]:
+        if path in opened:
+            return opened[path]
+        start = clock() if prof is not None else 0.0
+        doc = open_searchable(path, limits)
+        if prof is not None:
+            phases["open_s"] += clock() - start
+            if doc is not None:
+                phases["open_s"] -= doc.lower_s
+                phases["lower_s"] += doc.lower_s
+        if doc is not None:
+            counters["files_opened"] += 1
+            counters["bytes_read"] += doc.bytes_read
+            if doc.truncated and path not in truncated:
+                truncated.append(path)
+        return doc
+
+    def release(path: str, doc: SearchableFile, keep: bool):
+        if keep:
+            opened[path] = doc
+        elif path not in opened:
+            doc.close()
 
     def set_meta(k: str, v: Any):
         if k in folder_meta:
@@ -180,132 +525,334 @@ def analyze_group(roots: List[Tuple[str, List[str]]],
         else:
             folder_meta[k] = v
 
-    # helper: find earliest occurrence of any keyword in content (return keyword and index) or (None, -1)
-    def find_earliest_keyword(content_lower: str, keywords: List[str]) -> Tuple[Optional[str], int]:
-        best_kw = None
-        best_idx = -1
-        for kw in keywords:
-            idx = content_lower.find(kw)
-            if idx != -1 and (best_idx == -1 or idx < best_idx):
-                best_kw = kw
-                best_idx = idx
-        return best_kw, best_idx
-
-    # 1) Content mappings
-    for root, files in roots:
-        for fn in files:
-            _, ext = os.path.splitext(fn)
-            if ext.lower() not in searchable_exts:
-                continue
-            path = os.path.join(root, fn)
+    def cache_entry(path: str) -> Optional[Dict[str, Any]]:
+        if cache is None:
+            return None
+        st = file_stats.get(path) if file_stats else None
+        if st is None:
             try:
-                with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-                    content = fh.read()
-            except Exception:
+                info = os.stat(path)
+                st = (info.st_size, info.st_mtime_ns)
+            except OSError:
+                return None
+        if st[0] < 0:
+            return None
+        return file_entry(cache, path, st[0], st[1])
+
+    def cached_content(entry: Dict[str, Any], active: List[int]) -> Optional[List[Tuple[str, Any]]]:
+        # replay the content pass for one file; None if an evaluated mapping has no outcome yet
+        out = entry["out"]
+        planned: List[Tuple[str, Any]] = []
+        keys: Set[str] = set()
+        for i in active:
+            cm = content_maps[i]
+            if cm["key"] in folder_meta or cm["key"] in keys:
                 continue
-            content_l = content.lower()
-            for cm in content_maps:
+            if cm["_digest"] not in out:
+                return None
+            if out[cm["_digest"]] is not None:
+                planned.append((cm["key"], out[cm["_digest"]]))
+                keys.add(cm["key"])
+        return planned
+
+    def note_cached(path: str, entry: Dict[str, Any]):
+        counters["cache_hits"] += 1
+        if entry.get("truncated") and path not in truncated:
+            truncated.append(path)
+
+    # 1) Content mappings, stopping once every content key is known (later files could not change anything)
+    content_keys = {cm["key"] for cm in content_maps}
+    for root, fn in ordered:
+        if content_keys.issubset(folder_meta):
+            break
+        _, ext = os.path.splitext(fn)
+        if ext.lower() not in searchable_exts:
+            continue
+        if prof is not None:
+            prof["searchable"] += 1
+        path = os.path.join(root, fn)
+        active = [i for i, cm in enumerate(content_maps) if cm["key"] not in folder_meta]
+        entry = cache_entry(path)
+        planned = cached_content(entry, active) if entry is not None else None
+        if planned is not None:
+            note_cached(path, entry)
+            for k, v in planned:
+                set_meta(k, v)
+            continue
+        doc = open_doc(path)
+        if doc is None:
+            continue
+        if entry is not None:
+            entry["truncated"] = doc.truncated
+        try:
+            # earliest occurrence among all keywords of each mapping (so mapping respects file order)
+            start = clock() if prof is not None else 0.0
+            earliest = matchers["content"].earliest_in(doc, active)
+            if prof is not None:
+                phases["keyword_search_s"] += clock() - start
+            for i in active:
+                cm = content_maps[i]
                 if cm["key"] in folder_meta:
                     continue
+                if prof is not None:
+                    stats = rule_stats(prof, content_labels[i])
+                    stats["attempts"] += 1
 
-                # find earliest occurrence among all keywords in this file (so mapping respects file order)
-                found_kw, found_idx = find_earliest_keyword(content_l, cm.get("keywords", []))
+                found_kw, found_idx = earliest.get(i, (None, -1))
+                if entry is not None:
+                    entry["out"][cm["_digest"]] = None
                 if not found_kw:
                     continue
 
                 # if mapping defines fixed value, set and stop searching this mapping
                 if "value" in cm:
                     set_meta(cm["key"], cm["value"])
+                    if entry is not None:
+                        entry["out"][cm["_digest"]] = cm["value"]
+                    if prof is not None:
+                        stats["hits"] += 1
                     continue
 
                 val = None
                 # If an extract regex exists: only accept matches from that regex.
                 if "_extract_re" in cm:
-                    # check every occurrence of the keyword (in file order) and try regex on the tail after that occurrence
-                    for m_kw in re.finditer(re.escape(found_kw), content_l):
-                        tail_pos = m_kw.end()
-                        tail_all = content[tail_pos:]
-                        m = cm["_extract_re"].search(tail_all)
-                        val = _match_value_from_regex(m)
-                        if val is not None:
-                            break
+                    start = clock() if prof is not None else 0.0
+                    val = _extract_after_keyword(cm, doc, found_kw, found_idx)
+                    if prof is not None:
+                        elapsed = clock() - start
+                        stats["time_s"] += elapsed
+                        phases["extract_s"] += elapsed
 
                 if val is not None:
                     set_meta(cm["key"], val)
+                    if entry is not None:
+                        entry["out"][cm["_digest"]] = val
+                    if prof is not None:
+                        stats["hits"] += 1
                 # once a mapping is set we skip it in later files/lines (handled by top-of-loop check)
+        finally:
+            release(path, doc, wanted_later(fn))
 
     # 2) Filename mappings: match stem, then read content of matched files and extract (not value from filename)
-    for fm in filename_maps:
-        if fm["key"] in folder_meta:
-            continue
-        for root, files in roots:
-            for fn in files:
+    try:
+        for fi, fm in enumerate(filename_maps):
+            if fm["key"] in folder_meta:
+                continue
+            for root, fn in ordered:
                 stem = os.path.splitext(fn)[0].lower()
-                if any(kw in stem for kw in fm["keywords"]):
-                    if "value" in fm:
-                        set_meta(fm["key"], fm["value"])
+                if not any(kw in stem for kw in fm["keywords"]):
+                    continue
+                if "value" in fm:
+                    set_meta(fm["key"], fm["value"])
+                    break
+                if "_extract_re" not in fm:
+                    continue
+                path = os.path.join(root, fn)
+                entry = cache_entry(path)
+                if entry is not None and fm["_digest"] in entry["out"]:
+                    note_cached(path, entry)
+                    val = entry["out"][fm["_digest"]]
+                    if val is not None:
+                        set_meta(fm["key"], val)
                         break
-                    if "_extract_re" in fm:
-                        path = os.path.join(root, fn)
-                        try:
-                            with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-                                content = fh.read()
-                        except Exception:
-                            continue
-                        content_l = content.lower()
-
-                        # find earliest keyword occurrence(s), and try regex after each occurrence
-                        found_kw, _ = find_earliest_keyword(content_l, fm.get("keywords", []))
-                        val = None
-                        if found_kw:
-                            for m_kw in re.finditer(re.escape(found_kw), content_l):
-                                tail_pos = m_kw.end()
-                                tail_all = content[tail_pos:]
-                                m = fm["_extract_re"].search(tail_all)
-                                val = _match_value_from_regex(m)
-                                if val is not None:
-                                    break
-                        # fallback: regex on whole content (allowed for filename mappings)
-                        if val is None:
-                            m2 = fm["_extract_re"].search(content)
-                            val = _match_value_from_regex(m2)
-                        if val is not None:
-                            set_meta(fm["key"], val)
-                            break
-            if fm["key"] in folder_meta:
-                break
+                    continue
+                doc = open_doc(path)
+                if doc is None:
+                    continue
+                if entry is not None:
+                    entry["truncated"] = doc.truncated
+                start = clock() if prof is not None else 0.0
+                try:
+                    # find earliest keyword occurrence(s), and try regex after each occurrence
+                    found_kw, found_idx = matchers["filename"].earliest_in(doc, [fi]).get(fi, (None, -1))
+                    val = None
+                    if found_kw:
+                        val = _extract_after_keyword(fm, doc, found_kw, found_idx)
+                    # fallback: regex on whole content (allowed for filename mappings)
+                    if val is None:
+                        val = _search_anywhere(fm, doc)
+                    if entry is not None:
+                        entry["out"][fm["_digest"]] = val
+                finally:
+                    # another filename mapping may want the same file
+                    release(path, doc, True)
+                if prof is not None:
+                    elapsed = clock() - start
+                    stats = rule_stats(prof, filename_labels[fi])
+                    stats["attempts"] += 1
+                    stats["time_s"] += elapsed
+                    phases["extract_s"] += elapsed
+                    if val is not None:
+                        stats["hits"] += 1
+                if val is not None:
+                    set_meta(fm["key"], val)
+                    break
+    finally:
+        for doc in opened.values():
+            if doc is not None:
+                doc.close()
 
     # 3) Extension presence mapping
-    for em in extension_maps:
+    for ei, em in enumerate(extension_maps):
+        start = clock() if prof is not None else 0.0
+        hit = False
         for root, files in roots:
             names_lower = [f.lower() for f in files]
             for ext in em["extensions"]:
                 if any(n.endswith(ext) for n in names_lower):
                     set_meta(em["key"], em["value"])
+                    hit = True
                     break
             if em["key"] in folder_meta:
                 break
+        if prof is not None:
+            elapsed = clock() - start
+            stats = rule_stats(prof, rule_label("extension", ei, em))
+            stats["attempts"] += 1
+            stats["hits"] += int(hit)
+            stats["time_s"] += elapsed
+            phases["extension_s"] += elapsed
 
+    if report is not None:
+        report["truncated"] = truncated
+        report.update(counters)
+        if cache is not None:
+            report["cache"] = cache
+        if prof is not None:
+            report["profile"] = prof
     return folder_meta
 
 
-def mark_top_folder(base: str, top_key: str, marker_name: str, marker_code: str):
+def exe_version(path: str, file_stats: Optional[Dict[str, Tuple[int, int]]] = None,
+                cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
     """
-    Create marker file inside the real top-level folder to indicate processed.
+    Version resource of an executable (core.pe_reader.read_pe_version), taken from the
+    extraction cache while the file's size and mtime are unchanged.
     """
-    if top_key == "_root":
-        target = base
-    else:
-        target = os.path.join(base, top_key)
+    st = (file_stats or {}).get(path)
+    entry = None
+    if cache is not None and st is not None and st[0] >= 0:
+        entry = file_entry(cache, path, st[0], st[1])
+        if PE_VERSION_KEY in entry["out"]:
+            return entry["out"][PE_VERSION_KEY]
+    info = read_pe_version(path, st[0] if st is not None and st[0] >= 0 else None)
+    if info is not None:
+        # only what pick_version / version_mentions_build look at
+        strings = {k: v for k, v in info["strings"].items() if k in ("ProductVersion", "FileVersion")}
+        info = {"file_version": info.get("file_version"), "product_version": info.get("product_version"),
+                "strings": strings}
+    if entry is not None:
+        entry["out"][PE_VERSION_KEY] = info
+    return info
+
+
+def apply_exe_version(meta: Dict[str, Any], exe: str, info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Fill "version" from the executable's version resource unless a mapping found one, and
+    check whether the version mentions the "build" found by the mappings.
+
+    Returns:
+        Report entry {"exe", "version", "build_matches" (None without build)} or None
+    """
+    if not info:
+        return None
+    version = pick_version(info)
+    if version and "version" not in meta:
+        meta["version"] = version
+    build_matches = None
+    if "build" in meta:
+        builds = meta["build"] if isinstance(meta["build"], list) else [meta["build"]]
+        build_matches = any(version_mentions_build(info, b) for b in builds)
+    return {"exe": exe, "version": version, "build_matches": build_matches}
+
+
+def _analyze_task(task: Tuple[Tuple[Any, ...], Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Worker entry point for the process pool (must stay top-level to be picklable).
+    The task is (positional args, keyword options) of analyze_group; the report also gets "analyze_s"
+    and, for the "executables" option ((path, size) of .exe files), "executables" (best first),
+    "exe_version" (see apply_exe_version; the best executable's version fills a missing "version")
+    and "exe_fingerprint" (the best executable's index keys, see core.scan_index.exe_fingerprint).
+    """
+    args, options = task
+    options = dict(options)
+    executables = options.pop("executables", None)
+    report: Dict[str, Any] = {}
+    start = time.perf_counter()
+    meta = analyze_group(*args, report=report, **options)
+    if executables:
+        # candidates collected by the walk; only their PE headers are read
+        report["executables"] = rank_executables(executables, args[0][0][0])
+        if report["executables"]:
+            best = report["executables"][0]
+            info = exe_version(best, options.get("file_stats"), options.get("cache"))
+            report["exe_version"] = apply_exe_version(meta, best, info)
+            report["exe_fingerprint"] = exe_fingerprint(args[0][0][0], best, options.get("file_stats"))
+    report["analyze_s"] = time.perf_counter() - start
+    return meta, report
+
+
+def resolve_jobs(cli_jobs: Optional[int], settings: Dict[str, Any]) -> int:
+    """CLI value wins over the "scan_jobs" setting; anything invalid falls back to serial."""
+    value = cli_jobs if cli_jobs is not None else settings.get("scan_jobs", DEFAULT_SCAN_JOBS)
     try:
-        os.makedirs(target, exist_ok=True)
-        with open(os.path.join(target, marker_name), "w", encoding="utf-8") as fh:
-            fh.write(marker_code)
-    except Exception:
-        pass
+        jobs = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_SCAN_JOBS
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def resolve_per_device(cli_value: Optional[int], settings: Dict[str, Any]) -> int:
+    """CLI value wins over the "device_concurrency" setting; anything invalid falls back to the default."""
+    value = cli_value if cli_value is not None else settings.get("device_concurrency", DEFAULT_DEVICE_CONCURRENCY)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_DEVICE_CONCURRENCY
+
+
+def resolve_library_roots(base: str, settings: Dict[str, Any]) -> List[str]:
+    """
+    base followed by the "library_roots" setting, without duplicates or missing folders.
+    Relative entries are taken relative to base (the game directory), not the working directory.
+    """
+    base = normalize_path(base)
+    roots: List[str] = []
+    seen: Set[str] = set()
+    for root in [base] + list(settings.get("library_roots") or []):
+        if not isinstance(root, str) or not root:
+            continue
+        root = normalize_path(os.path.join(base, root))
+        key = os.path.normcase(root)
+        if key in seen or not os.path.isdir(root):
+            continue
+        seen.add(key)
+        roots.append(root)
+    return roots
+
+
+def device_of(path: str) -> int:
+    """Storage device id (st_dev) of path; roots that cannot be stat-ed share device -1."""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return -1
+
+
+def top_folder_of(path: str, roots: List[str]) -> Optional[str]:
+    """Top folder (root/name) that path lies in, None if it is in none of the roots."""
+    for root in roots:
+        prefix = os.path.join(root, "")
+        if path.startswith(prefix):
+            name = path[len(prefix):].split(os.sep, 1)[0]
+            return os.path.join(root, name) if name else None
+    return None
 
 
 def top_folder_is_marked(base: str, top_key: str, marker_name: str) -> bool:
+    """Legacy check for marker files written by older versions (now replaced by the scan index)."""
     if top_key == "_root":
         path = os.path.join(base, marker_name)
     else:
@@ -313,63 +860,661 @@ def top_folder_is_marked(base: str, top_key: str, marker_name: str) -> bool:
     return os.path.exists(path)
 
 
-def main(folder=None):
-    parser = argparse.ArgumentParser(description="Scan folders, extract folder-level metadata and write two JSONs.")
-    parser.add_argument("-d", "--dir", required=False, help="Base directory to scan (default: parent dir)")
-    parser.add_argument("-c", "--config", help="Optional JSON config to override mappings")
-    parser.add_argument("-o", "--out", help="Output folder for metadata (default: _metadata/)")
-    parser.add_argument("--force", action="store_true", help="Rescan all folders (ignore markers)")
-    parser.add_argument("--marker-name", default=".processed_marker.txt", help="Marker filename placed in processed folders")
-    parser.add_argument("--marker-code", default="###99999###", help="Content written into marker file")
-    args = parser.parse_args()
+def remove_group_markers(roots: List[Tuple[str, List[str]]], marker_name: str,
+                         stats: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Delete legacy marker files found in an already walked folder and drop them from roots,
+    so they are neither analyzed nor fingerprinted. Directory mtimes in stats are refreshed
+    for the directories a marker was removed from.
 
-    base = normalize_path(args.dir) if args.dir else normalize_path(os.path.dirname(os.getcwd()))
-    cfg = load_config(args.config) if args.config else {}
-    content_maps, filename_maps, extension_maps, searchable_exts = compile_mappings(cfg)
+    Returns:
+        Number of markers removed
+    """
+    removed = 0
+    for root, files in roots:
+        if marker_name not in files:
+            continue
+        try:
+            os.remove(os.path.join(root, marker_name))
+        except OSError:
+            continue
+        files.remove(marker_name)
+        removed += 1
+        if stats is not None:
+            try:
+                stats["dirs"][root] = os.stat(root).st_mtime_ns
+            except OSError:
+                pass
+    return removed
 
-    meta_dir = args.out if args.out else META_DEFAULT
-    program_dir = normalize_path(os.getcwd())
-    existing_meta1, existing_meta2 = load_existing_metadatas(meta_dir)
 
-    skipped_dirs = [os.path.basename(meta_dir), program_dir]
-    skipped_dirs.extend(load_config(SETTINGS_FILE_DEFAULT).get("skipped_dirs", []))
+def _is_cancelled(cancel) -> bool:
+    return cancel is not None and cancel.is_set()
 
-    # collect groups under base, skip metadata folder so we don't descend into it
-    groups = collect_roots(base, skip_dirs=skipped_dirs)
 
-    to_process: List[str] = []
-    for top_key in groups.keys():
-        # skip metadata output itself
-        if top_key == os.path.basename(meta_dir) or top_key == os.path.basename(program_dir):
-            continue
-        # skip already marked folders (unless force)
-        if not args.force and top_folder_is_marked(base, top_key, args.marker_name):
-            continue
-        to_process.append(top_key)
+class Scanner:
+    """
+    Reusable scanner for programmatic use (GUI, scripts).
+
+    Mappings, matchers, read limits and probe targets are compiled once per instance;
+    settings.json is re-read (and the skip rules rebuilt) only when it changes.
+    Metadata and the scan index are loaded fresh for every scan.
+
+    Several library roots can be scanned into one metadata set. Top folders are walked and
+    analyzed per device (roots grouped by st_dev), at most per_device at a time on each device,
+    so different disks are read concurrently without thrashing a single one.
+
+    Example:
+        Scanner().scan(folders=["Some Game"])
+    """
+
+    def __init__(self, config: Optional[str] = None,
+                 base: Union[str, List[str], None] = None,
+                 meta_dir: Optional[str] = None,
+                 jobs: Optional[int] = None,
+                 max_depth: Optional[int] = None,
+                 max_file_bytes: Optional[int] = None,
+                 marker_name: str = ".processed_marker.txt",
+                 settings_path: str = SETTINGS_FILE_DEFAULT,
+                 per_device: Optional[int] = None,
+                 use_cache: bool = True,
+                 ui_path: Optional[str] = None,
+                 imgs_dir: Optional[str] = None,
+                 sizes_path: Optional[str] = None):
+        """
+        Args:
+            config: Optional JSON config path overriding mappings
+            base: Library root or list of roots (default: parent of the program dir plus the
+                "library_roots" setting)
+            meta_dir: Output folder for metadata (default: _metadata/)
+            jobs: Worker processes (default: "scan_jobs" setting; at most per_device per device
+                are busy). With one job, folders are analyzed on the per-device threads
+            max_depth: Deepest directory level per game (default: "max_scan_depth" setting)
+            max_file_bytes: Per-file read budget override
+            marker_name: Legacy marker filename (see top_folder_is_marked)
+            settings_path: settings.json to take skipped_dirs, scan_jobs, max_scan_depth,
+                library_roots and device_concurrency from
+            per_device: Folders walked and analyzed at the same time per device (default:
+                "device_concurrency" setting)
+            use_cache: Reuse per-file extraction results of unchanged files (core.scan_cache)
+            ui_path: ui.json re-keyed on renames (default: ui.json in meta_dir)
+            imgs_dir: Artwork folder re-keyed on renames (default: data/imgs/ in the program dir)
+            sizes_path: Install size per game, written by every scan (default: sizes.json in meta_dir)
+        """
+        if isinstance(base, str):
+            base = [base]
+        self.explicit_roots = [normalize_path(b) for b in base] if base else None
+        self.base = self.explicit_roots[0] if self.explicit_roots else normalize_path(os.path.dirname(os.getcwd()))
+        self.meta_dir = meta_dir if meta_dir else META_DEFAULT
+        self.program_dir = normalize_path(os.getcwd())
+        self.jobs = jobs
+        self.max_depth = max_depth
+        self.per_device = per_device
+        self.marker_name = marker_name
+        self.settings_path = settings_path
+        self.ui_path = ui_path if ui_path else os.path.join(self.meta_dir, "ui.json")
+        self.imgs_dir = imgs_dir if imgs_dir else os.path.join(self.program_dir, "data", "imgs")
+        self.sizes_path = sizes_path if sizes_path else os.path.join(self.meta_dir, SIZES_NAME)
+
+        self.cfg = load_config(config) if config else {}
+        (self.content_maps, self.filename_maps, self.extension_maps,
+         self.searchable_exts, self.matchers) = compile_mappings(self.cfg)
+        read_limits = dict(self.cfg.get("read_limits") or {})
+        if max_file_bytes is not None:
+            read_limits["max_bytes"] = max_file_bytes
+        self.limits = resolve_read_limits(read_limits)
+        self.targets = compile_probe_targets(self.cfg)
+        self.use_cache = use_cache
+        self.cache_key = cache_config_key(self.limits)
+        self.digests = [m["_digest"] for m in self.content_maps + self.filename_maps] + [PE_VERSION_KEY]
+
+        self._settings_stamp: Optional[Tuple[int, int]] = None
+        self.settings: Dict[str, Any] = {}
+        self.skip: SkipRules = SkipRules(())
+
+    def reload_settings(self, force: bool = False) -> Dict[str, Any]:
+        """Re-read settings and rebuild the skip rules if the settings file changed."""
+        try:
+            st = os.stat(self.settings_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = (0, 0)
+        if force or stamp != self._settings_stamp:
+            self._settings_stamp = stamp
+            self.settings = load_config(self.settings_path)
+            self.skip = build_skip_rules(self.meta_dir, self.program_dir, self.cfg, self.settings)
+        return self.settings
+
+    def library_roots(self) -> List[str]:
+        """Roots to scan, in priority order (a folder name found in several roots is taken from the first)."""
+        if self.explicit_roots:
+            return list(self.explicit_roots)
+        return resolve_library_roots(self.base, self.reload_settings())
+
+    def top_key_for(self, path: str) -> Optional[str]:
+        """Folder name if path is a top folder directly below one of the library roots."""
+        path = normalize_path(path)
+        parent = os.path.normcase(os.path.dirname(path))
+        for root in self.library_roots():
+            if os.path.normcase(root) == parent:
+                return os.path.basename(path)
+        return None
+
+    def top_path_for(self, key: str) -> Optional[str]:
+        """Folder a scan of top folder key analyzes: key below the first library root that has it."""
+        for root in self.library_roots():
+            path = os.path.join(root, key)
+            if os.path.isdir(path):
+                return path
+        return None
+
+    def _task(self, roots: List[Tuple[str, List[str]]], profile: bool = False,
+              file_stats: Optional[Dict[str, Tuple[int, int]]] = None,
+              cache: Optional[Dict[str, Dict[str, Any]]] = None,
+              exes: Optional[List[str]] = None):
+        # .exe files are stat-ed by the walk too (see _walk_top); they become exesrc candidates
+        # (exes: only rank these)
+        file_stats = file_stats or {}
+        if exes is None:
+            exes = [p for p in file_stats if os.path.splitext(p)[1].lower() in EXE_EXTS]
+        executables = [(p, file_stats[p][0]) for p in exes if p in file_stats]
+        return ((roots, self.content_maps, self.filename_maps, self.extension_maps,
+                 self.searchable_exts, self.matchers, self.limits, self.targets),
+                {"profile": profile, "file_stats": file_stats, "cache": cache, "executables": executables})
+
+    def analyze(self, roots: List[Tuple[str, List[str]]], profile: bool = False,
+                file_stats: Optional[Dict[str, Tuple[int, int]]] = None,
+                cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Analyze one folder's (root, files) pairs; returns (meta, report) like analyze_group."""
+        return _analyze_task(self._task(roots, profile, file_stats, cache))
+
+    def _walk_top(self, library_root: str, top: TopFolder, skip: SkipRules, max_depth: Optional[int],
+                  clean_markers: bool, cancel, force: bool) -> Optional[Dict[str, Any]]:
+        """Walk, measure and fingerprint one top folder (runs in a device thread)."""
+        if _is_cancelled(cancel):
+            return None
+        start = time.perf_counter()
+        # the folder's own directory size cache (force recounts everything)
+        sizes = {} if force else load_dir_sizes(self.meta_dir, top.path)
+        roots, stats = walk_group(top.path, skip, max_depth, self.searchable_exts + EXE_EXTS, top.mtime_ns,
+                                  sizes)
+        save_dir_sizes(self.meta_dir, top.path, stats["dir_sizes"])
+        walk_s = time.perf_counter() - start
+        removed = remove_group_markers(roots, self.marker_name, stats) if clean_markers else 0
+        start = time.perf_counter()
+        fingerprint = fingerprint_group(top.path, roots, self.searchable_exts, stats)
+        fingerprint["root"] = library_root
+        return {"key": top.name, "root": library_root, "path": top.path, "roots": roots, "fingerprint": fingerprint,
+                "file_stats": stats["files"], "bytes": stats["bytes"],
+                "walk_s": walk_s, "fingerprint_s": time.perf_counter() - start,
+                "markers_removed": removed}
 
-    #debug_test
-    #to_process = ["Slay The Princess"]
+    def iter_scan(self, folders: Optional[Iterable[str]] = None, force: bool = False,
+                  cancel=None, profile: Optional[ScanProfile] = None,
+                  clean_markers: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Scan the library and yield events while doing so; metadata is saved before the last event.
 
-    if folder:
-        to_process = [folder]
+        Args:
+            folders: Analyze only these top folders (regardless of the scan index)
+            force: Re-analyze every folder (without reading the extraction cache; it is refreshed)
+            cancel: Cancellation token, anything with is_set() (e.g. threading.Event); checked
+                between folders. Finished folders are still saved.
+            profile: Collects walk/analysis timings and per-mapping statistics if given
+            clean_markers: Delete legacy marker files while walking (Rescan = force + clean_markers,
+                one pruned traversal instead of remover + scanner)
 
-    for tk in to_process:
-        roots = groups.get(tk, [])
-        meta = analyze_group(roots, content_maps, filename_maps, extension_maps, searchable_exts)
-        meta["date"] = int(time.time())
-        # ensure an entry exists so it is tracked; append to both metadata files
-        existing_meta1[tk] = meta
-        existing_meta2[tk] = meta.copy() if isinstance(meta, dict) else meta
-        # mark folder as processed
-        mark_top_folder(base, tk, args.marker_name, args.marker_code)
+        A folder new to the index whose signature matches an indexed folder that no longer exists
+        (see core.scan_moves) takes over that folder's records in metadata.json, metadata_fix.json,
+        ui.json (exesrc included) and its artwork; it is only re-analyzed if its content changed.
+        A complete scan (no folders, not cancelled) prunes the records of vanished folders, i.e.
+        indexed folders missing from their scanned root (records without an index entry are kept).
 
-    # save both files separately (they may be identical)
-    save_metadata_outputs(meta_dir, existing_meta1, existing_meta2)
+        The walk also counts every folder's install size (core.scan_sizes), reusing the byte
+        counts of directories whose mtime did not change (force recounts everything).
+
+        Every analyzed folder is checkpointed to the scan journal right away (core.scan_journal).
+        A scan that was killed is resumed by the next one: its folders are replayed and, being
+        unchanged, not analyzed again (a forced scan is resumed by the next forced scan).
+
+        Yields dicts with an "event" key:
+            "start":    total (top folders found), base, roots
+            "progress": done, total, bytes_read, folder (current or last finished folder)
+            "result":   folder, meta, report (one per analyzed folder, in completion order)
+            "done":     processed (analyzed folders in merge order), total_entries, truncated,
+                        cancelled, meta_dir, markers_removed, duplicates (top folders skipped
+                        because an earlier root has a folder of the same name), renamed
+                        ({old: new} top keys), pruned (top keys of vanished folders),
+                        build_mismatches (top key -> exe, version, build of analyzed folders
+                        whose executable version does not mention the "build" found in files)
+        """
+        folders = list(dict.fromkeys(folders)) if folders else None
+        meta_dir, program_dir = self.meta_dir, self.program_dir
+        existing_meta1, existing_meta2 = load_existing_metadatas(meta_dir)
+        # games already in metadata.json never get their exesrc prefilled
+        known_games = set(existing_meta1)
+        known_ui = load_ui(self.ui_path)
+        index = load_scan_index(meta_dir)
+        # folders finished by an interrupted scan count as analyzed
+        journal_scans, journal_records = read_journal(meta_dir)
+        resumed_forced: Dict[str, str] = {}
+        # best executables per analyzed folder, for the exesrc prefill
+        executables: Dict[str, List[str]] = {}
+        for rec in journal_records:
+            tk = rec["folder"]
+            if rec.get("executables"):
+                executables[tk] = rec["executables"]
+            existing_meta1[tk] = rec["meta"]
+            existing_meta2[tk] = dict(rec["meta"])
+            if rec.get("index"):
+                index[tk] = rec["index"]
+                if rec["scan"] >= 0 and journal_scans[rec["scan"]].get("force"):
+                    resumed_forced[tk] = rec["index"]["fingerprint"]
+        journal = ScanJournal(meta_dir, force, folders)
+        cache = load_extract_cache(meta_dir, self.cache_key) if self.use_cache else None
+        # top folders walked by this scan; a complete scan drops the size caches of the others
+        walked_tops: List[str] = []
+        game_sizes = load_game_sizes(self.sizes_path)
+
+        settings = self.reload_settings()
+        skip = self.skip
+        max_depth = resolve_max_depth(self.max_depth, settings)
+        per_device = resolve_per_device(self.per_device, settings)
+        library_roots = self.library_roots()
+
+        # top folders of all roots; the first root wins on name clashes
+        order: Dict[str, int] = {}
+        duplicates: List[str] = []
+        listed: Set[Tuple[str, str]] = set()
+        by_device: DefaultDict[int, List[Tuple[str, TopFolder]]] = defaultdict(list)
+        for library_root in library_roots:
+            device = device_of(library_root)
+            for top in list_top_folders(library_root, skip, folders):
+                # skip metadata output itself
+                if top.name == os.path.basename(meta_dir) or top.name == os.path.basename(program_dir):
+                    continue
+                listed.add((library_root, top.name))
+                if top.name in order:
+                    duplicates.append(top.path)
+                    continue
+                order[top.name] = len(order)
+                by_device[device].append((library_root, top))
+        total = len(order) if not folders else len(folders)
+        # extraction cache entries per top folder: a walk drops those of files its folder no longer
+        # has, a complete scan those of folders it did not walk
+        cached_files: DefaultDict[Optional[str], List[str]] = defaultdict(list)
+        for path in cache or ():
+            cached_files[top_folder_of(path, library_roots)].append(path)
+        moves = MoveTracker(index, list(existing_meta1) + list(index), library_roots, listed)
+        yield {"event": "start", "total": total, "base": self.base, "roots": library_roots}
+
+        # no worker pool for a handful of folders, nor more workers than the devices may read with
+        jobs = min(resolve_jobs(self.jobs, settings), max(len(order), 1), per_device * max(len(by_device), 1))
+
+        to_process: List[str] = []
+        fingerprints: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        progress = {"done": 0, "bytes_read": 0, "markers_removed": 0}
+
+        def progress_event(tk: str) -> Dict[str, Any]:
+            return {"event": "progress", "done": progress["done"], "total": total,
+                    "bytes_read": progress["bytes_read"], "folder": tk}
+
+        def finish(tk: str, result: Tuple[Dict[str, Any], Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            results[tk] = result
+            result[0]["date"] = int(time.time())
+            if tk in fingerprints:
+                # the index follows the executable the version was read from this time
+                fingerprints[tk].pop("exe", None)
+                fingerprints[tk].pop("exe_stat", None)
+                fingerprints[tk].update(result[1].get("exe_fingerprint") or {})
+            journal.record(tk, result[0], fingerprints.get(tk), result[1].get("executables"))
+            if result[1].get("executables"):
+                executables[tk] = result[1]["executables"]
+            folder_cache = result[1].pop("cache", None)
+            if cache is not None and folder_cache:
+                cache.update(folder_cache)
+            if profile is not None:
+                profile.add_analysis(tk, result[1])
+            progress["done"] += 1
+            progress["bytes_read"] += result[1].get("bytes_read", 0)
+            yield {"event": "result", "folder": tk, "meta": result[0], "report": result[1]}
+            yield progress_event(tk)
+
+        # index checks of a walked folder; queues its analysis unless it is unchanged
+        def walked_folder(walked: Dict[str, Any], device: int) -> Iterator[Dict[str, Any]]:
+            top_key, roots, file_stats = walked["key"], walked["roots"], walked["file_stats"]
+            walked_tops.append(walked["path"])
+            if cache is not None:
+                for path in cached_files.pop(walked["path"], ()):
+                    if path not in file_stats:
+                        del cache[path]
+            game_sizes[top_key] = walked["bytes"]
+            progress["markers_removed"] += walked["markers_removed"]
+            fingerprints[top_key] = walked["fingerprint"]
+            # a renamed/moved folder takes over the index entry of its old name
+            moved = moves.match(top_key, walked["path"], fingerprints[top_key])
+            old_exe = (index.get(top_key) or {}).get("exe")
+            if old_exe:
+                # a patched executable changes the folder too (its version may be stale)
+                fingerprints[top_key].update(exe_fingerprint(walked["path"], old_exe, file_stats))
+            if profile is not None:
+                profile.add_walk(top_key, walked["walk_s"], walked["fingerprint_s"],
+                                 sum(len(files) for _, files in roots), len(roots))
+            if not force and not folders:
+                unchanged = is_unchanged(index, top_key, fingerprints[top_key])
+                # folders marked by older versions are adopted into the index as they are
+                if not unchanged and top_key not in index and top_folder_is_marked(walked["root"], top_key, self.marker_name):
+                    index[top_key] = fingerprints[top_key]
+                    unchanged = True
+                if unchanged:
+                    # entries written before library roots existed learn their root here
+                    if moved is not None or "root" not in index[top_key]:
+                        index[top_key] = fingerprints[top_key]
+                    # skip folders whose fingerprint did not change since they were last analyzed
+                    progress["done"] += 1
+                    yield progress_event(top_key)
+                    return
+            if force and resumed_forced.get(top_key) == fingerprints[top_key]["fingerprint"]:
+                # already re-analyzed by the interrupted forced scan
+                progress["done"] += 1
+                yield progress_event(top_key)
+                return
+            to_process.append(top_key)
+            yield progress_event(top_key)
+            folder_cache = None
+            if cache is not None:
+                # only this folder's entries travel to the worker; force starts from scratch
+                folder_cache = {} if force else {p: cache[p] for p in file_stats if p in cache}
+            exes = None
+            if top_key in known_games or top_key in known_ui or moved is not None:
+                # no exesrc prefill for known games: only the executable the version is read from
+                # (the user's exesrc, else the one indexed last time) is looked at
+                for exe in ((known_ui.get(top_key) or {}).get("exesrc"), (index.get(top_key) or {}).get("exe")):
+                    if isinstance(exe, str) and exe:
+                        exe = os.path.normpath(os.path.join(walked["path"], exe))
+                        if exe in file_stats:
+                            exes = [exe]
+                            break
+            ready[device].append((top_key, self._task(roots, profile is not None, file_stats, folder_cache, exes)))
+
+        # one thread pool per device. Its walks and analyses both count against per_device: at most
+        # per_device folders are analyzed at a time on each device (on the device's threads, or in
+        # the worker processes with jobs > 1), and at most per_device + 1 are walked ahead of them.
+        walkers = {device: ThreadPoolExecutor(max_workers=per_device, thread_name_prefix=f"scan-dev{device}")
+                   for device in by_device}
+        pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        pending = {device: iter(tops) for device, tops in by_device.items()}
+        in_flight = {device: 0 for device in by_device}
+        ready: Dict[int, Deque[Tuple[str, Any]]] = {device: deque() for device in by_device}
+        analyzing = {device: 0 for device in by_device}
+        walks: Dict[Future, int] = {}
+        analyses: Dict[Future, Tuple[str, int]] = {}
+
+        def feed(device: int):
+            while analyzing[device] < per_device and ready[device]:
+                top_key, task = ready[device].popleft()
+                executor = pool if pool is not None else walkers[device]
+                analyses[executor.submit(_analyze_task, task)] = (top_key, device)
+                analyzing[device] += 1
+            while in_flight[device] + len(ready[device]) < per_device + 1 and not _is_cancelled(cancel):
+                item = next(pending[device], None)
+                if item is None:
+                    return
+                walks[walkers[device].submit(self._walk_top, item[0], item[1], skip, max_depth,
+                                             clean_markers, cancel, force)] = device
+                in_flight[device] += 1
+
+        try:
+            for device in by_device:
+                feed(device)
+            while walks or analyses:
+                if _is_cancelled(cancel):
+                    break
+                done, _ = wait(list(walks) + list(analyses), timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    if fut in analyses:
+                        top_key, device = analyses.pop(fut)
+                        analyzing[device] -= 1
+                        yield from finish(top_key, fut.result())
+                    else:
+                        device = walks.pop(fut)
+                        in_flight[device] -= 1
+                        walked = fut.result()
+                        if walked is not None:
+                            yield from walked_folder(walked, device)
+                    feed(device)
+
+            for missing in folders or ():
+                if missing in to_process or _is_cancelled(cancel):
+                    continue
+                # not a walkable top folder: still record an (empty) entry like before
+                to_process.append(missing)
+                yield from finish(missing, self.analyze([], profile is not None))
+        finally:
+            journal.close()
+            for fut in list(walks) + list(analyses):
+                fut.cancel()
+            for walker in walkers.values():
+                walker.shutdown(wait=True, cancel_futures=True)
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        # carry records of renamed/moved folders over, then drop those of vanished folders
+        renamed: Dict[str, str] = {}
+        new_executables = {tk: paths for tk, paths in executables.items() if tk not in known_games}
+        ui = load_ui(self.ui_path) if moves.moves or new_executables else None
+        ui_changed = False
+        for old_key, old_path, new_key, new_path in moves.moves:
+            rekey_records(existing_meta1, old_key, new_key)
+            rekey_records(existing_meta2, old_key, new_key)
+            ui_changed |= rekey_ui(ui, old_key, old_path, new_key, new_path)
+            move_artwork(self.imgs_dir, old_key, new_key)
+            if old_key != new_key:
+                renamed[old_key] = new_key
+                # the new name was measured by this walk already
+                game_sizes.pop(old_key, None)
+        pruned: List[str] = []
+        if not folders and not _is_cancelled(cancel):
+            pruned = list(moves.vanished())
+            if pruned and ui is None:
+                ui = load_ui(self.ui_path)
+            for key in pruned:
+                for records in (existing_meta1, existing_meta2, index, ui, game_sizes):
+                    if key in records:
+                        records.pop(key)
+                        ui_changed |= records is ui
+        # prefill exesrc of new games (in neither metadata.json nor ui.json) with the best
+        # executable found by the walk; entries the user left empty stay empty
+        for tk, paths in new_executables.items():
+            if tk not in ui:
+                # same form as the file dialog (utils.helpers.pick_path) stores
+                ui[tk] = {"exesrc": paths[0].replace("\\", "/")}
+                ui_changed = True
+        if ui_changed:
+            save_ui(self.ui_path, ui)
+
+        # merge in library order so the output does not depend on which folder finished first
+        processed = sorted((tk for tk in to_process if tk in results), key=lambda tk: order.get(tk, len(order)))
+        truncated: List[str] = []
+        build_mismatches: Dict[str, Dict[str, Any]] = {}
+        for tk in processed:
+            meta, report = results[tk]
+            truncated.extend(report.get("truncated", []))
+            exe_info = report.get("exe_version")
+            if exe_info and exe_info["build_matches"] is False:
+                build_mismatches[tk] = {"exe": exe_info["exe"], "version": exe_info["version"], "build": meta.get("build")}
+            # ensure an entry exists so it is tracked; append to both metadata files
+            existing_meta1[tk] = meta
+            existing_meta2[tk] = meta.copy() if isinstance(meta, dict) else meta
+            # remember the state the folder was analyzed in
+            if tk in fingerprints:
+                index[tk] = fingerprints[tk]
+
+        # save both files separately (they may be identical)
+        save_metadata_outputs(meta_dir, existing_meta1, existing_meta2)
+        save_scan_index(meta_dir, index)
+        save_game_sizes(self.sizes_path, game_sizes)
+        if not folders and not _is_cancelled(cancel):
+            prune_dir_sizes(meta_dir, walked_tops)
+        # everything the journal held is in the metadata files now
+        journal.discard()
+        if cache is not None:
+            if not folders and not _is_cancelled(cancel):
+                for paths in cached_files.values():
+                    for path in paths:
+                        del cache[path]
+            save_extract_cache(meta_dir, self.cache_key, cache, self.digests)
+        if profile is not None:
+            profile.finish()
+
+        yield {"event": "done", "processed": processed, "total_entries": len(existing_meta1),
+               "truncated": truncated, "cancelled": _is_cancelled(cancel), "meta_dir": meta_dir,
+               "markers_removed": progress["markers_removed"], "duplicates": duplicates,
+               "renamed": renamed, "pruned": pruned, "build_mismatches": build_mismatches}
+
+    def scan_folder(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Analyze one top folder and merge its record, walking only that folder.
+
+        Args:
+            name: Folder name below the base directory
+
+        Returns:
+            The record stored in metadata.json, or None if the scan produced none
+        """
+        record = None
+        for event in self.iter_scan(folders=[name]):
+            if event["event"] == "result" and event["folder"] == name:
+                record = event["meta"]
+        return record
+
+    def scan(self, folders: Optional[Iterable[str]] = None, force: bool = False,
+             cancel=None, profile: Optional[ScanProfile] = None,
+             clean_markers: bool = False) -> Dict[str, Any]:
+        """Run iter_scan to the end and return its "done" event."""
+        summary: Dict[str, Any] = {}
+        for event in self.iter_scan(folders=folders, force=force, cancel=cancel, profile=profile,
+                                    clean_markers=clean_markers):
+            if event["event"] == "done":
+                summary = event
+        return summary
+
+
+_scanner: Optional[Scanner] = None
+
+
+def get_scanner(sizes_path: Optional[str] = None) -> Scanner:
+    """
+    Get or create the shared Scanner with default paths (used by the GUI).
+
+    Args:
+        sizes_path: Where scans write the install sizes (window.pyw --sizesdata); kept for
+            later calls without it
+    """
+    global _scanner
+    if _scanner is None:
+        _scanner = Scanner(sizes_path=sizes_path)
+    elif sizes_path:
+        _scanner.sizes_path = sizes_path
+    return _scanner
+
+
+def iter_scan(folders: Optional[Iterable[str]] = None, force: bool = False, cancel=None,
+              **options) -> Iterator[Dict[str, Any]]:
+    """
+    One-off scan: Scanner(**options).iter_scan(folders, force, cancel).
+    Options are the Scanner arguments (config, base, meta_dir, jobs, ...).
+    """
+    return Scanner(**options).iter_scan(folders=folders, force=force, cancel=cancel)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point.
+
+    Args:
+        argv: Arguments to parse (default: sys.argv[1:])
+
+    Returns:
+        Names of the analyzed folders
+    """
+    parser = argparse.ArgumentParser(description="Scan folders, extract folder-level metadata and write two JSONs.")
+    parser.add_argument("-d", "--dir", action="append",
+                        help="Library root to scan; repeat for several roots (default: parent dir plus the 'library_roots' setting)")
+    parser.add_argument("-c", "--config", help="Optional JSON config to override mappings")
+    parser.add_argument("-o", "--out", help="Output folder for metadata (default: _metadata/)")
+    parser.add_argument("--force", action="store_true", help="Rescan all folders (ignore the scan index)")
+    parser.add_argument("--marker-name", default=".processed_marker.txt",
+                        help="Legacy marker filename; marked folders without an index entry are adopted without rescanning")
+    parser.add_argument("--rescan", action="store_true",
+                        help="Re-analyze all folders and delete legacy markers in the same walk (--force + marker cleanup)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes for analysis (default: 'scan_jobs' setting, 0 = one per CPU)")
+    parser.add_argument("--max-file-bytes", type=int, default=None,
+                        help="Per-file read budget; larger files are only searched in head/tail windows")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Deepest directory level scanned inside each game (default: 'max_scan_depth' setting, 0 = unlimited)")
+    parser.add_argument("--per-device", type=int, default=None,
+                        help="Top folders walked and analyzed at the same time per disk (default: 'device_concurrency' setting)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Open every searchable file instead of reusing results of unchanged files")
+    parser.add_argument("--ndjson", metavar="PATH",
+                        help="Also stream one JSON record per analyzed game to PATH as soon as it is ready "
+                             "('-' = stdout; the summary then goes to stderr)")
+    parser.add_argument("--profile", metavar="OUT_JSON",
+                        help="Write a scan profile (per-game timings, per-mapping attempts/hits/time) to this file")
+    parser.add_argument("folders", nargs="*", help="Analyze only these top folders (default: all changed)")
+    args = parser.parse_args(argv)
+
+    scanner = Scanner(config=args.config, base=args.dir, meta_dir=args.out, jobs=args.jobs,
+                      max_depth=args.max_depth, max_file_bytes=args.max_file_bytes,
+                      marker_name=args.marker_name, per_device=args.per_device,
+                      use_cache=not args.no_cache)
+    profile = ScanProfile(scanner.base) if args.profile else None
+    stream = NdjsonWriter(args.ndjson) if args.ndjson else None
+    # keep stdout clean for the records when streaming there
+    log = sys.stderr if stream is not None and stream.to_stdout else sys.stdout
+    summary: Dict[str, Any] = {}
+    try:
+        for event in scanner.iter_scan(folders=args.folders, force=args.force or args.rescan, profile=profile,
+                                       clean_markers=args.rescan):
+            if event["event"] == "result" and stream is not None:
+                stream.write({"game": event["folder"], "data": event["meta"]})
+            elif event["event"] == "done":
+                summary = event
+    finally:
+        if stream is not None:
+            stream.close()
+    if profile is not None:
+        profile.save(args.profile)
+        print(f"Scan profile written to {args.profile}", file=log)
 
-    print(f"Processed {len(to_process)} new folders. Total entries now: {len(existing_meta1)}")
-    print(f"Metadata written to {meta_dir}/metadata.json and {meta_dir}/metadata_fix.json")
-    return to_process
+    meta_dir = summary["meta_dir"]
+    print(f"Processed {len(summary['processed'])} new folders. Total entries now: {summary['total_entries']}", file=log)
+    print(f"Metadata written to {meta_dir}/metadata.json and {meta_dir}/metadata_fix.json", file=log)
+    if summary["markers_removed"]:
+        print(f"Removed {summary['markers_removed']} legacy marker file(s).", file=log)
+    for old_key, new_key in summary["renamed"].items():
+        print(f"Renamed: {old_key} -> {new_key}", file=log)
+    if summary["pruned"]:
+        print(f"Removed {len(summary['pruned'])} vanished folder(s): {', '.join(summary['pruned'])}", file=log)
+    if summary["duplicates"]:
+        print(f"{len(summary['duplicates'])} folder(s) skipped because an earlier library root has a folder of the same name:", file=log)
+        for path in summary["duplicates"]:
+            print("  " + path, file=log)
+    if summary["build_mismatches"]:
+        print(f"{len(summary['build_mismatches'])} game(s) whose executable version does not mention the build found in their files:", file=log)
+        for tk, info in summary["build_mismatches"].items():
+            print(f"  {tk}: build {info['build']}, {os.path.basename(info['exe'])} version {info['version']}", file=log)
+    if summary["truncated"]:
+        print(f"{len(summary['truncated'])} file(s) exceeded the read budget and were only searched partially:", file=log)
+        for path in summary["truncated"]:
+            print("  " + path, file=log)
+    return summary["processed"]
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import multiprocessing
+    multiprocessing.freeze_support()
+    main()
@@ -6,12 +6,26 @@ QCoreApplication.translate("Settings", "Scan Frequency")
 QCoreApplication.translate("Settings", "Newer Design")
 QCoreApplication.translate("Settings", "Design")
 QCoreApplication.translate("Settings", "Directories to Skip")
+QCoreApplication.translate("Settings", "Scan Jobs")
+QCoreApplication.translate("Settings", "Additional Library Folders")
+QCoreApplication.translate("Settings", "Parallel Scans per Disk")
+QCoreApplication.translate("Settings", "SteamCMD Path")
+QCoreApplication.translate("Settings", "Parallel SteamCMD Queries")
+QCoreApplication.translate("Settings", "Reuse Build Info For")
 QCoreApplication.translate("Settings", "Language")
 # Scan Frequency Options
 QCoreApplication.translate("Settings", "daily")
 QCoreApplication.translate("Settings", "weekly")
 QCoreApplication.translate("Settings", "biweekly")
 QCoreApplication.translate("Settings", "monthly")
+# Scan Jobs Options
+QCoreApplication.translate("Settings", "All Cores")
+# Reuse Build Info For Options
+QCoreApplication.translate("Settings", "Always refetch")
+QCoreApplication.translate("Settings", "1 hour")
+QCoreApplication.translate("Settings", "6 hours")
+QCoreApplication.translate("Settings", "1 day")
+QCoreApplication.translate("Settings", "1 week")
 # Buttons and Name
 QCoreApplication.translate("Settings", "Settings")
 QCoreApplication.translate("Settings", "Exit")
@@ -25,6 +39,7 @@ QCoreApplication.translate("Headings", "Last Build")
 QCoreApplication.translate("Headings", "Last Date")
 QCoreApplication.translate("Headings", "Newest Build")
 QCoreApplication.translate("Headings", "Newest Date")
+QCoreApplication.translate("Headings", "Size")
 # Data (EXE) View
 QCoreApplication.translate("Headings", "exesrc")
 QCoreApplication.translate("Headings", "png")
@@ -38,6 +53,8 @@ QCoreApplication.translate("Buttons", "Change/Add")
 # Data 1
 QCoreApplication.translate("Buttons", "Scan")
 QCoreApplication.translate("Buttons", "Rescan")
+QCoreApplication.translate("Buttons", "Cancel")
+QCoreApplication.translate("Buttons", "Refresh Selected")
 # Library
 # QCoreApplication.translate("Buttons", "Settings") Use Settings / Settings for Button
 QCoreApplication.translate("Buttons", "Play")
@@ -63,6 +80,11 @@ QCoreApplication.translate("msg", "Save changes?")
 QCoreApplication.translate("msg", "Confirm Action")
 QCoreApplication.translate("msg", "Yes")
 QCoreApplication.translate("msg", "No")
+QCoreApplication.translate("msg", "Scan failed")
+QCoreApplication.translate("msg", "Update failed")
+QCoreApplication.translate("msg", "Add failed")
+QCoreApplication.translate("msg", "A game folder of the same name is already in an earlier library folder: {path}")
+QCoreApplication.translate("msg", "Select the games to refresh from SteamCMD:")
 QCoreApplication.translate("msg", "These changes will require a reset to function.") ### POSSIBLY FUTURE USE FOR LANG CHANGES WITHOUT RESTART
 # 1. Pop-up and auto restart 2. Pop-up and manual restart 3. No restart in the future 4. Leave it as is
 # تتطلب هذه التغييرات إعادة تعيين لتعمل
@@ -71,6 +93,11 @@ QCoreApplication.translate("msg", "These changes will require a reset to functio
 # Ces modifications nécessiteront une réinitialisation
 # Эти изменения потребуют сброса
 # 这些更改需要重置才能生效
+## ScanProgress
+QCoreApplication.translate("ScanProgress", "Scanning...")
+QCoreApplication.translate("ScanProgress", "Cancelling...")
+QCoreApplication.translate("ScanProgress", "{done}/{total} folders, {read} read")
 ## PathDialog
 QCoreApplication.translate("PathDialog", "Select EXE")
-QCoreApplication.translate("PathDialog", "Select Game Directory")
\ No newline at end of file
+QCoreApplication.translate("PathDialog", "Select Game Directory")
+QCoreApplication.translate("PathDialog", "Select Library Folder")
\ No newline at end of file
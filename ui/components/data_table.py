@@ -31,98 +31,158 @@ def build_data_table(
 
     n = 1
     for i in files[0]:
-        label = QLabel(i)
-        layout.addWidget(label, n, 0)
+        build_data_row(keys, layout, files, mode, window, i, n)
+        n += 1
 
-        if mode == "edit":
-            _keys = [keys[0]]
-        elif mode == "show":
-            _keys = keys
+
+def clear_data_rows(layout: QGridLayout):
+    """Remove every row below the headings (row 0), e.g. to build the table in another order."""
+    for n in range(1, layout.rowCount()):
+        for col in range(layout.columnCount()):
+            item = layout.itemAtPosition(n, col)
+            if item is not None and item.widget() is not None:
+                widget = item.widget()
+                layout.removeWidget(widget)
+                widget.deleteLater()
+
+
+def replace_data_row(
+    keys: Tuple[List[str], List[str]],
+    layout: QGridLayout,
+    files: Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Dict[str, Any]]]],
+    mode: str,
+    window: Optional[QWidget],
+    i: str,
+) -> int:
+    """
+    Rebuild the row of one game after files changed, appending it if the game is new.
+    Rows follow the order of files[0], like in build_data_table.
+
+    Returns:
+        Grid row of the game
+    """
+    n = list(files[0]).index(i) + 1
+    for col in range(layout.columnCount()):
+        item = layout.itemAtPosition(n, col)
+        if item is not None and item.widget() is not None:
+            widget = item.widget()
+            layout.removeWidget(widget)
+            widget.deleteLater()
+    build_data_row(keys, layout, files, mode, window, i, n)
+    return n
+
+
+def build_data_row(
+    keys: Tuple[List[str], List[str]],
+    layout: QGridLayout,
+    files: Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Dict[str, Any]]]],
+    mode: str,
+    window: Optional[QWidget],
+    i: str,
+    n: int,
+):
+    """
+    Build the widgets of one game (i) in grid row n.
+
+    Args:
+        keys: Tuple of key lists for columns
+        layout: Grid layout to populate
+        files: Tuple of data dictionaries
+        mode: "edit" or "show"
+        window: Parent window widget
+        i: Game name (key of files[0])
+        n: Grid row
+    """
+    label = QLabel(i)
+    layout.addWidget(label, n, 0)
+
+    if mode == "edit":
+        _keys = [keys[0]]
+    elif mode == "show":
+        _keys = keys
+    else:
+        _keys = []
+    
+    para = 0
+    for j in _keys:
+        if para == 0:
+            p = 1 
         else:
-            _keys = []
-        
-        para = 0
-        for j in _keys:
-            if para == 0:
-                p = 1 
-            else:
-                p = len(_keys[0]) + 1
+            p = len(_keys[0]) + 1
+            
+        for k in j:
+            if k == "date":
+                try:
+                    date_obj = datetime.fromtimestamp(files[para][i]["date"])  # pyright: ignore[reportOptionalSubscript]
+                except Exception:
+                    date_obj = None
+                label = QLabel(str(date_obj))
                 
-            for k in j:
-                if k == "date":
+            elif k == "exesrc":
+                if mode == "show":
                     try:
-                        date_obj = datetime.fromtimestamp(files[para][i]["date"])  # pyright: ignore[reportOptionalSubscript]
+                        label = QLabel(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
                     except Exception:
-                        date_obj = None
-                    label = QLabel(str(date_obj))
-                    
-                elif k == "exesrc":
-                    if mode == "show":
-                        try:
-                            label = QLabel(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
-                        except Exception:
-                            label = QLabel("")
-                    elif mode == "edit":
-                        try: 
-                            label = QPushButton(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
-                        except Exception:
-                            label = QPushButton(None)
-                        def path_func(w, f, l):
-                            path, do_it = pick_path(w, f)
-                            if do_it:
-                                l.setText(path)
-                        label.clicked.connect(lambda checked, folder=i, l=label, w=window: path_func(w, folder, l)) # type: ignore
-                            
-                elif k == "png":
-                    from ui.components.pixmaps import CHECK_PIX, X_PIX
-                    if mode == "show":
-                        label = QLabel()
-                        pix = CHECK_PIX if os.path.exists(f"data/imgs/{i}.png") else X_PIX
-                        label.setPixmap(pix)
-                        
-                    if mode == "edit":
-                        label = QWidget()
-                        label_layout = QHBoxLayout()
-                        label_layout.setContentsMargins(0, 0, 0, 0)
-                        pix = CHECK_PIX if os.path.exists(f"data/imgs/{i}.png") else X_PIX
-                        image = QLabel()
-                        image.setPixmap(pix)
-                        button = QPushButton(QCoreApplication.translate("Buttons", "Change/Add"))
-                        try:
-                            button.clicked.connect(lambda checked, game=i, w=window: w.pick_img_view(game))  # pyright: ignore[reportAttributeAccessIssue, reportOptionalMemberAccess]
-                        except Exception:
-                            pass
-                        label_layout.addWidget(image)
-                        label_layout.addWidget(button)                  
-                        label.setLayout(label_layout)
-                        
-                else:
-                    if mode == "show":
-                        try:
-                            label = QLabel(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
-                        except Exception:
-                            label = QLabel("")
-                    elif mode == "edit":
-                        try:
-                            label = QLineEdit(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
-                        except Exception:
-                            label = QLineEdit("")
-                        label.setMaximumWidth(200)
+                        label = QLabel("")
+                elif mode == "edit":
+                    try: 
+                        label = QPushButton(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
+                    except Exception:
+                        label = QPushButton(None)
+                    def path_func(w, f, l):
+                        path, do_it = pick_path(w, f)
+                        if do_it:
+                            l.setText(path)
+                    label.clicked.connect(lambda checked, folder=i, l=label, w=window: path_func(w, folder, l)) # type: ignore
                         
-                label.setFixedHeight(40)
-                layout.addWidget(label, n, p)
-                p += 1
-                
-            para += 1
-            if len(files) == 2 and mode == "show":
+            elif k == "png":
                 from ui.components.pixmaps import CHECK_PIX, X_PIX
-                status = QLabel()
-                length = len(_keys[0]) + len(_keys[1]) + 1
-                try:
-                    pix = CHECK_PIX if files[0][i]["build"] == files[1][i]["build"] else X_PIX  # pyright: ignore[reportOptionalSubscript]
-                    status.setPixmap(pix)
-                except Exception:
-                    pass
-                layout.addWidget(status, n, length)
-
-        n += 1
\ No newline at end of file
+                if mode == "show":
+                    label = QLabel()
+                    pix = CHECK_PIX if os.path.exists(f"data/imgs/{i}.png") else X_PIX
+                    label.setPixmap(pix)
+                    
+                if mode == "edit":
+                    label = QWidget()
+                    label_layout = QHBoxLayout()
+                    label_layout.setContentsMargins(0, 0, 0, 0)
+                    pix = CHECK_PIX if os.path.exists(f"data/imgs/{i}.png") else X_PIX
+                    image = QLabel()
+                    image.setPixmap(pix)
+                    button = QPushButton(QCoreApplication.translate("Buttons", "Change/Add"))
+                    try:
+                        button.clicked.connect(lambda checked, game=i, w=window: w.pick_img_view(game))  # pyright: ignore[reportAttributeAccessIssue, reportOptionalMemberAccess]
+                    except Exception:
+                        pass
+                    label_layout.addWidget(image)
+                    label_layout.addWidget(button)                  
+                    label.setLayout(label_layout)
+                    
+            else:
+                if mode == "show":
+                    try:
+                        label = QLabel(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
+                    except Exception:
+                        label = QLabel("")
+                elif mode == "edit":
+                    try:
+                        label = QLineEdit(files[para][i][k])  # pyright: ignore[reportOptionalSubscript]
+                    except Exception:
+                        label = QLineEdit("")
+                    label.setMaximumWidth(200)
+                    
+            label.setFixedHeight(40)
+            layout.addWidget(label, n, p)
+            p += 1
+            
+        para += 1
+        if len(files) == 2 and mode == "show":
+            from ui.components.pixmaps import CHECK_PIX, X_PIX
+            status = QLabel()
+            length = len(_keys[0]) + len(_keys[1]) + 1
+            try:
+                pix = CHECK_PIX if files[0][i]["build"] == files[1][i]["build"] else X_PIX  # pyright: ignore[reportOptionalSubscript]
+                status.setPixmap(pix)
+            except Exception:
+                pass
+            layout.addWidget(status, n, length)
@@ -0,0 +1,138 @@
+"""
+Background scan worker and its progress widget.
+Runs Scanner.iter_scan off the GUI thread and reports progress through Qt signals.
+"""
+import threading
+from typing import Optional, Dict, Any
+
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QProgressBar
+from PyQt6.QtCore import QThread, pyqtSignal, QCoreApplication
+
+
+def format_bytes(n: int) -> str:
+    """Human readable byte count (e.g. 12.3 MB)."""
+    if n < 1024:
+        return f"{n} B"
+    size = n / 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class ScanWorker(QThread):
+    """
+    Thread consuming Scanner.iter_scan.
+
+    Signals:
+        progress(dict): "start" and "progress" events of iter_scan
+        result(dict): "result" events (one per analyzed folder)
+        finished_scan(dict): the final "done" event
+        failed(str): error message if the scan raised
+    """
+    progress = pyqtSignal(dict)
+    result = pyqtSignal(dict)
+    finished_scan = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, scan_kwargs: Optional[Dict[str, Any]] = None, scanner=None, parent=None):
+        """
+        Initialize the worker.
+
+        Args:
+            scan_kwargs: Keyword arguments for Scanner.iter_scan (cancel is set by the worker)
+            scanner: Scanner to use (default: scanner.get_scanner())
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.scan_kwargs = dict(scan_kwargs or {})
+        self.scanner = scanner
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the scan to stop after the current folder; finished folders are kept."""
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            if self.scanner is None:
+                from scanner import get_scanner
+                self.scanner = get_scanner()
+            for event in self.scanner.iter_scan(cancel=self.cancel_event, **self.scan_kwargs):
+                kind = event["event"]
+                if kind == "result":
+                    self.result.emit(event)
+                elif kind == "done":
+                    self.finished_scan.emit(event)
+                else:
+                    self.progress.emit(event)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ScanProgress(QWidget):
+    """Progress bar, status text and Cancel button for a running ScanWorker."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        row = QHBoxLayout()
+        row.setContentsMargins(10, 0, 0, 0)
+        self.bar = QProgressBar()
+        self.bar.setFixedWidth(200)
+        self.label = QLabel()
+        self.btn_cancel = QPushButton(QCoreApplication.translate("Buttons", "Cancel"))
+        self.btn_cancel.setFixedWidth(100)
+        row.addWidget(self.bar)
+        row.addWidget(self.label)
+        row.addWidget(self.btn_cancel)
+        self.setLayout(row)
+        self.worker: Optional[ScanWorker] = None
+        self.buttons = ()
+        self.hide()
+
+    def attach(self, worker: ScanWorker, buttons=()):
+        """
+        Follow worker until it finishes; signals disconnect when this widget is deleted.
+
+        Args:
+            worker: Running or about to start ScanWorker
+            buttons: Buttons disabled until the worker finishes
+        """
+        self.worker = worker
+        self.buttons = tuple(buttons)
+        for btn in self.buttons:
+            btn.setEnabled(False)
+        worker.progress.connect(self.update_progress)
+        worker.finished.connect(self.on_finished)
+        self.btn_cancel.clicked.connect(self.cancel)
+        self.bar.setRange(0, 0)
+        self.label.setText(QCoreApplication.translate("ScanProgress", "Scanning..."))
+        self.btn_cancel.setEnabled(True)
+        self.show()
+        if worker.cancel_event.is_set():
+            self.cancel()
+
+    def on_finished(self):
+        for btn in self.buttons:
+            btn.setEnabled(True)
+        self.hide()
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+        self.btn_cancel.setEnabled(False)
+        self.label.setText(QCoreApplication.translate("ScanProgress", "Cancelling..."))
+
+    def update_progress(self, event: Dict[str, Any]):
+        total = event.get("total", 0)
+        done = event.get("done", 0)
+        self.bar.setRange(0, max(total, 1))
+        self.bar.setValue(done)
+        if not self.btn_cancel.isEnabled():
+            return
+        text = QCoreApplication.translate("ScanProgress", "{done}/{total} folders, {read} read").format(
+            done=done, total=total, read=format_bytes(event.get("bytes_read", 0)))
+        if event.get("folder"):
+            text += f" - {event['folder']}"
+        self.label.setText(text)
@@ -0,0 +1,54 @@
+"""
+Background build info update.
+Runs BuildFetcher.update off the GUI thread and reports every game through Qt signals as soon
+as SteamCMD printed it.
+"""
+from typing import Optional, List
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class UpdateWorker(QThread):
+    """
+    Thread running web.get_fetcher().update().
+
+    Signals:
+        game_updated(str, dict): game and its build info, as soon as it is known
+        finished_update(dict): build info per updated game, after recents.json was written
+        failed(str): error message if the update raised; also sent if only some games failed
+            (web.PartialFetchError), after the others were written to recents.json
+    """
+    game_updated = pyqtSignal(str, dict)
+    finished_update = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, games: Optional[List[str]] = None, force: bool = False, fetcher=None, parent=None):
+        """
+        Initialize the worker.
+
+        Args:
+            games: Only update these games (default: all)
+            force: Ask SteamCMD even for cached build info
+            fetcher: BuildFetcher to use (default: web.get_fetcher())
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.games = games
+        self.force = force
+        self.fetcher = fetcher
+        # cleared before the last signal, so tabs rebuilt by its handlers see the update as done
+        self.active = True
+
+    def run(self):
+        try:
+            if self.fetcher is None:
+                from web import get_fetcher
+                self.fetcher = get_fetcher()
+            results = self.fetcher.update(games=self.games, force=self.force,
+                                          on_game=lambda game, info: self.game_updated.emit(game, info))
+        except Exception as e:
+            self.active = False
+            self.failed.emit(str(e))
+            return
+        self.active = False
+        self.finished_update.emit(results)
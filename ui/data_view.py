@@ -2,13 +2,19 @@
 Data view for displaying game metadata and executable information.
 """
 from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QWidget, 
-                              QLabel, QScrollArea, QGridLayout, QSizePolicy)
+                              QLabel, QScrollArea, QGridLayout, QSizePolicy, QMessageBox,
+                              QDialog, QListWidget, QListWidgetItem)
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, QCoreApplication
 
 from utils.constants import DATA_KEYS, EXE_KEYS, DATA_HEADINGS, EXE_HEADINGS
 from utils.helpers import confirm
-from ui.components.data_table import build_data_table
+from ui.components.data_table import build_data_table, replace_data_row, clear_data_rows
+from ui.components.scan_worker import ScanWorker, ScanProgress, format_bytes
+from ui.components.update_worker import UpdateWorker
+
+# after the build status icon
+SIZE_COLUMN = len(DATA_KEYS[0]) + len(DATA_KEYS[1]) + 2
 
 
 def create_data_view(parent_window, load_data_func, save_data_func, get_struc_func,
@@ -38,7 +44,7 @@ def _create_metadata_view(parent_window, load_data_func, save_data_func,
                           get_struc_func):
     """Create the metadata data view."""
     items = load_data_func(["meta", "recent"])
-    ui = load_data_func(["ui"])
+    sizes = load_data_func(["sizes"])[0]
 
     ult = QVBoxLayout()
     ult.setContentsMargins(0, 0, 0, 0)
@@ -65,23 +71,40 @@ def _create_metadata_view(parent_window, load_data_func, save_data_func,
     button_row.addWidget(btn_update)
     
     def update_action():
-        import web
-        web.main()
-        parent_window.refresh(type=1)
+        _start_update(parent_window, (btn_update, btn_refresh_selected))
     
     btn_update.clicked.connect(update_action)
+
+    btn_refresh_selected = QPushButton(QCoreApplication.translate("Buttons", "Refresh Selected"))
+    btn_refresh_selected.setFixedWidth(130)
+    button_row.addWidget(btn_refresh_selected)
+
+    def refresh_selected_action():
+        # games without an appid have nothing to fetch
+        games = [game for game, info in items[0].items() if isinstance(info, dict) and info.get("appid")]
+        selected = _pick_games(parent_window, games)
+        if not selected:
+            return
+        # picked on purpose: ask SteamCMD even if the cached build info is fresh
+        _start_update(parent_window, (btn_update, btn_refresh_selected), games=selected, force=True)
+
+    btn_refresh_selected.clicked.connect(refresh_selected_action)
+
+    # an update started before the tab was rebuilt keeps filling in rows
+    update_worker = getattr(parent_window, "update_worker", None)
+    if update_worker is not None and update_worker.active:
+        btn_update.setEnabled(False)
+        btn_refresh_selected.setEnabled(False)
     
     btn_scan = QPushButton(QCoreApplication.translate("Buttons", "Scan"))
     btn_scan.setFixedWidth(100)
     button_row.addWidget(btn_scan)
     
+    progress = ScanProgress()
+
     def scan_action():
-        import scanner
-        new_ones = scanner.main()
-        parent_window.refresh(type=1)
-        if new_ones:
-            from core.data_manager import ui_updater
-            ui_updater(save_data_func, items[0], ui[0])
+        _start_scan(parent_window, load_data_func, save_data_func, progress,
+                    (btn_scan, btn_rescan))
     
     btn_scan.clicked.connect(scan_action)
     
@@ -90,11 +113,9 @@ def _create_metadata_view(parent_window, load_data_func, save_data_func,
     button_row.addWidget(btn_rescan)
     
     def rescan_action():
-        import remover
-        import scanner
-        remover.main()
-        scanner.main()
-        parent_window.refresh(type=1)
+        # one walk: re-analyze everything and delete legacy markers on the way
+        _start_scan(parent_window, load_data_func, save_data_func, progress,
+                    (btn_scan, btn_rescan), force=True, clean_markers=True)
     
     btn_rescan.clicked.connect(
         lambda: confirm(
@@ -105,9 +126,15 @@ def _create_metadata_view(parent_window, load_data_func, save_data_func,
         )
     )
     
+    button_row.addWidget(progress)
     button_row.setAlignment(Qt.AlignmentFlag.AlignLeft)
     ult.addLayout(button_row)
 
+    # a scan started before the tab was rebuilt keeps running
+    worker = getattr(parent_window, "scan_worker", None)
+    if worker is not None and worker.isRunning():
+        progress.attach(worker, (btn_scan, btn_rescan))
+
     # Grid layout
     layout = QGridLayout()
     layout.setSpacing(50)
@@ -118,14 +145,71 @@ def _create_metadata_view(parent_window, load_data_func, save_data_func,
     bold_font = QFont()
     bold_font.setBold(True)
     
-    for i, heading in enumerate(DATA_HEADINGS):
-        label = QLabel(QCoreApplication.translate("Headings", heading))
+    def add_size(game, n):
+        label = QLabel(format_bytes(sizes[game]) if game in sizes else "")
+        label.setFixedHeight(40)
+        layout.addWidget(label, n, SIZE_COLUMN)
+
+    def build_rows():
+        """Build the rows in the order chosen by the sortable headings (kept on refresh)."""
+        key, descending = getattr(parent_window, "data_sort", (None, False))
+        if key == "size":
+            order = sorted(items[0], key=lambda g: sizes.get(g, -1), reverse=descending)
+        elif key == "game":
+            order = sorted(items[0], key=str.casefold, reverse=descending)
+        else:
+            order = list(items[0])
+        meta = {game: items[0][game] for game in order}
+        items[0].clear()
+        items[0].update(meta)
+        build_data_table(DATA_KEYS, layout, items, "show", None)
+        for n, game in enumerate(items[0], start=1):
+            add_size(game, n)
+
+    def sort_by(key):
+        """Sort by the clicked heading; clicking it again reverses the order."""
+        current, descending = getattr(parent_window, "data_sort", (None, False))
+        # sizes start with the largest, names with A
+        parent_window.data_sort = (key, not descending if key == current else key == "size")
+        clear_data_rows(layout)
+        build_rows()
+
+    sortable = {0: "game", SIZE_COLUMN: "size"}
+    headings = list(DATA_HEADINGS) + [""] * (SIZE_COLUMN - len(DATA_HEADINGS)) + ["Size"]
+    for i, heading in enumerate(headings):
+        if not heading:
+            continue
+        if i in sortable:
+            label = QPushButton(QCoreApplication.translate("Headings", heading))
+            label.setFlat(True)
+            label.setStyleSheet("text-align: left;")
+            label.setCursor(Qt.CursorShape.PointingHandCursor)
+            label.clicked.connect(lambda checked, key=sortable[i]: sort_by(key))
+        else:
+            label = QLabel(QCoreApplication.translate("Headings", heading))
         label.setFont(bold_font)
         label.setFixedHeight(30)
         layout.addWidget(label, 0, i)
 
     # Build data table
-    build_data_table(DATA_KEYS, layout, items, "show", None)
+    build_rows()
+
+    def update_row(game):
+        """Reload one game's metadata and rebuild only its row."""
+        meta, recent = load_data_func(["meta", "recent"])
+        if game not in meta:
+            return
+        items[0][game] = meta[game]
+        if game in recent:
+            items[1][game] = recent[game]
+        add_size(game, replace_data_row(DATA_KEYS, layout, items, "show", None, game))
+
+    def show_build(game, info):
+        """Show build info that was just fetched (before recents.json is written)."""
+        if game not in items[0]:
+            return
+        items[1][game] = info
+        add_size(game, replace_data_row(DATA_KEYS, layout, items, "show", None, game))
     
     # Scroll area
     scroll = QScrollArea()
@@ -137,6 +221,8 @@ def _create_metadata_view(parent_window, load_data_func, save_data_func,
     page.setMaximumWidth(1500)
     page.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
     scroll.setWidget(page)
+    scroll.update_row = update_row
+    scroll.show_build = show_build
     
     return scroll
 
@@ -199,6 +285,14 @@ def _create_exe_view(parent_window, load_data_func, save_data_func,
 
     # Build data table
     build_data_table(EXE_KEYS, layout, (items[1],), "show", None)  # pyright: ignore[reportArgumentType]
+
+    def update_row(game):
+        """Reload one game's ui entry and rebuild only its row."""
+        ui = load_data_func(["ui"])[0]
+        if game not in ui:
+            return
+        items[1][game] = ui[game]
+        replace_data_row(EXE_KEYS, layout, (items[1],), "show", None, game)  # pyright: ignore[reportArgumentType]
     
     # Scroll area
     scroll = QScrollArea()
@@ -210,10 +304,113 @@ def _create_exe_view(parent_window, load_data_func, save_data_func,
     page.setMaximumWidth(1500)
     page.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
     scroll.setWidget(page)
+    scroll.update_row = update_row
     
     return scroll
 
 
+def _start_scan(parent_window, load_data_func, save_data_func, progress, buttons,
+                **scan_kwargs):
+    """
+    Run a scan in the background with live progress in the Data tab.
+
+    Args:
+        parent_window: Parent window instance (owns the worker so it outlives tab rebuilds)
+        load_data_func: Function to load data
+        save_data_func: Function to save data
+        progress: ScanProgress widget of the current tab
+        buttons: Buttons disabled while the scan runs
+        scan_kwargs: Keyword arguments for Scanner.iter_scan
+    """
+    worker = getattr(parent_window, "scan_worker", None)
+    if worker is not None and worker.isRunning():
+        return
+    worker = ScanWorker(scan_kwargs, parent=parent_window)
+
+    def on_done(event):
+        if event["processed"]:
+            from core.data_manager import ui_updater
+            meta, ui = load_data_func(["meta", "ui"])
+            ui_updater(save_data_func, meta, ui)
+        parent_window.refresh(type=1)
+
+    def on_failed(message):
+        QMessageBox.warning(parent_window, QCoreApplication.translate("msg", "Scan failed"), message)
+
+    worker.finished_scan.connect(on_done)
+    worker.failed.connect(on_failed)
+    parent_window.scan_worker = worker
+    progress.attach(worker, buttons)
+    worker.start()
+
+
+def _start_update(parent_window, buttons, **update_kwargs):
+    """
+    Fetch build info in the background; rows fill in as SteamCMD prints each app.
+
+    Args:
+        parent_window: Parent window instance (owns the worker so it outlives tab rebuilds)
+        buttons: Buttons disabled while the update runs
+        update_kwargs: Keyword arguments for UpdateWorker (games, force)
+    """
+    worker = getattr(parent_window, "update_worker", None)
+    if worker is not None and worker.active:
+        return
+    worker = UpdateWorker(parent=parent_window, **update_kwargs)
+
+    def on_failed(message):
+        QMessageBox.warning(parent_window, QCoreApplication.translate("msg", "Update failed"), message)
+        parent_window.refresh(type=1)
+
+    worker.game_updated.connect(parent_window.show_build)
+    worker.finished_update.connect(lambda results: parent_window.refresh(type=1))
+    worker.failed.connect(on_failed)
+    parent_window.update_worker = worker
+    for btn in buttons:
+        btn.setEnabled(False)
+    worker.start()
+
+
+def _pick_games(parent_window, games):
+    """
+    Let the user check games in a dialog.
+
+    Returns:
+        Checked games, None if cancelled
+    """
+    dialog = QDialog(parent_window)
+    dialog.setWindowTitle(QCoreApplication.translate("Buttons", "Refresh Selected"))
+    dlayout = QVBoxLayout()
+    dlayout.addWidget(QLabel(QCoreApplication.translate("msg", "Select the games to refresh from SteamCMD:")))
+
+    list_widget = QListWidget()
+    list_widget.setMinimumSize(350, 300)
+    for game in games:
+        item = QListWidgetItem(game)
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setCheckState(Qt.CheckState.Unchecked)
+        list_widget.addItem(item)
+    dlayout.addWidget(list_widget)
+
+    button_row = QHBoxLayout()
+    button_row.setAlignment(Qt.AlignmentFlag.AlignRight)
+    btn_cancel = QPushButton(QCoreApplication.translate("Buttons", "Cancel"))
+    btn_cancel.setFixedWidth(100)
+    btn_cancel.clicked.connect(dialog.reject)
+    button_row.addWidget(btn_cancel)
+    btn_ok = QPushButton(QCoreApplication.translate("Buttons", "Refresh"))
+    btn_ok.setFixedWidth(100)
+    btn_ok.clicked.connect(dialog.accept)
+    button_row.addWidget(btn_ok)
+    dlayout.addLayout(button_row)
+    dialog.setLayout(dlayout)
+
+    if dialog.exec() != QDialog.DialogCode.Accepted:
+        return None
+    return [list_widget.item(i).text() for i in range(list_widget.count())  # pyright: ignore[reportOptionalMemberAccess]
+            if list_widget.item(i).checkState() == Qt.CheckState.Checked]  # pyright: ignore[reportOptionalMemberAccess]
+
+
 def _make_editor(parent_window, editor_type, load_data_func, save_data_func,
                 get_struc_func):
     """Create and show an editor window."""
@@ -8,7 +8,7 @@ import threading
 
 from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton,
-    QWidget, QLabel, QScrollArea, QGridLayout, QSizePolicy, QLineEdit, QDialog
+    QWidget, QLabel, QScrollArea, QGridLayout, QSizePolicy, QLineEdit, QDialog, QMessageBox
 )
 from PyQt6.QtGui import QIcon, QFont
 from PyQt6.QtCore import Qt, QCoreApplication
@@ -16,7 +16,8 @@ import webbrowser
 
 from utils.constants import APPLICATION_NAME, DATA_KEYS, EXE_KEYS, DATA_HEADINGS, EXE_HEADINGS, APP_ICON_PATH
 from utils.helpers import confirm
-from ui.components.data_table import build_data_table
+from ui.components.data_table import build_data_table, replace_data_row
+from ui.components.scan_worker import ScanWorker
 
 
 class ClickableLabel(QLabel):
@@ -71,6 +72,8 @@ class Editor(QMainWindow):
         self.save_data_func = save_data_func
         self.get_struc_func = get_struc_func
         self.parent_window = parent
+        # set on close; scans started by Add finish after that without touching the widgets
+        self.closed = False
 
         self.editor = QWidget(self)
         self.setCentralWidget(self.editor)
@@ -143,16 +146,56 @@ class Editor(QMainWindow):
             # except ValueError:
             #     do_it = False
             if do_it:
-                import scanner
-                scanner.main(folder=entry)
-                from core.data_manager import ui_updater
-                meta = self.load_data_func(["meta", "ui"])
-                ui_updater(self.save_data_func, meta[0], meta[1])
-                self.parent_window.refresh(full=True)
-                self.close()
-                from ui.data_view import _make_editor
-                _make_editor(self.parent_window, self.type, self.load_data_func,
-                             self.save_data_func, self.get_struc_func)
+                worker = getattr(self.parent_window, "scan_worker", None)
+                if worker is not None and worker.isRunning():
+                    # a scan is writing the metadata right now
+                    return
+                from scanner import get_scanner
+                scanner = get_scanner()
+                path = os.path.normpath(os.path.join(os.path.dirname(os.getcwd()), entry))
+                # folders picked in another library root are keyed by their name as well
+                top_key = scanner.top_key_for(path)
+                if top_key is not None:
+                    scanned = scanner.top_path_for(top_key)
+                    if scanned is not None and os.path.normcase(os.path.normpath(scanned)) != os.path.normcase(path):
+                        # scanning the name would analyze (and overwrite) the other folder's game
+                        QMessageBox.warning(self, QCoreApplication.translate("msg", "Add failed"),
+                                            QCoreApplication.translate("msg", "A game folder of the same name is already in an earlier library folder: {path}").format(path=scanned))
+                        return
+                    entry = top_key
+                # walk and analysis run in the background like a Scan
+                worker = ScanWorker({"folders": [entry]}, parent=self.parent_window)
+                records = {}
+                worker.result.connect(lambda event: records.update({event["folder"]: event["meta"]}))
+                worker.finished_scan.connect(lambda event: added(entry, records.get(entry)))
+                worker.failed.connect(lambda message: add_failed(message))
+                self.parent_window.scan_worker = worker
+                btn_add.setEnabled(False)
+                worker.start()
+
+        def added(entry, record):
+            if record is not None:
+                ui_dict = self.load_data_func(["ui"])[0]
+                if entry not in ui_dict:
+                    self.save_data_func(ui_dict, {entry: {}}, "ui")
+                # only the added game's row changes, here and in the main window
+                self.parent_window.update_game(entry)
+            if self.closed:
+                return
+            btn_add.setEnabled(True)
+            if record is None:
+                return
+            if save_key == "meta":
+                items[0][entry] = record
+            elif entry not in items[0]:
+                items[0][entry] = {}
+            row_num = replace_data_row(keys, layout, items, "edit", self, entry)
+            make_selectable(row_num, entry)
+
+        def add_failed(message):
+            if not self.closed:
+                btn_add.setEnabled(True)
+            QMessageBox.warning(self.parent_window, QCoreApplication.translate("msg", "Scan failed"), message)
 
         btn_add.clicked.connect(add_entry)
 
@@ -220,9 +263,7 @@ class Editor(QMainWindow):
         # Build data table
         build_data_table(keys, layout, items, "edit", self)
         
-        # Make rows clickable for selection
-        row_num = 1
-        for game_name in items[0]:
+        def make_selectable(row_num, game_name):
             # Get the game name label at column 0
             name_widget = layout.itemAtPosition(row_num, 0)
             if name_widget:
@@ -241,6 +282,11 @@ class Editor(QMainWindow):
                     )
                     clickable_label.setFixedHeight(40)
                     layout.addWidget(clickable_label, row_num, 0)
+
+        # Make rows clickable for selection
+        row_num = 1
+        for game_name in items[0]:
+            make_selectable(row_num, game_name)
             row_num += 1
         
         # Scroll area
@@ -256,6 +302,11 @@ class Editor(QMainWindow):
         return scroll
     
 
+    def closeEvent(self, event):
+        """Handle window close event."""
+        self.closed = True
+        event.accept()
+
     def updater(self):
         """Update parent window when closing."""
         self.close()
@@ -64,10 +64,7 @@ def create_library_view(parent_window, load_data_func, save_data_func, theme_man
     layout.setContentsMargins(10, 10, 10, 30)
     ult.addLayout(layout)
     
-    row = 0
-    col = 0
-    
-    for game_name in games:
+    def add_card(game_name, index):
         image_path = f"data/imgs/{game_name}.png"
         exe_path = games[game_name].get("exesrc")
         
@@ -82,12 +79,21 @@ def create_library_view(parent_window, load_data_func, save_data_func, theme_man
             height=GAME_CARD_HEIGHT
         )
         
+        row, col = divmod(index, GAME_CARDS_PER_ROW)
         layout.addWidget(game_card, row, col)
-        col += 1
-        
-        if col == GAME_CARDS_PER_ROW:
-            col = 0
-            row += 1
+
+    for index, game_name in enumerate(games):
+        add_card(game_name, index)
+
+    def update_row(game_name):
+        """Add a card for a game that is new in ui.json; existing cards stay as they are."""
+        if game_name in games:
+            return
+        ui = load_data_func(["ui"])[0]
+        if game_name not in ui:
+            return
+        games[game_name] = ui[game_name]
+        add_card(game_name, len(games) - 1)
 
     # Scroll area
     scroll = QScrollArea()
@@ -97,5 +103,6 @@ def create_library_view(parent_window, load_data_func, save_data_func, theme_man
     page = QWidget()
     page.setLayout(ult)
     scroll.setWidget(page)
+    scroll.update_row = update_row
     
     return scroll
\ No newline at end of file
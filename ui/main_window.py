@@ -105,4 +105,31 @@ class MainWindow(QMainWindow):
         if full:
             self.refresh_tab_func(self.tabs, 0, self._create_library_tab())
             self.refresh_tab_func(self.tabs, 1, self._create_data_tab())
-            self.refresh_tab_func(self.tabs, 2, self._create_exe_tab())
\ No newline at end of file
+            self.refresh_tab_func(self.tabs, 2, self._create_exe_tab())
+
+    def show_build(self, game: str, info: dict) -> None:
+        """
+        Show freshly fetched build info of one game in every tab that displays it
+        ---
+        Args:
+            game: game name (key in metadata.json / recents.json)
+            info: build info ("appid", "build", "date")
+        """
+        for index in range(self.tabs.count()):
+            show_build = getattr(self.tabs.widget(index), "show_build", None)
+            if show_build is not None:
+                show_build(game, info)
+
+    def update_game(self, game: str) -> None:
+        """
+        Update one game in every tab without rebuilding them
+        ---
+        Args:
+            game: game name (key in metadata.json / ui.json)
+        """
+        for index in range(self.tabs.count()):
+            update_row = getattr(self.tabs.widget(index), "update_row", None)
+            if update_row is not None:
+                update_row(game)
+            else:
+                self.refresh(type=index)
\ No newline at end of file
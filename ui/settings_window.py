@@ -107,7 +107,8 @@ class Settings(QMainWindow):
             elif setting_type == "select":
                 widget = self._create_select_widget(setting_config, current_value, default_value)
             elif setting_type == "list-dirs":
-                widget = self._create_list_dirs_widget(key, current_value if isinstance(current_value, list) else [])
+                widget = self._create_list_dirs_widget(key, current_value if isinstance(current_value, list) else [],
+                                                       setting_config.get("absolute", False))
 
             layout.addWidget(widget, row, 3, alignment=Qt.AlignmentFlag.AlignTop)
             self.settings_widgets[key] = widget
@@ -191,8 +192,16 @@ class Settings(QMainWindow):
         widget.setFixedHeight(40)
         return widget
 
-    def _create_list_dirs_widget(self, key: str, current_dirs: list):
-        """Create a widget for managing list of directories to skip."""
+    def _create_list_dirs_widget(self, key: str, current_dirs: list, absolute: bool = False):
+        """
+        Create a widget for managing a list of directories.
+
+        Args:
+            key: Setting key
+            current_dirs: Directories in the setting
+            absolute: Pick any folder and store its absolute path (e.g. library folders on
+                other disks) instead of a direct child of the game directory by name
+        """
         container = QWidget()
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
@@ -221,15 +230,20 @@ class Settings(QMainWindow):
             item_widget.setLayout(item_layout)
             return item_widget
 
-        # Populate list with current directories
-        for directory in current_dirs:
+        def add_item(directory_path):
             item = QListWidgetItem()
-            item_widget = create_item_widget(directory)
+            # read back by read_settings (the item itself shows no text)
+            item.setData(Qt.ItemDataRole.UserRole, directory_path)
+            item_widget = create_item_widget(directory_path)
 
             list_widget.addItem(item)
             item.setSizeHint(item_widget.sizeHint())
             list_widget.setItemWidget(item, item_widget)
 
+        # Populate list with current directories
+        for directory in current_dirs:
+            add_item(directory)
+
         # Button layout for add and remove buttons
         button_layout = QHBoxLayout()
         button_layout.setContentsMargins(0, 0, 0, 0)
@@ -251,29 +265,23 @@ class Settings(QMainWindow):
             # Get game directory (parent of working environment directory)
             game_dir = os.path.dirname(os.getcwd())
 
-            path, selected = pick_path(self, game_dir, type="dir")
+            path, selected = pick_path(self, game_dir, type="abs-dir" if absolute else "dir")
             if selected and path != game_dir:
-                # Validate that folder is a direct child of game_dir
-                parent = os.path.dirname(path) # type: ignore
-                if parent != "":
-                    return
+                if absolute:
+                    # the game directory itself is always scanned
+                    if os.path.normcase(path) == os.path.normcase(os.path.normpath(game_dir)):  # type: ignore
+                        return
+                else:
+                    # Validate that folder is a direct child of game_dir
+                    parent = os.path.dirname(path) # type: ignore
+                    if parent != "":
+                        return
 
                 # Check if already in list
-                existing_items = []
-                for i in range(list_widget.count()):
-                    item_widget = list_widget.itemWidget(list_widget.item(i))
-                    if item_widget:
-                        label = item_widget.findChild(QLabel)
-                        if label:
-                            existing_items.append(label.text())
+                existing_items = [list_widget.item(i).data(Qt.ItemDataRole.UserRole) for i in range(list_widget.count())]
 
                 if path not in existing_items:
-                    item = QListWidgetItem()
-                    item_widget = create_item_widget(path)
-
-                    list_widget.addItem(item)
-                    item.setSizeHint(item_widget.sizeHint())
-                    list_widget.setItemWidget(item, item_widget)
+                    add_item(path)
 
         def remove_selected():
             for item in list_widget.selectedItems():
@@ -370,7 +378,7 @@ class Settings(QMainWindow):
             elif setting_type == "list-dirs":
                 # Extract directories from the list widget
                 list_widget = widget.list_widget  # type: ignore
-                dirs = [list_widget.item(i).text() for i in range(list_widget.count())]
+                dirs = [list_widget.item(i).data(Qt.ItemDataRole.UserRole) for i in range(list_widget.count())]
                 settings_dict[key] = dirs
 
         return settings_dict
\ No newline at end of file
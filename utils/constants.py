@@ -15,6 +15,8 @@ RECENTS_FILE_DEFAULT = os.path.join(META_DEFAULT, "recents.json")
 UI_FILE_DEFAULT = os.path.join(META_DEFAULT, "ui.json")
 SETTINGS_FILE_DEFAULT = os.path.join(META_DEFAULT, "settings.json")
 STATE_FILE_DEFAULT = os.path.join(META_DEFAULT, "state.json")
+SIZES_FILE_DEFAULT = os.path.join(META_DEFAULT, "sizes.json")
+STEAMCMD_PATH_DEFAULT = "C:\\steamcmd\\steamcmd.exe"
 
 # Image asset paths
 ICON_CHECK_PATH = "data/local/check_DATA.png"
@@ -44,6 +46,12 @@ SETTINGS_CONFIG = [
     {"key": "theme_activated", "type": "toggle", "label": "Newer Design", "default": True},
     {"key": "design", "type": "toggle", "label": "Design", "default": False},
     {"key": "skipped_dirs", "type": "list-dirs", "label": "Directories to Skip"},
+    {"key": "scan_jobs", "type": "select", "label": "Scan Jobs", "default": "1", "options": ["1", "2", "4", "8", "All Cores"], "values": ["1", "2", "4", "8", "0"]},
+    {"key": "library_roots", "type": "list-dirs", "label": "Additional Library Folders", "absolute": True},
+    {"key": "device_concurrency", "type": "select", "label": "Parallel Scans per Disk", "default": "1", "options": ["1", "2", "4", "8"], "values": ["1", "2", "4", "8"]},
+    {"key": "steamcmd_path", "type": "text", "label": "SteamCMD Path", "default": ""},
+    {"key": "build_info_ttl", "type": "select", "label": "Reuse Build Info For", "default": "1", "options": ["Always refetch", "1 hour", "6 hours", "1 day", "1 week"], "values": ["0", "1", "6", "24", "168"]},
+    {"key": "steamcmd_jobs", "type": "select", "label": "Parallel SteamCMD Queries", "default": "2", "options": ["1", "2", "4", "8"], "values": ["1", "2", "4", "8"]},
     {"key": "language", "type": "select", "label": "Language", "default": "en", "options": ["English", "Deutsch", "中文", "Français", "Español", "Русский", "عربي"], "values": ["en", "de", "zh", "fr", "es", "ru", "ar"]}
 ]
 
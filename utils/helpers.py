@@ -58,6 +58,7 @@ def confirm(parent: QWidget, message: str, action: Callable, default: str):
 def pick_path(window: QWidget, folder: str, type="exe"):
     """
     Open a file or directory dialog based on type.
+    "dir" returns the picked folder relative to folder, "abs-dir" its absolute path.
     """
     # Define start path
     start_path = os.path.join(os.path.dirname(os.getcwd()), folder)
@@ -73,6 +74,11 @@ def pick_path(window: QWidget, folder: str, type="exe"):
         # getExistingDirectory returns only the path string, not a tuple
         try: path = os.path.relpath(QFileDialog.getExistingDirectory(window, title, start_path), start_path)
         except ValueError: path = None
+
+    elif type == "abs-dir":
+        title = QCoreApplication.translate("PathDialog", "Select Library Folder")
+        path = QFileDialog.getExistingDirectory(window, title, start_path)
+        path = os.path.normpath(path) if path else None
     
     return path, True if path is not None and path != "" else False
 
@@ -7,72 +7,634 @@ import os
 import json
 import argparse
 import re
+import time
+import queue
+import atexit
+import tempfile
+import threading
 import subprocess
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple, Callable, Set
+
+from core.ndjson import NdjsonWriter
+from core.build_cache import (BUILD_CACHE_NAME, load_build_cache, save_build_cache, is_fresh,
+                              cache_entry, build_info)
+from core.scan_journal import write_json_atomic
+from core.steamcmd import SteamCmdSession, resolve_steamcmd_path
+from core.vdf import VdfParser, parse_vdf, unclosed_quote
+from utils.constants import SETTINGS_FILE_DEFAULT, STEAMCMD_PATH_DEFAULT
 
 METADATA_DEFAULT = os.path.join(os.getcwd(), "_metadata", "metadata.json")
 OUT_FILE_DEFAULT = os.path.join(os.getcwd(), "_metadata", "recents.json")
-STEAMCMD_PATH = "C:\\steamcmd\\steamcmd.exe"
+# used if the "steamcmd_path" setting is empty and steamcmd is not in PATH
+STEAMCMD_PATH = STEAMCMD_PATH_DEFAULT
+# appids per SteamCMD process, processes at the same time, extra attempts per failed chunk
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_STEAMCMD_JOBS = 2
+DEFAULT_RETRIES = 2
+# hours build info is served from the build cache before SteamCMD is asked again
+DEFAULT_BUILD_INFO_TTL = 1.0
+
+# on_result(appid, build info): called as soon as one app's info is known (from worker threads)
+ResultCallback = Callable[[str, Dict[str, Any]], None]
+
+class PartialFetchError(subprocess.SubprocessError):
+    """
+    SteamCMD failed for good for some appids (after all retries) but returned others.
+
+    Attributes:
+        results: Build info that was fetched
+        failed: Appids (or games) that got no build info because of the failure
+        error: Error of the last failed attempt
+    """
+
+    def __init__(self, results: Dict[str, Dict[str, Any]], failed: List[str], error: BaseException):
+        super().__init__(f"SteamCMD failed for {', '.join(failed)}: {error}")
+        self.results = results
+        self.failed = failed
+        self.error = error
 
 def load_metadata(path: str) -> Dict[str, Dict[str, Any]]:
     with open(path, "r", encoding="utf-8") as fh:
         return json.load(fh)
 
-def get_latest_build_info(appids: List[str]) -> Dict[str, Dict[str, Any]]:
-    cmd = [STEAMCMD_PATH, "+login", "anonymous"]
+def load_settings(path: str) -> Dict[str, Any]:
+    """settings.json contents; empty if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def resolve_steamcmd_jobs(cli_jobs: Optional[int], settings: Dict[str, Any]) -> int:
+    """CLI value wins over the "steamcmd_jobs" setting; anything invalid falls back to the default."""
+    value = cli_jobs if cli_jobs is not None else settings.get("steamcmd_jobs", DEFAULT_STEAMCMD_JOBS)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_STEAMCMD_JOBS
+
+def resolve_ttl_hours(cli_hours: Optional[float], settings: Dict[str, Any]) -> float:
+    """CLI value wins over the "build_info_ttl" setting (hours); anything invalid falls back to the default."""
+    value = cli_hours if cli_hours is not None else settings.get("build_info_ttl", DEFAULT_BUILD_INFO_TTL)
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return DEFAULT_BUILD_INFO_TTL
+
+def load_recents(path: str) -> Dict[str, Dict[str, Any]]:
+    """recents.json contents; empty if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (json.JSONDecodeError, IOError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def query_app_info(appids: List[str], steamcmd_path: str = STEAMCMD_PATH,
+                   install_dir: Optional[str] = None,
+                   on_result: Optional[ResultCallback] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run one SteamCMD process printing the app info of appids.
+    Its output is parsed line by line while SteamCMD runs (see AppInfoStream).
+
+    Args:
+        appids: Appids to query
+        steamcmd_path: Path to steamcmd executable
+        install_dir: +force_install_dir of this process (keeps concurrent processes apart)
+        on_result: Called for every app as soon as its block is complete
+
+    Raises:
+        OSError, subprocess.CalledProcessError if SteamCMD could not be run or failed
+    """
+    cmd = [steamcmd_path]
+    if install_dir is not None:
+        # has to come before +login
+        cmd += ["+force_install_dir", install_dir]
+    cmd += ["+login", "anonymous"]
     for appid in appids:
         cmd += ["+app_info_print", str(appid)]
     cmd += ["+quit"]
 
-    output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True, encoding="utf-8")
+    results: Dict[str, Dict[str, Any]] = {}
+    stream = AppInfoStream()
+
+    def collect(done: List[Tuple[str, Dict[str, Any]]]):
+        for appid, info in done:
+            results[appid] = info
+            if on_result is not None:
+                on_result(appid, info)
 
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                          encoding="utf-8", errors="replace") as proc:
+        for line in proc.stdout:  # pyright: ignore[reportOptionalIterable]
+            collect(stream.feed(line))
+    collect(stream.close())
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return results
+
+def query_app_info_session(session: SteamCmdSession, appids: List[str],
+                           on_result: Optional[ResultCallback] = None,
+                           refresh: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Like query_app_info, through a running SteamCMD session: the app_info_print commands of
+    all appids are sent in one batch (see SteamCmdSession.commands).
+
+    Args:
+        refresh: Send app_info_update first; a session that may have been logged in for hours
+            needs it once per fetch, so its app info cache is up to date
+    """
     results: Dict[str, Dict[str, Any]] = {}
 
-    # Split output by "AppID : <appid>"
-    app_blocks = re.split(r'AppID\s*:\s*(\d+)', output)
-    # re.split produces [preamble, appid1, block1, appid2, block2, ...]
+    def collect(_: int, output: str):
+        for found, info in parse_app_info(output).items():
+            results[found] = info
+            if on_result is not None:
+                on_result(found, info)
+
+    if refresh:
+        session.refresh_app_info()
+    session.commands([f"app_info_print {appid}" for appid in appids], on_output=collect)
+    return results
+
+def get_latest_build_info(appids: List[str], steamcmd_path: str = STEAMCMD_PATH, jobs: int = 1,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, retries: int = DEFAULT_RETRIES,
+                          sessions: Optional[List[SteamCmdSession]] = None,
+                          on_result: Optional[ResultCallback] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Latest public build of appids, queried in chunks of chunk_size appids by up to jobs
+    SteamCMD processes at the same time. A chunk whose process fails is retried on its own
+    (up to retries more times); the other chunks are kept.
+    With sessions, the chunks go to those running SteamCMD sessions (at most one chunk per
+    session at a time, each session refreshing its app info once) instead of a new process each.
+    on_result gets every app once, as soon as it is known (also from a chunk that fails later;
+    such apps count as fetched).
+
+    Returns:
+        Build info per appid, in the order of appids (appids missing from SteamCMD's output
+        are left out)
+
+    Raises:
+        PartialFetchError if chunks failed for good but other apps were fetched; the error of
+        the last failed attempt if nothing was fetched
+    """
+    appids = [str(a) for a in appids]
+    chunk_size = max(1, chunk_size)
+    chunks = [appids[i:i + chunk_size] for i in range(0, len(appids), chunk_size)]
+    jobs = max(1, min(jobs, len(chunks), len(sessions) if sessions else jobs))
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    errors: List[BaseException] = []
+    failed_chunks: List[List[str]] = []
+    lock = threading.Lock()
 
-    for i in range(1, len(app_blocks), 2):
-        appid = app_blocks[i]
-        text = app_blocks[i + 1]
+    def report(appid: str, info: Dict[str, Any]):
+        # every app is kept as soon as its block is complete, even if its process fails later
+        with lock:
+            if appid in merged:
+                return
+            merged[appid] = info
+        if on_result is not None:
+            on_result(appid, info)
 
-        public_branch = re.search(r'"branches"\s*\{.*?"public"\s*\{(.*?)\n\s*\}', text, re.DOTALL)
-        if not public_branch:
-            results[appid] = {"appid": appid, "build": None, "time": None}
-            continue
+    with tempfile.TemporaryDirectory(prefix="steamcmd_") as work_dir:
+        # a session or a +force_install_dir per concurrent process; a single process keeps SteamCMD's default
+        slots: "queue.Queue[Any]" = queue.Queue()
+        for i in range(jobs):
+            if sessions:
+                slots.put(sessions[i])
+            else:
+                slots.put(os.path.join(work_dir, f"worker{i}") if jobs > 1 else None)
 
-        section = public_branch.group(1)
-        build_match = re.search(r'"buildid"\s+"(\d+)"', section)
-        time_match = re.search(r'"timeupdated"\s+"(\d+)"', section)
+        # sessions whose app info was refreshed by this call (the first chunk each one gets)
+        refreshed: Set[int] = set()
 
-        results[appid] = {
-            "appid": appid,
-            "build": build_match.group(1) if build_match else None,
-            "date": int(time_match.group(1)) if time_match else None,
-        }
+        def run(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+            slot = slots.get()
+            try:
+                if isinstance(slot, SteamCmdSession):
+                    if id(slot) not in refreshed:
+                        # a failed refresh is retried with the chunk
+                        slot.refresh_app_info()
+                        refreshed.add(id(slot))
+                    return query_app_info_session(slot, chunk, report, refresh=False)
+                return query_app_info(chunk, steamcmd_path, slot, report)
+            finally:
+                slots.put(slot)
 
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="steamcmd") as pool:
+            pending: Dict[Future, Tuple[List[str], int]] = {pool.submit(run, c): (c, 0) for c in chunks}
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    chunk, attempt = pending.pop(fut)
+                    try:
+                        fut.result()
+                    except (OSError, subprocess.SubprocessError) as e:
+                        if attempt < retries:
+                            pending[pool.submit(run, chunk)] = (chunk, attempt + 1)
+                        else:
+                            errors.append(e)
+                            failed_chunks.append(chunk)
+    results = {appid: merged[appid] for appid in dict.fromkeys(appids) if appid in merged}
+    failed = [appid for chunk in failed_chunks for appid in chunk if appid not in merged]
+    if failed:
+        if not results:
+            raise errors[-1]
+        raise PartialFetchError(results, failed, errors[-1])
     return results
 
-def main():
-    p = argparse.ArgumentParser()
-    p.add_argument("--metadata", "-m", default=METADATA_DEFAULT)
-    p.add_argument("--out", "-o", default=OUT_FILE_DEFAULT)
-    args = p.parse_args()
+def _branch_info(branch: Any) -> Dict[str, Any]:
+    """Build and date of one entry of depots/branches."""
+    if not isinstance(branch, dict):
+        return {"build": None, "date": None}
+    build = branch.get("buildid")
+    date = branch.get("timeupdated")
+    return {
+        "build": build if isinstance(build, str) and build.isdigit() else None,
+        "date": int(date) if isinstance(date, str) and date.isdigit() else None,
+    }
 
-    meta = load_metadata(args.metadata)
-    game_to_appid = {name: str(info["appid"]) for name, info in meta.items() if info.get("appid")}
+def parse_app_block(appid: str, text: str) -> Dict[str, Any]:
+    """Build info of one app from its app_info_print block (the text after "AppID : <appid>")."""
+    # the rest of the header line ("change number : ...") is not KeyValues
+    start = text.find('"')
+    return app_build_info(appid, parse_vdf(text[start:]) if start >= 0 else {})
 
-    steam_data = get_latest_build_info(list(game_to_appid.values()))
+def app_build_info(appid: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build info of one app from its parsed app_info_print block (core.vdf).
 
-    results: Dict[str, Dict[str, Any]] = {}
-    for game, appid in game_to_appid.items():
-        if appid in steam_data:
-            results[game] = steam_data[appid]
+    Returns:
+        {"appid", "build", "date"} of the public branch (None if missing), and "branches":
+        {"build", "date"} per branch
+    """
+    app = data.get(appid)
+    if not isinstance(app, dict):
+        app = next((v for v in data.values() if isinstance(v, dict)), {})
+    depots = app.get("depots")
+    branches = depots.get("branches") if isinstance(depots, dict) else None
+    if not isinstance(branches, dict):
+        branches = {}
+
+    info: Dict[str, Any] = {"appid": appid, **_branch_info(branches.get("public"))}
+    info["branches"] = {name: _branch_info(branch) for name, branch in branches.items()}
+    return info
+
+_APP_HEADER_RE = re.compile(r'AppID\s*:\s*(\d+)')
+
+class AppInfoStream:
+    """
+    Incremental parser of SteamCMD's app_info_print output.
+    Fed as it arrives (whole lines, one or many at a time), it returns each app's build info as
+    soon as the app's block closes, so results exist before SteamCMD exits. Every block is
+    tokenized once (core.vdf.VdfParser); the text up to the next header goes to the parser in
+    one piece.
+
+    Example:
+        stream = AppInfoStream()
+        for line in proc.stdout:
+            for appid, info in stream.feed(line):
+                ...
+        for appid, info in stream.close():
+            ...
+    """
+
+    def __init__(self):
+        self._appid: Optional[str] = None
+        self._parser: Optional[VdfParser] = None
+        # quoted string of the current block not closed yet, parsed once it ends
+        self._pending = ""
+
+    def feed(self, text: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Add the next whole lines of output; returns the apps whose block they completed."""
+        done: List[Tuple[str, Dict[str, Any]]] = []
+        pos = search_from = 0
+        while True:
+            header = _APP_HEADER_RE.search(text, search_from)
+            end = header.start() if header is not None else len(text)
+            if self._parser is not None:
+                self._feed_block(text[pos:end])
+                pos = end
+                if self._parser.closed:
+                    done.extend(self.close())
+            if header is None:
+                return done
+            search_from = header.end()
+            if self._parser is not None and (self._parser.opened or self._pending):
+                # headers only count outside of a block; inside one (or a quoted string) they are text
+                continue
+            # a new app; this also ends a block that never opened
+            done.extend(self.close())
+            self._appid = header.group(1)
+            self._parser = VdfParser(one_block=True)
+            # the rest of the header line ("change number : ...") is not KeyValues
+            line_end = text.find("\n", search_from)
+            line_end = len(text) if line_end < 0 else line_end
+            quote = text.find('"', search_from, line_end)
+            pos = search_from = quote if quote >= 0 else line_end
+
+    def _feed_block(self, text: str):
+        if self._pending:
+            text = self._pending + text
+        # a quoted string spanning lines waits for its end
+        split = unclosed_quote(text)
+        if split < 0:
+            self._pending = ""
         else:
-            results[game] = {"appid": appid, "build": None, "date": None}
+            text, self._pending = text[:split], text[split:]
+        self._parser.feed(text)  # pyright: ignore[reportOptionalMemberAccess]
+
+    def close(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """End the current block (e.g. at the end of the output); returns it if there is one."""
+        if self._parser is None:
+            return []
+        if self._pending:
+            self._parser.feed(self._pending)
+        appid, data = self._appid, self._parser.root
+        self._appid, self._parser, self._pending = None, None, ""
+        return [(appid, app_build_info(appid, data))]  # pyright: ignore[reportArgumentType]
+
+def parse_app_info(output: str) -> Dict[str, Dict[str, Any]]:
+    """Build info per appid from the output of SteamCMD's app_info_print."""
+    results: Dict[str, Dict[str, Any]] = {}
+    stream = AppInfoStream()
+    results.update(stream.feed(output))
+    results.update(stream.close())
+    return results
+
+def map_games_to_appids(meta: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    return {name: str(info["appid"]) for name, info in meta.items() if info.get("appid")}
+
+
+class BuildFetcher:
+    """
+    Programmatic access to SteamCMD build info.
+
+    Example:
+        BuildFetcher().fetch(["480"])  ->  {"480": {"appid": "480", "build": ..., "date": ...,
+                                                     "branches": {"public": {"build": ..., "date": ...}, ...}}}
+    """
+
+    def __init__(self, steamcmd_path: Optional[str] = None, jobs: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, settings_path: str = SETTINGS_FILE_DEFAULT,
+                 persistent: bool = True, ttl_hours: Optional[float] = None,
+                 cache_path: Optional[str] = None):
+        """
+        Args:
+            steamcmd_path: Path to steamcmd executable (default: "steamcmd_path" setting, see
+                core.steamcmd.resolve_steamcmd_path)
+            jobs: SteamCMD processes at the same time (default: "steamcmd_jobs" setting)
+            chunk_size: Appids per SteamCMD process
+            settings_path: settings.json to take steamcmd_path and steamcmd_jobs from
+            persistent: Keep SteamCMD running and logged in between fetches (core.steamcmd);
+                closed by close() or at exit
+            ttl_hours: Age up to which cached build info is used (default: "build_info_ttl" setting)
+            cache_path: Build cache file (default: build_cache.json next to the recents.json written)
+        """
+        self.steamcmd_path = steamcmd_path
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self.settings_path = settings_path
+        self.persistent = persistent
+        self.ttl_hours = ttl_hours
+        self.cache_path = cache_path
+        self._sessions: List[SteamCmdSession] = []
+        if persistent:
+            atexit.register(self.close)
+
+    def _sessions_for(self, steamcmd_path: str, jobs: int) -> List[SteamCmdSession]:
+        """jobs running sessions of steamcmd_path (started on their first command)."""
+        if any(s.steamcmd_path != steamcmd_path for s in self._sessions):
+            self.close()
+        while len(self._sessions) < jobs:
+            # the first session keeps SteamCMD's default install dir, further ones get their own
+            self._sessions.append(SteamCmdSession(steamcmd_path, isolated=bool(self._sessions)))
+        return self._sessions[:jobs]
+
+    def fetch(self, appids: Iterable[str], on_result: Optional[ResultCallback] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest public build per appid (appids missing from SteamCMD's output are left out).
+        on_result gets each app as soon as SteamCMD printed it.
+
+        Raises:
+            PartialFetchError, OSError, subprocess.SubprocessError (see get_latest_build_info)
+        """
+        appids = list(dict.fromkeys(str(a) for a in appids))
+        if not appids:
+            return {}
+        settings = load_settings(self.settings_path)
+        steamcmd_path = self.steamcmd_path or resolve_steamcmd_path(settings.get("steamcmd_path"), STEAMCMD_PATH)
+        jobs = resolve_steamcmd_jobs(self.jobs, settings)
+        sessions = self._sessions_for(steamcmd_path, jobs) if self.persistent else None
+        return get_latest_build_info(appids, steamcmd_path, jobs, self.chunk_size, sessions=sessions,
+                                     on_result=on_result)
+
+    def close(self):
+        """Quit the SteamCMD sessions kept by a persistent fetcher."""
+        sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def fetch_cached(self, appids: Iterable[str], cache_path: str, force: bool = False,
+                     on_result: Optional[ResultCallback] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Like fetch, but only appids that are missing from the build cache or older than the TTL
+        are fetched (all of them with force); the fetched ones are stored in the cache.
+        An appid SteamCMD returned nothing for keeps its cached info and is asked again next time.
+        on_result gets the fresh cached apps right away, the fetched ones as they arrive.
+
+        Raises:
+            PartialFetchError after caching what was fetched; its results leave out the failed
+            appids (their cache entries are kept as they were)
+        """
+        appids = list(dict.fromkeys(str(a) for a in appids))
+        cache = load_build_cache(cache_path)
+        ttl = resolve_ttl_hours(self.ttl_hours, load_settings(self.settings_path)) * 3600
+        now = time.time()
+        stale = [appid for appid in appids if force or not is_fresh(cache.get(appid), ttl, now)]
+        if on_result is not None:
+            stale_set = set(stale)
+            for appid in appids:
+                if appid not in stale_set and appid in cache:
+                    on_result(appid, build_info(cache[appid]))
+        failure: Optional[PartialFetchError] = None
+        if stale:
+            try:
+                fetched = self.fetch(stale, on_result)
+            except PartialFetchError as e:
+                fetched, failure = e.results, e
+            for appid, info in fetched.items():
+                cache[appid] = cache_entry(info, now)
+            if fetched:
+                save_build_cache(cache_path, cache)
+        if failure is not None:
+            failed = set(failure.failed)
+            results = {appid: build_info(cache[appid]) for appid in appids if appid in cache and appid not in failed}
+            raise PartialFetchError(results, failure.failed, failure.error)
+        return {appid: build_info(cache[appid]) for appid in appids if appid in cache}
+
+    def iter_games(self, meta: Dict[str, Dict[str, Any]], games: Optional[Iterable[str]] = None,
+                   cache_path: Optional[str] = None, force: bool = False,
+                   on_game: Optional[ResultCallback] = None,
+                   placeholders: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (game, build info) for every metadata entry with an appid.
+        Games SteamCMD returned nothing for get build/date None (or are left out without placeholders).
+
+        Args:
+            meta: metadata.json contents
+            games: Only these games
+            cache_path: Build cache to use (see fetch_cached); None fetches everything
+            force: Fetch even if the cached info is fresh
+            on_game: Called with (game, build info) while fetching, as soon as the game's app is
+                known; games without info are only yielded
+            placeholders: Yield games without info (build/date None)
+
+        Raises:
+            PartialFetchError (failed = game names) after yielding the other games; games of
+            the failed appids are not yielded
+        """
+        game_to_appid = map_games_to_appids(meta)
+        if games is not None:
+            wanted = set(games)
+            game_to_appid = {game: appid for game, appid in game_to_appid.items() if game in wanted}
+        on_result: Optional[ResultCallback] = None
+        if on_game is not None:
+            appid_games: Dict[str, List[str]] = {}
+            for game, appid in game_to_appid.items():
+                appid_games.setdefault(appid, []).append(game)
+
+            def on_result(appid: str, info: Dict[str, Any]):
+                for game in appid_games.get(appid, ()):
+                    on_game(game, info)
+        failure: Optional[PartialFetchError] = None
+        try:
+            if cache_path is None:
+                steam_data = self.fetch(game_to_appid.values(), on_result)
+            else:
+                steam_data = self.fetch_cached(game_to_appid.values(), cache_path, force, on_result)
+        except PartialFetchError as e:
+            steam_data, failure = e.results, e
+        failed_appids = set(failure.failed) if failure is not None else set()
+        for game, appid in game_to_appid.items():
+            if appid in failed_appids:
+                continue
+            if appid in steam_data:
+                yield game, steam_data[appid]
+            elif placeholders:
+                yield game, {"appid": appid, "build": None, "date": None}
+        if failure is not None:
+            failed_games = [game for game, appid in game_to_appid.items() if appid in failed_appids]
+            raise PartialFetchError({game: steam_data[appid] for game, appid in game_to_appid.items()
+                                     if appid in steam_data}, failed_games, failure.error)
+
+    def fetch_games(self, meta: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Build info per game name (see iter_games)."""
+        return dict(self.iter_games(meta))
+
+    def update(self, metadata_path: str = METADATA_DEFAULT, out_path: str = OUT_FILE_DEFAULT,
+               stream: Optional[NdjsonWriter] = None, games: Optional[Iterable[str]] = None,
+               force: bool = False, on_game: Optional[ResultCallback] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the build info of the games in metadata_path up to date and merge it into out_path.
+        Build info fetched less than the TTL ago comes from the build cache (core.build_cache).
+
+        Args:
+            metadata_path: metadata.json to take the appids from
+            out_path: recents.json to merge into; only games with fetched (or cached) build info
+                are replaced, an update of all games also drops games that no longer have an appid
+            stream: Also gets one {"game", "data"} record per game as soon as its build info is known
+            games: Only update these games (e.g. "Refresh Selected" in the Data tab)
+            force: Ask SteamCMD even for build info that is still fresh
+            on_game: Called once per game with (game, build info) as soon as it is known,
+                from SteamCMD worker threads (e.g. to fill the Data tab live)
+
+        Returns:
+            Build info per updated game (games SteamCMD returned nothing for are left out)
+
+        Raises:
+            PartialFetchError (failed = game names) after writing out_path; the failed games
+            keep their entries in out_path and in the build cache
+        """
+        meta = load_metadata(metadata_path)
+        cache_path = self.cache_path or os.path.join(os.path.dirname(os.path.abspath(out_path)), BUILD_CACHE_NAME)
+        results: Dict[str, Dict[str, Any]] = {}
+        emitted: Set[str] = set()
+        lock = threading.Lock()
+
+        def emit(game: str, info: Dict[str, Any]):
+            with lock:
+                if game in emitted:
+                    return
+                emitted.add(game)
+                if stream is not None:
+                    stream.write({"game": game, "data": info})
+                if on_game is not None:
+                    on_game(game, info)
+
+        failure: Optional[PartialFetchError] = None
+        try:
+            for game, info in self.iter_games(meta, games, cache_path, force, emit, placeholders=False):
+                results[game] = info
+        except PartialFetchError as e:
+            failure = e
+        recents = load_recents(out_path)
+        if games is None:
+            known = map_games_to_appids(meta)
+            recents = {game: info for game, info in recents.items() if game in known}
+        # games SteamCMD returned nothing for keep their entries
+        recents.update(results)
+        write_json_atomic(out_path, recents, indent=2, ensure_ascii=False)
+        if failure is not None:
+            raise failure
+        return results
+
+
+_fetcher: Optional[BuildFetcher] = None
+
+
+def get_fetcher() -> BuildFetcher:
+    """Get or create the shared BuildFetcher (used by the GUI)."""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = BuildFetcher()
+    return _fetcher
+
+
+def main(argv: Optional[List[str]] = None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--metadata", "-m", default=METADATA_DEFAULT)
+    p.add_argument("--out", "-o", default=OUT_FILE_DEFAULT)
+    p.add_argument("--ndjson", metavar="PATH",
+                   help="Also stream one JSON record per game to PATH as soon as it is known ('-' = stdout)")
+    p.add_argument("--jobs", "-j", type=int, default=None,
+                   help="SteamCMD processes at the same time (default: 'steamcmd_jobs' setting)")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help="Appids per SteamCMD process")
+    p.add_argument("--steamcmd", metavar="PATH", default=None,
+                   help="Path to steamcmd executable (default: 'steamcmd_path' setting)")
+    p.add_argument("--game", "-g", action="append", dest="games", metavar="NAME",
+                   help="Only update this game (repeatable); other games in the output are kept")
+    p.add_argument("--force", "-f", action="store_true",
+                   help="Ask SteamCMD even for build info that is still cached")
+    p.add_argument("--ttl", type=float, default=None, metavar="HOURS",
+                   help="Age up to which cached build info is used (default: 'build_info_ttl' setting)")
+    args = p.parse_args(argv)
 
-    with open(args.out, "w", encoding="utf-8") as fh:
-        json.dump(results, fh, indent=2, ensure_ascii=False)
+    stream = NdjsonWriter(args.ndjson) if args.ndjson else None
+    try:
+        # one fetch: a session would not save anything
+        fetcher = BuildFetcher(args.steamcmd, args.jobs, args.chunk_size, persistent=False, ttl_hours=args.ttl)
+        fetcher.update(args.metadata, args.out, stream, args.games, args.force)
+    except PartialFetchError as e:
+        # the other games were written
+        p.exit(1, f"{e}\n")
+    finally:
+        if stream is not None:
+            stream.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
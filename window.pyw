@@ -15,7 +15,7 @@ from core.data_manager import load_data, save_data, create_blank, get_struc
 from core.scan_scheduler import should_run_scan, execute_scan
 from utils.constants import (
     METADATA_DEFAULT, RECENTS_FILE_DEFAULT, UI_FILE_DEFAULT,
-    SETTINGS_FILE_DEFAULT, STATE_FILE_DEFAULT, LANG_FOLDER
+    SETTINGS_FILE_DEFAULT, STATE_FILE_DEFAULT, SIZES_FILE_DEFAULT, LANG_FOLDER
 )
 from utils.helpers import refresh_tab
 from ui.main_window import MainWindow
@@ -34,6 +34,8 @@ def parse_arguments():
                        help="Path to settings JSON")
     parser.add_argument("--statedata", "-state", default=STATE_FILE_DEFAULT, 
                        help="Path to State JSON")
+    parser.add_argument("--sizesdata", "-sizes", default=SIZES_FILE_DEFAULT, 
+                       help="Path to install sizes JSON (written by the scanner)")
     return parser.parse_args()
 
 
@@ -62,6 +64,8 @@ def main():
     # Parse arguments
     global args
     args = parse_arguments()
+    # scans from the GUI write the sizes where the Data tab reads them
+    scanner.get_scanner(sizes_path=args.sizesdata)
 
     # Handle automatic scans
     handle_automatic_scans(args)
@@ -96,12 +100,12 @@ def main():
     )
 
     if not os.path.exists(args.metadata):
-        scanner.main()
-        web.main()
+        scanner.get_scanner().scan()
+        web.get_fetcher().update(args.metadata, args.recentdata)
         from core.data_manager import ui_updater
-        create_blank(args.uidata)
-        games = load_data_wrapper(["meta"])[0]
-        ui_updater(save_data_wrapper, games, {})
+        # the scan may already have written ui.json (prefilled exesrc)
+        games, ui = load_data_wrapper(["meta", "ui"])
+        ui_updater(save_data_wrapper, games, ui)
 
         create_blank(args.settingsdata)
 
@@ -114,4 +118,6 @@ def main():
 
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file